@@ -0,0 +1,27 @@
+"""Adicionar chave_documento em gastos_parlamentares
+
+Revision ID: adicionar_chave_documento_gastos
+Revises: criar_pipeline_runs
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'adicionar_chave_documento_gastos'
+down_revision = 'criar_pipeline_runs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Chave do documento da CEAP usada para deduplicar a carga dos arquivos anuais
+    op.add_column('gastos_parlamentares', sa.Column('chave_documento', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_gastos_parlamentares_chave_documento'), 'gastos_parlamentares', ['chave_documento'], unique=True)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_gastos_parlamentares_chave_documento'), table_name='gastos_parlamentares')
+    op.drop_column('gastos_parlamentares', 'chave_documento')
@@ -0,0 +1,32 @@
+"""Adicionar índices de período e posição na tabela ranking_emendas
+
+Revision ID: adicionar_indices_ranking_emendas
+Revises: a5adc79af875
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'adicionar_indices_ranking_emendas'
+down_revision = 'a5adc79af875'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Índices para servir o ranking paginado por período (ano/mês) e critério
+    op.create_index('ix_ranking_emendas_periodo_valor', 'ranking_emendas',
+                    ['ano_referencia', 'mes_referencia', 'ranking_valor'], unique=False)
+    op.create_index('ix_ranking_emendas_periodo_quantidade', 'ranking_emendas',
+                    ['ano_referencia', 'mes_referencia', 'ranking_quantidade'], unique=False)
+    op.create_index('ix_ranking_emendas_periodo_execucao', 'ranking_emendas',
+                    ['ano_referencia', 'mes_referencia', 'ranking_execucao'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_ranking_emendas_periodo_execucao', table_name='ranking_emendas')
+    op.drop_index('ix_ranking_emendas_periodo_quantidade', table_name='ranking_emendas')
+    op.drop_index('ix_ranking_emendas_periodo_valor', table_name='ranking_emendas')
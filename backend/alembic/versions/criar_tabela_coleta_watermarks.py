@@ -0,0 +1,40 @@
+"""Criar tabela coleta_watermarks
+
+Revision ID: criar_coleta_watermarks
+Revises: criar_fila_textos_proposicoes
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'criar_coleta_watermarks'
+down_revision = 'criar_fila_textos_proposicoes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Marcas d'água das coletas incrementais
+    op.create_table('coleta_watermarks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('fonte', sa.String(length=100), nullable=False),
+        sa.Column('ultima_data_apresentacao', sa.Date(), nullable=True),
+        sa.Column('etag', sa.String(length=255), nullable=True),
+        sa.Column('last_modified', sa.String(length=100), nullable=True),
+        sa.Column('ultima_data_inicio', sa.Date(), nullable=True),
+        sa.Column('dados', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_coleta_watermarks_id'), 'coleta_watermarks', ['id'], unique=False)
+    op.create_index(op.f('ix_coleta_watermarks_fonte'), 'coleta_watermarks', ['fonte'], unique=True)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_coleta_watermarks_fonte'), table_name='coleta_watermarks')
+    op.drop_index(op.f('ix_coleta_watermarks_id'), table_name='coleta_watermarks')
+    op.drop_table('coleta_watermarks')
@@ -0,0 +1,40 @@
+"""Criar tabela fila_textos_proposicoes
+
+Revision ID: criar_fila_textos_proposicoes
+Revises: adicionar_indices_ranking_emendas
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'criar_fila_textos_proposicoes'
+down_revision = 'adicionar_indices_ranking_emendas'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fila persistente de download do inteiro teor das proposições
+    op.create_table('fila_textos_proposicoes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('proposicao_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pendente'),
+        sa.Column('tentativas', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('ultimo_erro', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['proposicao_id'], ['proposicoes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('proposicao_id')
+    )
+    op.create_index(op.f('ix_fila_textos_proposicoes_id'), 'fila_textos_proposicoes', ['id'], unique=False)
+    op.create_index(op.f('ix_fila_textos_proposicoes_status'), 'fila_textos_proposicoes', ['status'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_fila_textos_proposicoes_status'), table_name='fila_textos_proposicoes')
+    op.drop_index(op.f('ix_fila_textos_proposicoes_id'), table_name='fila_textos_proposicoes')
+    op.drop_table('fila_textos_proposicoes')
@@ -0,0 +1,60 @@
+"""Criar tabelas pipeline_runs e pipeline_stage_state
+
+Revision ID: criar_pipeline_runs
+Revises: criar_coleta_watermarks
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'criar_pipeline_runs'
+down_revision = 'criar_coleta_watermarks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Execuções do pipeline de coleta
+    op.create_table('pipeline_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('pipeline', sa.String(length=100), nullable=False),
+        sa.Column('chave', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('iniciado_em', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('finalizado_em', sa.TIMESTAMP(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pipeline_runs_id'), 'pipeline_runs', ['id'], unique=False)
+    op.create_index(op.f('ix_pipeline_runs_pipeline'), 'pipeline_runs', ['pipeline'], unique=False)
+
+    # Estado (status, cursor, contagens) de cada etapa de uma execução
+    op.create_table('pipeline_stage_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('etapa', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('cursor', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('contagens', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('erro', sa.Text(), nullable=True),
+        sa.Column('iniciado_em', sa.TIMESTAMP(), nullable=True),
+        sa.Column('finalizado_em', sa.TIMESTAMP(), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['run_id'], ['pipeline_runs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('run_id', 'etapa', name='_pipeline_stage_uc')
+    )
+    op.create_index(op.f('ix_pipeline_stage_state_id'), 'pipeline_stage_state', ['id'], unique=False)
+    op.create_index(op.f('ix_pipeline_stage_state_run_id'), 'pipeline_stage_state', ['run_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_pipeline_stage_state_run_id'), table_name='pipeline_stage_state')
+    op.drop_index(op.f('ix_pipeline_stage_state_id'), table_name='pipeline_stage_state')
+    op.drop_table('pipeline_stage_state')
+    op.drop_index(op.f('ix_pipeline_runs_pipeline'), table_name='pipeline_runs')
+    op.drop_index(op.f('ix_pipeline_runs_id'), table_name='pipeline_runs')
+    op.drop_table('pipeline_runs')
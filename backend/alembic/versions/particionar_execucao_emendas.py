@@ -0,0 +1,108 @@
+"""Particionar execucao_emendas por ano de execução
+
+Revision ID: particionar_execucao_emendas
+Revises: adicionar_chave_documento_gastos
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'particionar_execucao_emendas'
+down_revision = 'adicionar_chave_documento_gastos'
+branch_labels = None
+depends_on = None
+
+
+COLUNAS = (
+    "id, emenda_id, ano_execucao, mes_execucao, data_referencia, "
+    "valor_empenhado_acumulado, valor_liquidado_acumulado, valor_pago_acumulado, "
+    "percentual_empenhado, percentual_liquidado, percentual_pago, "
+    "status_execucao, observacoes, created_at, updated_at"
+)
+
+
+def upgrade():
+    # Snapshots mensais de execução: uma partição por ano (execucao_emendas_<ano>)
+    op.execute("CREATE TEMP TABLE execucao_emendas_copia ON COMMIT DROP AS SELECT * FROM execucao_emendas")
+    op.drop_index(op.f('ix_execucao_emendas_id'), table_name='execucao_emendas')
+    op.drop_index(op.f('ix_execucao_emendas_ano_execucao'), table_name='execucao_emendas')
+    op.drop_table('execucao_emendas')
+
+    op.execute("""
+        CREATE TABLE execucao_emendas (
+            id SERIAL,
+            emenda_id INTEGER NOT NULL REFERENCES emendas_parlamentares (id) ON DELETE CASCADE,
+            ano_execucao INTEGER NOT NULL,
+            mes_execucao INTEGER NOT NULL,
+            data_referencia DATE,
+            valor_empenhado_acumulado NUMERIC(15, 2) DEFAULT 0,
+            valor_liquidado_acumulado NUMERIC(15, 2) DEFAULT 0,
+            valor_pago_acumulado NUMERIC(15, 2) DEFAULT 0,
+            percentual_empenhado NUMERIC(5, 2) DEFAULT 0,
+            percentual_liquidado NUMERIC(5, 2) DEFAULT 0,
+            percentual_pago NUMERIC(5, 2) DEFAULT 0,
+            status_execucao VARCHAR(50),
+            observacoes TEXT,
+            created_at TIMESTAMP DEFAULT now(),
+            updated_at TIMESTAMP DEFAULT now(),
+            PRIMARY KEY (id, ano_execucao),
+            CONSTRAINT _execucao_emenda_mes_uc UNIQUE (emenda_id, ano_execucao, mes_execucao)
+        ) PARTITION BY RANGE (ano_execucao)
+    """)
+    op.create_index('ix_execucao_emendas_periodo', 'execucao_emendas', ['ano_execucao', 'mes_execucao'], unique=False)
+
+    # Partições para os anos já existentes; as demais são criadas pelo carregador
+    conexao = op.get_bind()
+    anos = conexao.execute(sa.text(
+        "SELECT ano_execucao FROM execucao_emendas_copia UNION SELECT ano FROM emendas_parlamentares"
+    )).scalars().all()
+    for ano in sorted(int(ano) for ano in anos if ano is not None):
+        op.execute(
+            f"CREATE TABLE execucao_emendas_{ano} PARTITION OF execucao_emendas "
+            f"FOR VALUES FROM ({ano}) TO ({ano + 1})"
+        )
+
+    # Snapshots sem mês passam a valer como posição de dezembro
+    op.execute(f"""
+        INSERT INTO execucao_emendas ({COLUNAS})
+        SELECT {COLUNAS.replace('mes_execucao', 'COALESCE(mes_execucao, 12)')}
+        FROM execucao_emendas_copia
+        ON CONFLICT (emenda_id, ano_execucao, mes_execucao) DO NOTHING
+    """)
+    op.execute("SELECT setval(pg_get_serial_sequence('execucao_emendas', 'id'), COALESCE(MAX(id), 0) + 1, false) "
+               "FROM execucao_emendas")
+
+
+def downgrade():
+    op.execute("CREATE TEMP TABLE execucao_emendas_copia ON COMMIT DROP AS SELECT * FROM execucao_emendas")
+    # Remove também as partições
+    op.execute("DROP TABLE execucao_emendas CASCADE")
+
+    op.create_table('execucao_emendas',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('emenda_id', sa.Integer(), nullable=False),
+        sa.Column('ano_execucao', sa.Integer(), nullable=False),
+        sa.Column('mes_execucao', sa.Integer(), nullable=True),
+        sa.Column('data_referencia', sa.Date(), nullable=True),
+        sa.Column('valor_empenhado_acumulado', sa.Numeric(precision=15, scale=2), nullable=True),
+        sa.Column('valor_liquidado_acumulado', sa.Numeric(precision=15, scale=2), nullable=True),
+        sa.Column('valor_pago_acumulado', sa.Numeric(precision=15, scale=2), nullable=True),
+        sa.Column('percentual_empenhado', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('percentual_liquidado', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('percentual_pago', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('status_execucao', sa.String(length=50), nullable=True),
+        sa.Column('observacoes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['emenda_id'], ['emendas_parlamentares.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_execucao_emendas_ano_execucao'), 'execucao_emendas', ['ano_execucao'], unique=False)
+    op.create_index(op.f('ix_execucao_emendas_id'), 'execucao_emendas', ['id'], unique=False)
+
+    op.execute(f"INSERT INTO execucao_emendas ({COLUNAS}) SELECT {COLUNAS} FROM execucao_emendas_copia")
+    op.execute("SELECT setval(pg_get_serial_sequence('execucao_emendas', 'id'), COALESCE(MAX(id), 0) + 1, false) "
+               "FROM execucao_emendas")
@@ -3,7 +3,7 @@ Configurações da Kritikos API
 """
 
 import os
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 
 
@@ -42,6 +42,20 @@ class Settings(BaseSettings):
     # Configurações de rate limiting
     RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "100"))
     
+    # Configurações de limitação de concorrência (load shedding)
+    CONCURRENCY_LIMITS: Dict[str, int] = {
+        "/api/ranking": 20,
+        "/api/busca": 10,
+        "/api/deputados": 30,
+        "/api/proposicoes": 20,
+        "/api/emendas": 15,
+        "/api/gastos": 15,
+    }
+    CONCURRENCY_DEFAULT_LIMIT: int = int(os.getenv("CONCURRENCY_DEFAULT_LIMIT", "20"))
+    CONCURRENCY_QUEUE_SIZE: int = int(os.getenv("CONCURRENCY_QUEUE_SIZE", "50"))
+    CONCURRENCY_QUEUE_TIMEOUT: float = float(os.getenv("CONCURRENCY_QUEUE_TIMEOUT", "2.0"))
+    CONCURRENCY_RETRY_AFTER: int = int(os.getenv("CONCURRENCY_RETRY_AFTER", "5"))
+    
     # Configurações de paginação
     DEFAULT_PAGE_SIZE: int = int(os.getenv("DEFAULT_PAGE_SIZE", "20"))
     MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", "100"))
@@ -0,0 +1,161 @@
+"""
+Limitação de concorrência e descarte de carga (load shedding) da Kritikos API
+
+Cada grupo de rotas (prefixo) tem um número máximo de requisições em execução
+simultânea e uma fila de espera limitada. Quando a fila está cheia, ou o tempo
+de espera se esgota, a requisição recebe 503 imediatamente com Retry-After em
+vez de disputar conexões do pool do Postgres.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+class GrupoConcorrencia:
+    """Semáforo com fila de espera limitada e contadores para um grupo de rotas"""
+
+    def __init__(self, nome: str, limite: int, tamanho_fila: int, timeout_fila: float):
+        self.nome = nome
+        self.limite = limite
+        self.tamanho_fila = tamanho_fila
+        self.timeout_fila = timeout_fila
+        self._semaforo = asyncio.Semaphore(limite)
+        self.em_execucao = 0
+        self.aguardando = 0
+        self.aceitas = 0
+        self.rejeitadas_fila_cheia = 0
+        self.rejeitadas_timeout = 0
+
+    async def adquirir(self) -> Optional[str]:
+        """
+        Tenta obter uma vaga de execução
+
+        Returns:
+            None se a vaga foi obtida, ou o motivo da rejeição
+        """
+        # Caminho rápido: vaga livre e ninguém na frente
+        if not self._semaforo.locked() and self.aguardando == 0:
+            await self._semaforo.acquire()
+        else:
+            if self.aguardando >= self.tamanho_fila:
+                self.rejeitadas_fila_cheia += 1
+                return "fila_cheia"
+
+            self.aguardando += 1
+            try:
+                await asyncio.wait_for(self._semaforo.acquire(), timeout=self.timeout_fila)
+            except asyncio.TimeoutError:
+                self.rejeitadas_timeout += 1
+                return "timeout_fila"
+            finally:
+                self.aguardando -= 1
+
+        self.em_execucao += 1
+        self.aceitas += 1
+        return None
+
+    def liberar(self):
+        """Libera a vaga de execução"""
+        self.em_execucao -= 1
+        self._semaforo.release()
+
+    def metricas(self) -> Dict[str, Any]:
+        """Snapshot dos contadores do grupo"""
+        return {
+            "limite": self.limite,
+            "tamanho_fila": self.tamanho_fila,
+            "em_execucao": self.em_execucao,
+            "aguardando": self.aguardando,
+            "aceitas": self.aceitas,
+            "rejeitadas": self.rejeitadas_fila_cheia + self.rejeitadas_timeout,
+            "rejeitadas_fila_cheia": self.rejeitadas_fila_cheia,
+            "rejeitadas_timeout": self.rejeitadas_timeout
+        }
+
+
+class LimitadorConcorrencia:
+    """Middleware HTTP que aplica limites de concorrência por prefixo de rota"""
+
+    def __init__(
+        self,
+        limites_por_rota: Dict[str, int],
+        limite_padrao: int,
+        tamanho_fila: int,
+        timeout_fila: float,
+        retry_after: int,
+        rotas_isentas: Tuple[str, ...] = ("/health", "/docs", "/redoc", "/openapi.json")
+    ):
+        self.tamanho_fila = tamanho_fila
+        self.timeout_fila = timeout_fila
+        self.retry_after = retry_after
+        self.rotas_isentas = rotas_isentas
+        self.limite_padrao = limite_padrao
+        # Prefixos mais longos primeiro para que /api/ranking/idp vença /api/ranking
+        self._limites = sorted(limites_por_rota.items(), key=lambda item: len(item[0]), reverse=True)
+        self.grupos: Dict[str, GrupoConcorrencia] = {}
+
+    def _obter_grupo(self, path: str) -> Optional[GrupoConcorrencia]:
+        """Resolve o grupo de concorrência da rota (None para rotas isentas)"""
+        if path == "/" or path.startswith(self.rotas_isentas):
+            return None
+
+        nome, limite = "default", self.limite_padrao
+        for prefixo, limite_prefixo in self._limites:
+            if path.startswith(prefixo):
+                nome, limite = prefixo, limite_prefixo
+                break
+
+        grupo = self.grupos.get(nome)
+        if grupo is None:
+            grupo = GrupoConcorrencia(nome, limite, self.tamanho_fila, self.timeout_fila)
+            self.grupos[nome] = grupo
+        return grupo
+
+    def _resposta_rejeicao(self, request, motivo: str) -> JSONResponse:
+        """Resposta 503 rápida no mesmo formato do exception handler da API"""
+        return JSONResponse(
+            status_code=503,
+            headers={"Retry-After": str(self.retry_after)},
+            content={
+                "error": {
+                    "code": 503,
+                    "message": "Servidor sobrecarregado, tente novamente em instantes",
+                    "type": "OVERLOADED",
+                    "reason": motivo
+                },
+                "meta": {
+                    "timestamp": time.time(),
+                    "path": request.url.path
+                }
+            }
+        )
+
+    async def __call__(self, request, call_next):
+        grupo = self._obter_grupo(request.url.path)
+        if grupo is None:
+            return await call_next(request)
+
+        motivo = await grupo.adquirir()
+        if motivo:
+            logger.warning(f"🚫 Requisição rejeitada ({motivo}): {request.method} {request.url.path}")
+            return self._resposta_rejeicao(request, motivo)
+
+        try:
+            return await call_next(request)
+        finally:
+            grupo.liberar()
+
+    def metricas(self) -> Dict[str, Any]:
+        """Contadores agregados e por grupo de rotas"""
+        grupos = {nome: grupo.metricas() for nome, grupo in self.grupos.items()}
+        return {
+            "total_aceitas": sum(g["aceitas"] for g in grupos.values()),
+            "total_rejeitadas": sum(g["rejeitadas"] for g in grupos.values()),
+            "grupos": grupos
+        }
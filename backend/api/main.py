@@ -7,11 +7,14 @@ from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
 from typing import Dict, Any
 
 from .config import settings
+from .limiter import LimitadorConcorrencia
+from .warmup import executar_warmup
 from routers import deputados, gastos, emendas, proposicoes, ranking, busca
 from src.models.database import get_db, get_db_session
 
@@ -28,6 +31,10 @@ async def lifespan(app: FastAPI):
     """Gerenciar eventos de startup e shutdown da API"""
     # Startup
     app.state.start_time = time.time()
+    app.state.ready = False
+    
+    # Warm-up em segundo plano: /health/ready responde 503 até terminar
+    app.state.warmup_task = asyncio.get_running_loop().run_in_executor(None, executar_warmup, app)
     logger.info("🚀 Kritikos API iniciada com sucesso")
     logger.info(f"📚 Documentação disponível em: {settings.DOCS_URL}")
     logger.info(f"📖 ReDoc disponível em: {settings.REDOC_URL}")
@@ -142,6 +149,17 @@ async def log_requests(request, call_next):
     return response
 
 
+# Limitação de concorrência por rota (registrada por último = executa primeiro)
+limitador_concorrencia = LimitadorConcorrencia(
+    limites_por_rota=settings.CONCURRENCY_LIMITS,
+    limite_padrao=settings.CONCURRENCY_DEFAULT_LIMIT,
+    tamanho_fila=settings.CONCURRENCY_QUEUE_SIZE,
+    timeout_fila=settings.CONCURRENCY_QUEUE_TIMEOUT,
+    retry_after=settings.CONCURRENCY_RETRY_AFTER
+)
+app.middleware("http")(limitador_concorrencia)
+
+
 # Exception handler personalizado
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -257,6 +275,85 @@ async def database_health_check() -> Dict[str, Any]:
         )
 
 
+@app.get("/health/ready",
+    summary="Readiness da API",
+    description="Indica se o warm-up terminou e a API pode receber tráfego",
+    tags=["Health"],
+    responses={
+        200: {
+            "description": "API pronta",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "status": "ready",
+                        "warmup": {"duracao": 1.2, "conexoes_pool": 5},
+                        "timestamp": "2025-01-07T15:00:00Z"
+                    }
+                }
+            }
+        },
+        503: {
+            "description": "Warm-up ainda em andamento ou com falha no pool/mappers"
+        }
+    }
+)
+async def readiness_check() -> Dict[str, Any]:
+    """Readiness: 503 até o warm-up marcar app.state.ready"""
+    if not getattr(app.state, 'ready', False):
+        # app.state.warmup só existe quando o warm-up terminou (e falhou)
+        raise HTTPException(
+            status_code=503,
+            detail="Warm-up falhou" if getattr(app.state, 'warmup', None) else "API em aquecimento"
+        )
+    
+    return {
+        "status": "ready",
+        "warmup": getattr(app.state, 'warmup', None),
+        "timestamp": time.time()
+    }
+
+
+@app.get("/health/metrics",
+    summary="Métricas da API",
+    description="Uptime, estado do warm-up e contadores de requisições aceitas/rejeitadas por grupo de rotas",
+    tags=["Health"],
+    responses={
+        200: {
+            "description": "Métricas atuais",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "uptime": 3600,
+                        "ready": True,
+                        "concorrencia": {
+                            "total_aceitas": 1520,
+                            "total_rejeitadas": 12,
+                            "grupos": {
+                                "/api/ranking": {
+                                    "limite": 20,
+                                    "em_execucao": 3,
+                                    "aguardando": 0,
+                                    "aceitas": 900,
+                                    "rejeitadas": 12
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
+async def api_metrics() -> Dict[str, Any]:
+    """Métricas operacionais da API"""
+    return {
+        "uptime": time.time() - app.state.start_time if hasattr(app.state, 'start_time') else 0,
+        "ready": getattr(app.state, 'ready', False),
+        "concorrencia": limitador_concorrencia.metricas(),
+        "timestamp": time.time()
+    }
+
+
 # Endpoint raiz
 @app.get("/",
     summary="API Root",
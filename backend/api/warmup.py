@@ -0,0 +1,102 @@
+"""
+Aquecimento da Kritikos API no startup
+
+Antes de a API ser marcada como pronta, configura os mappers do SQLAlchemy e
+abre conexões do pool. A API só fica pronta se as duas etapas tiverem sucesso.
+"""
+
+import logging
+import time
+from typing import Dict, Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from src.models.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+def aquecer_pool_conexoes(quantidade: int) -> int:
+    """
+    Abre conexões simultâneas para que o pool já esteja populado
+
+    Args:
+        quantidade: Número de conexões a abrir ao mesmo tempo
+
+    Returns:
+        int: Número de conexões abertas com sucesso
+
+    Raises:
+        RuntimeError: Se nenhuma conexão pôde ser aberta
+    """
+    conexoes = []
+    try:
+        for _ in range(max(quantidade, 0)):
+            conexao = engine.connect()
+            conexao.execute(text("SELECT 1"))
+            conexoes.append(conexao)
+    except Exception as e:
+        logger.warning(f"⚠️ Pool aquecido parcialmente ({len(conexoes)}/{quantidade}): {e}")
+    finally:
+        # Devolver ao pool: as conexões continuam abertas para as próximas requisições
+        for conexao in conexoes:
+            conexao.close()
+
+    if quantidade > 0 and not conexoes:
+        raise RuntimeError("nenhuma conexão aberta com o banco")
+    return len(conexoes)
+
+
+def executar_warmup(app, conexoes_pool: int = 5) -> Dict[str, Any]:
+    """
+    Executa as etapas de aquecimento e marca a aplicação como pronta
+
+    Uma falha é registrada em app.state.warmup e não impede o startup da API,
+    mas app.state.ready só vira True se 'mappers' e 'pool' tiverem sucesso;
+    caso contrário /health/ready continua respondendo 503.
+
+    Args:
+        app: Instância FastAPI cujo state recebe as estruturas carregadas
+        conexoes_pool: Número de conexões a pré-abrir no pool
+
+    Returns:
+        Dict: Resumo com status e duração de cada etapa
+    """
+    inicio = time.time()
+    resumo: Dict[str, Any] = {"etapas": {}}
+
+    def _etapa(nome: str, funcao, *args):
+        inicio_etapa = time.time()
+        try:
+            resultado = funcao(*args)
+            resumo["etapas"][nome] = {
+                "status": "sucesso",
+                "duracao": round(time.time() - inicio_etapa, 3)
+            }
+            return resultado
+        except Exception as e:
+            logger.error(f"❌ Warm-up '{nome}' falhou: {e}")
+            resumo["etapas"][nome] = {
+                "status": "erro",
+                "duracao": round(time.time() - inicio_etapa, 3),
+                "erro": str(e)
+            }
+            return None
+
+    _etapa("mappers", configure_mappers)
+    conexoes_abertas = _etapa("pool", aquecer_pool_conexoes, conexoes_pool)
+
+    resumo["conexoes_pool"] = conexoes_abertas or 0
+    resumo["duracao"] = round(time.time() - inicio, 3)
+    pronta = all(
+        resumo["etapas"][etapa]["status"] == "sucesso" for etapa in ("mappers", "pool")
+    )
+    app.state.warmup = resumo
+    app.state.ready = pronta
+
+    if pronta:
+        logger.info(f"🔥 Warm-up concluído em {resumo['duracao']}s - pool: {resumo['conexoes_pool']}")
+    else:
+        logger.error(f"❌ Warm-up falhou em {resumo['duracao']}s - API não será marcada como pronta")
+    return resumo
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Teste de carga da Kritikos API
+
+Dispara requisições concorrentes contra cada router da API (rodando sobre um
+Postgres local já populado), mede latência p50/p95/p99, requisições por
+segundo e taxa de erro por endpoint e compara com um baseline salvo em JSON
+para detectar regressões antes do deploy.
+
+Banco local: --popular-ano aplica as migrações (alembic upgrade head) e roda
+a pipeline ETL do ano informado contra o DATABASE_URL do .env antes do teste.
+A medição só começa depois que /health/ready responde (warm-up concluído) e o
+--deputado-id existe; sem isso os cenários mediriam 503/404.
+
+Uso:
+    python load_test_api.py --popular-ano 2025               # popula o banco local e roda
+    python load_test_api.py                                  # roda e compara com o baseline
+    python load_test_api.py --salvar-baseline                # roda e grava o baseline
+    python load_test_api.py --concorrencia 50 --requisicoes 500
+    python load_test_api.py --router ranking --router busca  # apenas alguns routers
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+DIRETORIO_BACKEND = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PADRAO = os.path.join(DIRETORIO_BACKEND, "load_test_baseline.json")
+
+# Endpoints exercitados por router ({deputado_id} é substituído pelo id informado)
+CENARIOS: Dict[str, List[str]] = {
+    "health": [
+        "/health",
+        "/health/ready",
+    ],
+    "deputados": [
+        "/api/deputados/?page=1&per_page=20",
+        "/api/deputados/{deputado_id}",
+        "/api/deputados/{deputado_id}/dashboard",
+        "/api/deputados/{deputado_id}/gastos",
+        "/api/deputados/{deputado_id}/emendas",
+        "/api/deputados/{deputado_id}/proposicoes",
+    ],
+    "gastos": [
+        "/api/gastos/?page=1&per_page=20",
+    ],
+    "emendas": [
+        "/api/emendas/?page=1&per_page=20",
+    ],
+    "proposicoes": [
+        "/api/proposicoes/?page=1&per_page=20",
+    ],
+    "ranking": [
+        "/api/ranking/idp?page=1&per_page=20",
+        "/api/ranking/emendas?page=1&per_page=20",
+        "/api/ranking/gastos?page=1&per_page=20",
+        "/api/ranking/proposicoes?page=1&per_page=20",
+    ],
+    "busca": [
+        "/api/busca/proposicoes?q=saude",
+        "/api/busca/deputados?q=silva",
+        "/api/busca/sugestoes?q=edu",
+    ],
+}
+
+
+def percentil(valores_ordenados: List[float], p: float) -> float:
+    """
+    Percentil por interpolação linear
+
+    Args:
+        valores_ordenados: Amostras já ordenadas
+        p: Percentil entre 0 e 100
+
+    Returns:
+        float: Valor do percentil (0.0 se não houver amostras)
+    """
+    if not valores_ordenados:
+        return 0.0
+    posicao = (len(valores_ordenados) - 1) * p / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(valores_ordenados) - 1)
+    fracao = posicao - inferior
+    return valores_ordenados[inferior] + (valores_ordenados[superior] - valores_ordenados[inferior]) * fracao
+
+
+def popular_banco(ano: int) -> bool:
+    """
+    Prepara o Postgres local: migrações e pipeline ETL do ano
+
+    Args:
+        ano: Ano coletado pela pipeline (deputados, gastos, emendas, proposições)
+
+    Returns:
+        bool: True se migrações e pipeline terminaram sem erro
+    """
+    print("🗄️ Aplicando migrações (alembic upgrade head)...")
+    migracao = subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=DIRETORIO_BACKEND)
+    if migracao.returncode != 0:
+        print("❌ Falha nas migrações")
+        return False
+
+    print(f"📥 Populando o banco com a pipeline ETL de {ano}...")
+    sys.path.insert(0, os.path.join(DIRETORIO_BACKEND, "src"))
+    from etl.pipeline_coleta import ColetaPipeline
+
+    resultado = ColetaPipeline().executar_pipeline_etl(ano)
+    falhas = [etapa for etapa, dados in resultado.get("etapas", {}).items() if dados.get("status") != "sucesso"]
+    if falhas:
+        print(f"❌ Pipeline falhou nas etapas: {', '.join(falhas)}")
+        return False
+    return True
+
+
+class KritikosLoadTester:
+    """Executa cenários de carga com concorrência configurável por router"""
+
+    def __init__(
+        self,
+        base_url: str,
+        concorrencia: int,
+        requisicoes: int,
+        deputado_id: int,
+        concorrencia_por_router: Optional[Dict[str, int]] = None,
+        timeout: float = 30.0
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.concorrencia = concorrencia
+        self.requisicoes = requisicoes
+        self.deputado_id = deputado_id
+        self.concorrencia_por_router = concorrencia_por_router or {}
+        self.timeout = timeout
+
+    async def _medir_endpoint(self, client: httpx.AsyncClient, path: str, concorrencia: int) -> Dict[str, Any]:
+        """Dispara N requisições no endpoint com no máximo `concorrencia` em voo"""
+        latencias: List[float] = []
+        erros = 0
+        status_codes: Dict[str, int] = {}
+        proxima = 0
+
+        async def worker():
+            nonlocal proxima, erros
+            while proxima < self.requisicoes:
+                proxima += 1
+                inicio = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    codigo = str(response.status_code)
+                    if response.status_code >= 400:
+                        erros += 1
+                except httpx.HTTPError as e:
+                    codigo = type(e).__name__
+                    erros += 1
+                latencias.append(time.perf_counter() - inicio)
+                status_codes[codigo] = status_codes.get(codigo, 0) + 1
+
+        inicio_total = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concorrencia)))
+        duracao = time.perf_counter() - inicio_total
+
+        latencias.sort()
+        total = len(latencias)
+        return {
+            "requisicoes": total,
+            "concorrencia": concorrencia,
+            "duracao": round(duracao, 3),
+            "rps": round(total / duracao, 2) if duracao > 0 else 0.0,
+            "p50_ms": round(percentil(latencias, 50) * 1000, 2),
+            "p95_ms": round(percentil(latencias, 95) * 1000, 2),
+            "p99_ms": round(percentil(latencias, 99) * 1000, 2),
+            "taxa_erro": round(erros / total, 4) if total else 0.0,
+            "status_codes": status_codes
+        }
+
+    async def aguardar_api(self, client: httpx.AsyncClient, espera_maxima: float = 120.0) -> Optional[str]:
+        """
+        Espera o warm-up (/health/ready) e confere se o deputado de teste existe
+
+        Returns:
+            Optional[str]: Motivo pelo qual a API não está pronta (None se pronta)
+        """
+        limite = time.monotonic() + espera_maxima
+        while True:
+            try:
+                if (await client.get("/health/ready")).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > limite:
+                return f"/health/ready não respondeu 200 em {espera_maxima:.0f}s"
+            await asyncio.sleep(1)
+
+        response = await client.get(f"/api/deputados/{self.deputado_id}")
+        if response.status_code != 200:
+            return (f"deputado {self.deputado_id} indisponível (HTTP {response.status_code}) - "
+                    "popule o banco com --popular-ano ou informe --deputado-id")
+        return None
+
+    async def executar(self, routers: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Executa os cenários dos routers selecionados
+
+        Returns:
+            Dict: Resultados por endpoint, mais metadados da execução
+        """
+        selecionados = routers or list(CENARIOS.keys())
+        resultados: Dict[str, Any] = {}
+        limites = httpx.Limits(max_connections=max(self.concorrencia, *self.concorrencia_por_router.values(), 1))
+
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limites) as client:
+            motivo = await self.aguardar_api(client)
+            if motivo:
+                raise RuntimeError(motivo)
+
+            # Aquecimento: uma chamada por endpoint fora da medição
+            for router in selecionados:
+                for modelo in CENARIOS[router]:
+                    try:
+                        await client.get(modelo.format(deputado_id=self.deputado_id))
+                    except httpx.HTTPError:
+                        pass
+
+            for router in selecionados:
+                concorrencia = self.concorrencia_por_router.get(router, self.concorrencia)
+                print(f"🚀 Router '{router}' com concorrência {concorrencia}")
+                for modelo in CENARIOS[router]:
+                    path = modelo.format(deputado_id=self.deputado_id)
+                    resultado = await self._medir_endpoint(client, path, concorrencia)
+                    resultados[modelo] = resultado
+                    print(
+                        f"   {modelo:<45} p50 {resultado['p50_ms']:>8.1f}ms  "
+                        f"p95 {resultado['p95_ms']:>8.1f}ms  p99 {resultado['p99_ms']:>8.1f}ms  "
+                        f"{resultado['rps']:>8.1f} req/s  erro {resultado['taxa_erro'] * 100:.1f}%"
+                    )
+
+        return {
+            "base_url": self.base_url,
+            "requisicoes_por_endpoint": self.requisicoes,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "endpoints": resultados
+        }
+
+
+def comparar_com_baseline(
+    atual: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerancia_latencia: float,
+    tolerancia_rps: float,
+    tolerancia_erro: float
+) -> List[str]:
+    """
+    Compara a execução atual com o baseline
+
+    Args:
+        atual: Resultado de KritikosLoadTester.executar
+        baseline: Resultado salvo anteriormente
+        tolerancia_latencia: Aumento relativo máximo aceito em p95/p99 (0.2 = 20%)
+        tolerancia_rps: Queda relativa máxima aceita em req/s
+        tolerancia_erro: Aumento absoluto máximo aceito na taxa de erro
+
+    Returns:
+        List[str]: Descrição de cada regressão encontrada
+    """
+    regressoes = []
+    for endpoint, metricas in atual["endpoints"].items():
+        referencia = baseline.get("endpoints", {}).get(endpoint)
+        if not referencia:
+            continue
+
+        for chave in ("p95_ms", "p99_ms"):
+            if referencia[chave] > 0 and metricas[chave] > referencia[chave] * (1 + tolerancia_latencia):
+                regressoes.append(
+                    f"{endpoint}: {chave} {referencia[chave]:.1f} -> {metricas[chave]:.1f}"
+                )
+
+        if referencia["rps"] > 0 and metricas["rps"] < referencia["rps"] * (1 - tolerancia_rps):
+            regressoes.append(f"{endpoint}: rps {referencia['rps']:.1f} -> {metricas['rps']:.1f}")
+
+        if metricas["taxa_erro"] > referencia["taxa_erro"] + tolerancia_erro:
+            regressoes.append(
+                f"{endpoint}: taxa_erro {referencia['taxa_erro']:.2%} -> {metricas['taxa_erro']:.2%}"
+            )
+
+    return regressoes
+
+
+def _parse_concorrencia_router(valores: List[str]) -> Dict[str, int]:
+    """Converte ['ranking=50', 'busca=10'] em dicionário"""
+    resultado = {}
+    for valor in valores or []:
+        router, _, quantidade = valor.partition("=")
+        resultado[router] = int(quantidade)
+    return resultado
+
+
+async def main() -> int:
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Teste de carga da Kritikos API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concorrencia", type=int, default=20, help="Requisições simultâneas por endpoint")
+    parser.add_argument("--concorrencia-router", action="append", metavar="ROUTER=N",
+                        help="Concorrência específica de um router (pode repetir)")
+    parser.add_argument("--requisicoes", type=int, default=200, help="Requisições por endpoint")
+    parser.add_argument("--deputado-id", type=int, default=1, help="Deputado existente no banco local")
+    parser.add_argument("--popular-ano", type=int, metavar="ANO",
+                        help="Migra e popula o banco local com a pipeline ETL do ano antes do teste")
+    parser.add_argument("--router", action="append", choices=list(CENARIOS.keys()),
+                        help="Router a exercitar (pode repetir; padrão: todos)")
+    parser.add_argument("--baseline", default=BASELINE_PADRAO)
+    parser.add_argument("--salvar-baseline", action="store_true")
+    parser.add_argument("--saida", help="Arquivo JSON para salvar o resultado desta execução")
+    parser.add_argument("--tolerancia-latencia", type=float, default=0.20)
+    parser.add_argument("--tolerancia-rps", type=float, default=0.20)
+    parser.add_argument("--tolerancia-erro", type=float, default=0.01)
+    args = parser.parse_args()
+
+    if args.popular_ano and not popular_banco(args.popular_ano):
+        return 1
+
+    print(f"🌐 Teste de carga em: {args.base_url}")
+    tester = KritikosLoadTester(
+        base_url=args.base_url,
+        concorrencia=args.concorrencia,
+        requisicoes=args.requisicoes,
+        deputado_id=args.deputado_id,
+        concorrencia_por_router=_parse_concorrencia_router(args.concorrencia_router)
+    )
+    try:
+        resultado = await tester.executar(args.router)
+    except RuntimeError as e:
+        print(f"❌ API não está pronta para o teste: {e}")
+        return 1
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+
+    if args.salvar_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+        print(f"💾 Baseline salvo em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️ Baseline não encontrado em {args.baseline} (use --salvar-baseline)")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressoes = comparar_com_baseline(
+        resultado, baseline,
+        args.tolerancia_latencia, args.tolerancia_rps, args.tolerancia_erro
+    )
+
+    print("\n" + "=" * 50)
+    if regressoes:
+        print(f"❌ {len(regressoes)} regressões em relação ao baseline ({baseline.get('timestamp')}):")
+        for regressao in regressoes:
+            print(f"   - {regressao}")
+        return 1
+
+    print(f"✅ Sem regressões em relação ao baseline ({baseline.get('timestamp')})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
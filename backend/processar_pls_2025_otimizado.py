@@ -14,12 +14,14 @@ sys.path.insert(0, src_dir)
 
 import logging
 import time
+from concurrent.futures import as_completed, wait, FIRST_COMPLETED
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from models.db_utils import get_db_session
 from sqlalchemy import text
 from utils.gcs_utils import get_gcs_manager
+from utils.extracao_pdf import get_pool_extracao_pdf
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -213,69 +215,27 @@ class ProcessadorOtimizadoPLs2025:
             return None
     
     def extrair_texto_pdf_simples(self, pdf_bytes: bytes, api_id: str) -> str:
-        """Extração simples de texto com fallback."""
+        """Extração simples de texto com fallback (pool de processos com timeout)."""
         if not pdf_bytes:
             return None
         
-        # Tentar pdfplumber primeiro
-        texto = self._extrair_pdfplumber_simples(pdf_bytes, api_id)
+        # pdfplumber com fallback para PyPDF2, limitado a 10 páginas
+        extracao = get_pool_extracao_pdf().extrair(pdf_bytes, api_id, max_paginas=10)
+        return self._texto_da_extracao(extracao, api_id)
+    
+    def _texto_da_extracao(self, extracao: dict, api_id: str) -> str:
+        """Texto limpo a partir do resultado do pool de extração."""
+        if extracao['status'] == 'timeout':
+            logger.warning(f"⏱️ Timeout na extração do PDF {api_id}")
         
-        # Fallback para PyPDF2
-        if not texto:
-            texto = self._extrair_pypdf2_simples(pdf_bytes, api_id)
+        texto = '\n\n'.join(texto_pagina.strip() for _, texto_pagina in extracao['paginas'])
         
         if texto:
             texto = self._limpar_texto_simples(texto)
-            logger.debug(f"✅ Texto extraído: {len(texto)} caracteres")
+            logger.debug(f"✅ Texto extraído: {len(texto)} caracteres "
+                         f"({extracao['biblioteca']}, {extracao['duracao_s']:.2f}s)")
         
-        return texto
-    
-    def _extrair_pdfplumber_simples(self, pdf_bytes: bytes, api_id: str) -> str:
-        """Extração simples com pdfplumber."""
-        try:
-            import io
-            import pdfplumber
-            
-            with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                texto_paginas = []
-                
-                for i, page in enumerate(pdf.pages[:10]):  # Limitar a 10 páginas
-                    try:
-                        texto_pagina = page.extract_text()
-                        if texto_pagina and texto_pagina.strip():
-                            texto_paginas.append(texto_pagina.strip())
-                    except:
-                        continue
-                
-                return '\n\n'.join(texto_paginas)
-                
-        except Exception as e:
-            logger.debug(f"Erro pdfplumber {api_id}: {e}")
-            return None
-    
-    def _extrair_pypdf2_simples(self, pdf_bytes: bytes, api_id: str) -> str:
-        """Extração simples com PyPDF2."""
-        try:
-            import io
-            import PyPDF2
-            
-            with io.BytesIO(pdf_bytes) as pdf_stream:
-                reader = PyPDF2.PdfReader(pdf_stream)
-                texto_paginas = []
-                
-                for i, page in enumerate(reader.pages[:10]):  # Limitar a 10 páginas
-                    try:
-                        texto_pagina = page.extract_text()
-                        if texto_pagina and texto_pagina.strip():
-                            texto_paginas.append(texto_pagina.strip())
-                    except:
-                        continue
-                
-                return '\n\n'.join(texto_paginas)
-                
-        except Exception as e:
-            logger.debug(f"Erro PyPDF2 {api_id}: {e}")
-            return None
+        return texto or None
     
     def _limpar_texto_simples(self, texto: str) -> str:
         """Limpeza simples de texto."""
@@ -296,6 +256,15 @@ class ProcessadorOtimizadoPLs2025:
     
     def processar_pl_rapido(self, prop_info: dict) -> bool:
         """Processa um PL de forma otimizada."""
+        pdf_bytes = self.baixar_pl_rapido(prop_info)
+        if not pdf_bytes:
+            return False
+        
+        extracao = get_pool_extracao_pdf().extrair(pdf_bytes, str(prop_info['api_camara_id']), max_paginas=10)
+        return self.concluir_pl_rapido(prop_info, extracao)
+    
+    def baixar_pl_rapido(self, prop_info: dict) -> bytes:
+        """Passos 1 e 2: URL do inteiro teor e download do PDF."""
         api_id = str(prop_info['api_camara_id'])
         
         try:
@@ -305,16 +274,27 @@ class ProcessadorOtimizadoPLs2025:
             url_inteiro_teor = self.obter_url_inteiro_teor_rapido(api_id)
             if not url_inteiro_teor:
                 logger.warning(f"⚠️ Sem URL inteiro teor para {api_id}")
-                return False
+                return None
             
             # Passo 2: Baixar PDF
             pdf_bytes = self.baixar_pdf_rapido(url_inteiro_teor, api_id)
             if not pdf_bytes:
                 logger.warning(f"⚠️ Não foi possível baixar PDF para {api_id}")
-                return False
+                return None
             
+            return pdf_bytes
+                
+        except Exception as e:
+            logger.error(f"❌ Erro ao processar PL {api_id}: {e}")
+            return None
+    
+    def concluir_pl_rapido(self, prop_info: dict, extracao: dict) -> bool:
+        """Passos 3 e 4: texto da extração, upload para o GCS e atualização do banco."""
+        api_id = str(prop_info['api_camara_id'])
+        
+        try:
             # Passo 3: Extrair texto
-            texto = self.extrair_texto_pdf_simples(pdf_bytes, api_id)
+            texto = self._texto_da_extracao(extracao, api_id)
             if not texto:
                 logger.warning(f"⚠️ Não foi possível extrair texto de {api_id}")
                 return False
@@ -343,11 +323,18 @@ class ProcessadorOtimizadoPLs2025:
                 return False
                 
         except Exception as e:
+            self.session.rollback()
             logger.error(f"❌ Erro ao processar PL {api_id}: {e}")
             return False
     
     def processar_lote_otimizado(self, limite: int = 50, delay_segundos: float = 0.5) -> dict:
-        """Processa lote de forma otimizada."""
+        """
+        Processa lote de forma otimizada.
+        
+        Os downloads seguem em sequência (com o delay); cada PDF vai para o pool
+        de extração sem esperar, com no máximo 2x max_workers PDFs em memória.
+        Upload e UPDATE acontecem nesta thread conforme as extrações terminam.
+        """
         logger.info(f"🚀 Processando lote otimizado (limite: {limite})")
         
         props_faltantes = self.obter_pls_2025_faltantes(limite)
@@ -363,19 +350,45 @@ class ProcessadorOtimizadoPLs2025:
             'erros': []
         }
         
-        for i, prop_info in enumerate(props_faltantes, 1):
-            logger.info(f"📄 Processando {i}/{stats['total']}: {prop_info['tipo']} {prop_info['numero']}/{prop_info['ano']}")
-            
-            if self.processar_pl_rapido(prop_info):
+        pool = get_pool_extracao_pdf()
+        max_pendentes = 2 * pool.max_workers
+        pendentes = {}
+        
+        def contabilizar(prop_info: dict, sucesso: bool):
+            if sucesso:
                 stats['sucesso'] += 1
             else:
                 stats['falha'] += 1
                 stats['erros'].append(f"Falha: {prop_info['api_camara_id']}")
+        
+        def concluir(futuro):
+            prop_info = pendentes.pop(futuro)
+            contabilizar(prop_info, self.concluir_pl_rapido(prop_info, futuro.result()))
+        
+        for i, prop_info in enumerate(props_faltantes, 1):
+            logger.info(f"📄 Processando {i}/{stats['total']}: {prop_info['tipo']} {prop_info['numero']}/{prop_info['ano']}")
+            
+            # Limita os PDFs em memória: espera alguma extração terminar
+            while len(pendentes) >= max_pendentes:
+                concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    concluir(futuro)
+            
+            pdf_bytes = self.baixar_pl_rapido(prop_info)
+            if pdf_bytes:
+                futuro = pool.submeter(pdf_bytes, str(prop_info['api_camara_id']), max_paginas=10)
+                pendentes[futuro] = prop_info
+            else:
+                contabilizar(prop_info, False)
             
             # Rate limiting reduzido
             if delay_segundos > 0:
                 time.sleep(delay_segundos)
         
+        # Extrações restantes, conforme terminam
+        for futuro in as_completed(list(pendentes)):
+            concluir(futuro)
+        
         stats['taxa_sucesso'] = (stats['sucesso'] / stats['total'] * 100) if stats['total'] > 0 else 0
         
         logger.info(f"📊 Lote concluído: {stats['sucesso']}/{stats['total']} ({stats['taxa_sucesso']:.1f}%)")
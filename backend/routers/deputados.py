@@ -3,6 +3,7 @@ Router para endpoints de deputados
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Optional
 import logging
 
@@ -58,6 +59,36 @@ async def obter_deputado(deputado_id: int):
         logger.error(f"Erro ao obter deputado {deputado_id}: {e}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
 
+@router.get("/{deputado_id}/dashboard")
+async def obter_dashboard_deputado(
+    deputado_id: int,
+    ano: Optional[int] = Query(None, description="Filtrar emendas e gastos por ano"),
+    limite_proposicoes: int = Query(5, ge=1, le=20, description="Quantidade de proposições em destaque")
+):
+    """
+    Obter perfil, score, posição no ranking, proposições em destaque e
+    resumos de emendas e gastos de um deputado em uma única chamada
+    """
+    try:
+        deputado_service = get_deputado_service()
+        result = await run_in_threadpool(
+            deputado_service.obter_dashboard,
+            deputado_id,
+            ano,
+            limite_proposicoes
+        )
+        
+        if not result:
+            raise HTTPException(status_code=404, detail="Deputado não encontrado")
+            
+        return result
+            
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao obter dashboard do deputado {deputado_id}: {e}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
 @router.get("/{deputado_id}/gastos")
 async def obter_gastos_deputado(
     deputado_id: int,
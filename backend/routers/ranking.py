@@ -7,6 +7,7 @@ from typing import List, Optional
 import logging
 
 from schemas.ranking import IDPRankingResponse, EmendaRankingResponse, GastoRankingResponse, ProposicaoRankingResponse
+from services.ranking_service import get_ranking_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -85,41 +86,22 @@ async def ranking_idp(
 async def ranking_emendas(
     page: int = Query(1, ge=1, description="Número da página"),
     per_page: int = Query(20, ge=1, le=100, description="Itens por página"),
-    ano: Optional[int] = Query(None, description="Filtrar por ano")
+    ano: Optional[int] = Query(None, description="Filtrar por ano (padrão: ano mais recente)"),
+    mes: Optional[int] = Query(None, ge=1, le=12, description="Filtrar por mês (padrão: ranking anual)"),
+    ordenar_por: str = Query("valor", pattern="^(valor|quantidade|execucao)$", description="Critério do ranking")
 ):
     """
-    Ranking de deputados por valor total de emendas
+    Ranking de deputados por emendas (valor total, quantidade ou execução)
     """
     try:
-        # TODO: Implementar lógica real de busca no banco
-        ranking_mock = [
-            {
-                "deputado_id": 745,
-                "nome": "Beto Faro",
-                "sigla_partido": "PT",
-                "sigla_uf": "AC",
-                "url_foto": "https://www.camara.leg.br/internet/deputado/bandep/745.jpg",
-                "total_emendas": 30,
-                "valor_total_emendas": 2500000.00,
-                "ranking": 1,
-                "media_valor_emenda": 83333.33
-            }
-        ]
-        
-        return {
-            "data": ranking_mock,
-            "meta": {
-                "total": len(ranking_mock),
-                "page": page,
-                "per_page": per_page,
-                "total_pages": 1
-            },
-            "links": {
-                "self": f"/api/ranking/emendas?page={page}&per_page={per_page}",
-                "next": None,
-                "prev": None
-            }
-        }
+        ranking_service = get_ranking_service()
+        return ranking_service.ranking_emendas(
+            page=page,
+            per_page=per_page,
+            ano=ano,
+            mes=mes,
+            ordenar_por=ordenar_por
+        )
         
     except Exception as e:
         logger.error(f"Erro ao obter ranking de emendas: {e}")
@@ -2,18 +2,29 @@
 Services de negócio para Deputados
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, func
 import logging
+import threading
+import time
 
-from src.models.database import get_db
-from src.models.politico_models import Deputado
-from src.models.analise_models import ScoreDeputado
+from src.models.database import get_db, SessionLocal, engine
+from src.models.politico_models import Deputado, Mandato
+from src.models.base_models import Partido, Estado
+from src.models.analise_models import ScoreDeputado, AnaliseProposicao
+from src.models.proposicao_models import Proposicao, Autoria
+from src.models.emenda_models import EmendaParlamentar
+from src.models.financeiro_models import GastoParlamentar
 from schemas.deputado import DeputadoResponse, DeputadoList
 
 logger = logging.getLogger(__name__)
 
+# Conexões simultâneas das sub-consultas do dashboard (todas as requisições):
+# limitadas ao tamanho fixo do pool para não esgotá-lo sob carga
+_conexoes_dashboard = threading.BoundedSemaphore(max(1, getattr(engine.pool, 'size', lambda: 5)()))
+
 class DeputadoService:
     """Service para operações relacionadas a deputados"""
     
@@ -289,6 +300,231 @@ class DeputadoService:
             logger.error(f"Erro ao obter proposições do deputado {deputado_id}: {e}")
             raise e
 
+    # ------------------------------------------------------------------
+    # Dashboard agregado
+    # ------------------------------------------------------------------
+    
+    def obter_dashboard(
+        self,
+        deputado_id: int,
+        ano: Optional[int] = None,
+        limite_proposicoes: int = 5
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Obter o dashboard completo de um deputado em um único documento
+        
+        As sub-consultas são independentes e rodam em paralelo, cada uma com
+        sua própria sessão, de modo que a latência total é a da consulta
+        mais lenta e não a soma de todas. Um semáforo compartilhado limita
+        as sessões simultâneas de todos os dashboards ao tamanho do pool.
+        """
+        try:
+            inicio = time.time()
+            consultas: Dict[str, Callable[[Session], Any]] = {
+                "perfil": lambda db: _consultar_perfil(db, deputado_id),
+                "score": lambda db: _consultar_score(db, deputado_id),
+                "ranking": lambda db: _consultar_posicao_ranking(db, deputado_id),
+                "top_proposicoes": lambda db: _consultar_top_proposicoes(db, deputado_id, limite_proposicoes),
+                "emendas": lambda db: _consultar_resumo_emendas(db, deputado_id, ano),
+                "gastos": lambda db: _consultar_resumo_gastos(db, deputado_id, ano),
+            }
+            
+            with ThreadPoolExecutor(max_workers=len(consultas)) as executor:
+                futuros = {
+                    nome: executor.submit(_executar_em_sessao_propria, consulta)
+                    for nome, consulta in consultas.items()
+                }
+                resultados = {nome: futuro.result() for nome, futuro in futuros.items()}
+            
+            if not resultados["perfil"]:
+                return None
+            
+            return {
+                "data": {
+                    "deputado": resultados["perfil"],
+                    "score": resultados["score"],
+                    "ranking": resultados["ranking"],
+                    "top_proposicoes": resultados["top_proposicoes"],
+                    "emendas": resultados["emendas"],
+                    "gastos": resultados["gastos"]
+                },
+                "meta": {
+                    "ano": ano,
+                    "tempo_consulta": round(time.time() - inicio, 3)
+                },
+                "links": {
+                    "self": f"/api/deputados/{deputado_id}/dashboard" + (f"?ano={ano}" if ano else ""),
+                    "proposicoes": f"/api/deputados/{deputado_id}/proposicoes",
+                    "emendas": f"/api/deputados/{deputado_id}/emendas",
+                    "gastos": f"/api/deputados/{deputado_id}/gastos"
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"Erro ao obter dashboard do deputado {deputado_id}: {e}")
+            raise e
+
+
+def _executar_em_sessao_propria(consulta: Callable[[Session], Any]) -> Any:
+    """Executa uma sub-consulta com uma sessão exclusiva da thread"""
+    with _conexoes_dashboard:
+        db = SessionLocal()
+        try:
+            return consulta(db)
+        finally:
+            db.close()
+
+
+def _consultar_perfil(db: Session, deputado_id: int) -> Optional[Dict[str, Any]]:
+    """Dados pessoais do deputado e partido/UF do mandato mais recente"""
+    linha = db.query(Deputado, Partido.sigla, Estado.sigla).outerjoin(
+        Mandato, Mandato.deputado_id == Deputado.id
+    ).outerjoin(
+        Partido, Partido.id == Mandato.partido_id
+    ).outerjoin(
+        Estado, Estado.id == Mandato.estado_id
+    ).filter(
+        Deputado.id == deputado_id
+    ).order_by(
+        Mandato.data_inicio.desc().nullslast()
+    ).first()
+    
+    if not linha:
+        return None
+    
+    deputado, sigla_partido, sigla_uf = linha
+    return {
+        "id": deputado.id,
+        "nome": deputado.nome,
+        "sigla_partido": sigla_partido or "",
+        "sigla_uf": sigla_uf or "",
+        "url_foto": deputado.foto_url or "",
+        "email": deputado.email or "",
+        "telefone": deputado.telefone or "",
+        "situacao": deputado.situacao or ""
+    }
+
+
+def _consultar_score(db: Session, deputado_id: int) -> Optional[Dict[str, Any]]:
+    """Decomposição do IDP do deputado"""
+    score = db.query(ScoreDeputado).filter(
+        ScoreDeputado.deputado_id == deputado_id
+    ).first()
+    
+    if not score:
+        return None
+    
+    return {
+        "idp": float(score.score_final or 0),
+        "desempenho_legislativo": float(score.desempenho_legislativo or 0),
+        "relevancia_social": float(score.relevancia_social or 0),
+        "responsabilidade_fiscal": float(score.responsabilidade_fiscal or 0),
+        "etica_legalidade": float(score.etica_legalidade or 0),
+        "total_proposicoes": score.total_proposicoes or 0,
+        "proposicoes_relevantes": score.props_relevantes or 0,
+        "data_calculo": score.data_calculo.isoformat() if score.data_calculo else None
+    }
+
+
+def _consultar_posicao_ranking(db: Session, deputado_id: int) -> Optional[Dict[str, Any]]:
+    """Posição do deputado no ranking IDP"""
+    linha = db.execute(text("""
+        SELECT posicao, total
+        FROM (
+            SELECT deputado_id,
+                   RANK() OVER (ORDER BY score_final DESC) AS posicao,
+                   COUNT(*) OVER () AS total
+            FROM scores_deputados
+        ) ranking
+        WHERE deputado_id = :deputado_id
+    """), {"deputado_id": deputado_id}).first()
+    
+    if not linha:
+        return None
+    
+    return {"posicao": linha.posicao, "total": linha.total}
+
+
+def _consultar_top_proposicoes(db: Session, deputado_id: int, limite: int) -> List[Dict[str, Any]]:
+    """Proposições do deputado com maior score PAR"""
+    linhas = db.query(
+        Proposicao, AnaliseProposicao.par_score, AnaliseProposicao.resumo_texto
+    ).join(
+        Autoria, Autoria.proposicao_id == Proposicao.id
+    ).outerjoin(
+        AnaliseProposicao, AnaliseProposicao.proposicao_id == Proposicao.id
+    ).filter(
+        Autoria.deputado_id == deputado_id
+    ).order_by(
+        AnaliseProposicao.par_score.desc().nullslast(),
+        Proposicao.data_apresentacao.desc()
+    ).limit(limite).all()
+    
+    return [
+        {
+            "id": proposicao.id,
+            "tipo": proposicao.tipo,
+            "numero": proposicao.numero,
+            "ano": proposicao.ano,
+            "ementa": proposicao.ementa,
+            "score_par": par_score,
+            "resumo": resumo,
+            "data_apresentacao": proposicao.data_apresentacao.isoformat() if proposicao.data_apresentacao else None
+        }
+        for proposicao, par_score, resumo in linhas
+    ]
+
+
+def _consultar_resumo_emendas(db: Session, deputado_id: int, ano: Optional[int]) -> Dict[str, Any]:
+    """Totais de emendas do deputado (opcionalmente de um ano)"""
+    query = db.query(
+        func.count(EmendaParlamentar.id),
+        func.coalesce(func.sum(EmendaParlamentar.valor_emenda), 0),
+        func.coalesce(func.sum(EmendaParlamentar.valor_empenhado), 0),
+        func.coalesce(func.sum(EmendaParlamentar.valor_pago), 0)
+    ).filter(EmendaParlamentar.deputado_id == deputado_id)
+    
+    if ano:
+        query = query.filter(EmendaParlamentar.ano == ano)
+    
+    quantidade, valor_total, valor_empenhado, valor_pago = query.one()
+    return {
+        "total_emendas": quantidade,
+        "valor_total": float(valor_total),
+        "valor_empenhado": float(valor_empenhado),
+        "valor_pago": float(valor_pago)
+    }
+
+
+def _consultar_resumo_gastos(db: Session, deputado_id: int, ano: Optional[int]) -> Dict[str, Any]:
+    """Totais de gastos parlamentares e principais tipos de despesa"""
+    filtros = [GastoParlamentar.deputado_id == deputado_id]
+    if ano:
+        filtros.append(GastoParlamentar.ano == ano)
+    
+    total, quantidade = db.query(
+        func.coalesce(func.sum(GastoParlamentar.valor_liquido), 0),
+        func.count(GastoParlamentar.id)
+    ).filter(*filtros).one()
+    
+    por_tipo = db.query(
+        GastoParlamentar.tipo_despesa,
+        func.sum(GastoParlamentar.valor_liquido).label("valor")
+    ).filter(*filtros).group_by(
+        GastoParlamentar.tipo_despesa
+    ).order_by(
+        func.sum(GastoParlamentar.valor_liquido).desc()
+    ).limit(5).all()
+    
+    return {
+        "total_gastos": float(total),
+        "quantidade_documentos": quantidade,
+        "principais_despesas": [
+            {"tipo_despesa": tipo, "valor": float(valor or 0)}
+            for tipo, valor in por_tipo
+        ]
+    }
+
 
 def get_deputado_service() -> DeputadoService:
     """Factory function para obter instância do serviço"""
@@ -0,0 +1,116 @@
+"""
+Services de negócio para Rankings
+"""
+
+from typing import Optional, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+import logging
+
+from src.models.database import get_db
+from src.models.politico_models import Deputado
+from src.models.emenda_models import RankingEmendas
+
+logger = logging.getLogger(__name__)
+
+# Critério de ordenação -> coluna de posição pré-calculada
+CRITERIOS_RANKING_EMENDAS = {
+    "valor": RankingEmendas.ranking_valor,
+    "quantidade": RankingEmendas.ranking_quantidade,
+    "execucao": RankingEmendas.ranking_execucao,
+}
+
+
+class RankingService:
+    """Service para operações relacionadas a rankings"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def ranking_emendas(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        ano: Optional[int] = None,
+        mes: Optional[int] = None,
+        ordenar_por: str = "valor"
+    ) -> Dict[str, Any]:
+        """
+        Ranking de emendas a partir das posições pré-calculadas em ranking_emendas
+
+        Sem ano, usa o ano mais recente disponível. Sem mês, usa o ranking anual
+        (mes_referencia nulo).
+        """
+        try:
+            coluna_posicao = CRITERIOS_RANKING_EMENDAS[ordenar_por]
+
+            if ano is None:
+                ano = self.db.query(func.max(RankingEmendas.ano_referencia)).scalar()
+
+            query = self.db.query(RankingEmendas, Deputado.nome, Deputado.foto_url).join(
+                Deputado, Deputado.id == RankingEmendas.deputado_id
+            ).filter(
+                RankingEmendas.ano_referencia == ano,
+                RankingEmendas.mes_referencia == mes if mes else RankingEmendas.mes_referencia.is_(None)
+            )
+
+            total = query.count()
+            offset = (page - 1) * per_page
+            linhas = query.order_by(
+                coluna_posicao, RankingEmendas.deputado_id
+            ).offset(offset).limit(per_page).all()
+
+            ranking_data = []
+            for ranking, nome, foto_url in linhas:
+                ranking_data.append({
+                    "deputado_id": ranking.deputado_id,
+                    "nome": nome,
+                    "url_foto": foto_url or "",
+                    "total_emendas": ranking.quantidade_emendas or 0,
+                    "valor_total_emendas": float(ranking.valor_total_emendas or 0),
+                    "media_valor_emenda": float(ranking.valor_medio_emenda or 0),
+                    "valor_total_executado": float(ranking.valor_total_executado or 0),
+                    "percentual_execucao_medio": float(ranking.percentual_execucao_medio or 0),
+                    "ranking": getattr(ranking, coluna_posicao.key),
+                    "ranking_valor": ranking.ranking_valor,
+                    "ranking_quantidade": ranking.ranking_quantidade,
+                    "ranking_execucao": ranking.ranking_execucao,
+                    "municipios_beneficiados": ranking.quantidade_municipios_beneficiados or 0,
+                    "ufs_beneficiadas": ranking.quantidade_ufs_beneficiadas or 0
+                })
+
+            total_pages = (total + per_page - 1) // per_page
+            filtros = f"&ano={ano}" if ano else ""
+            filtros += f"&mes={mes}" if mes else ""
+            filtros += f"&ordenar_por={ordenar_por}"
+
+            return {
+                "data": ranking_data,
+                "meta": {
+                    "total": total,
+                    "page": page,
+                    "per_page": per_page,
+                    "total_pages": total_pages,
+                    "ano": ano,
+                    "mes": mes,
+                    "ordenar_por": ordenar_por
+                },
+                "links": {
+                    "self": f"/api/ranking/emendas?page={page}&per_page={per_page}{filtros}",
+                    "next": f"/api/ranking/emendas?page={page + 1}&per_page={per_page}{filtros}" if page < total_pages else None,
+                    "prev": f"/api/ranking/emendas?page={page - 1}&per_page={per_page}{filtros}" if page > 1 else None
+                }
+            }
+
+        except Exception as e:
+            logger.error(f"Erro ao obter ranking de emendas: {e}")
+            raise e
+
+
+def get_ranking_service() -> RankingService:
+    """Factory function para obter instância do serviço"""
+    db = next(get_db())
+    try:
+        return RankingService(db)
+    finally:
+        db.close()
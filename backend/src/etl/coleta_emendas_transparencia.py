@@ -10,6 +10,7 @@ import re
 import time
 from pathlib import Path
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
@@ -27,13 +28,17 @@ from config import get_config
 import models
 from models.database import get_db
 from models.politico_models import Deputado
-from models.emenda_models import EmendaParlamentar, DetalheEmenda, VotacaoEmenda, RankingEmendas
+from models.emenda_models import EmendaParlamentar, DetalheEmenda, VotacaoEmenda
 
 # Importar utilitários
 from utils.gcs_utils import get_gcs_manager
 
 # Importar ETL utils
 from .etl_utils import ETLBase, DateParser, GCSUploader
+from .http_client import get_token_bucket
+from .ranking_emendas import regenerar_ranking_emendas
+from .matcher_autores import MatcherAutores
+from .motor_emendas import MotorIngestaoEmendas, FonteTransparenciaAPI, resolver_por_nome
 
 # Carregar variáveis de ambiente
 from dotenv import load_dotenv
@@ -59,6 +64,16 @@ class ColetorEmendasTransparencia(ETLBase):
             "chave-api-dados": self.api_key,
             "Accept": "application/json"
         }
+        self.session.headers.update(self.headers)
+        
+        # Cota própria do portal: limitador compartilhado por todas as threads do processo
+        self.transparencia_config = get_config('transparencia')
+        self.limitador = get_token_bucket('transparencia')
+        self.max_concorrencia = self.transparencia_config.get('max_concorrencia', 4)
+        self.cache_ttl = timedelta(hours=self.transparencia_config.get('cache_horas', 6))
+        
+        # Documentos já buscados nesta execução (codigoEmenda -> documentos)
+        self._documentos: Dict[str, List[Dict]] = {}
         
         # Inicializar GCS Manager
         self.gcs_manager = get_gcs_manager()
@@ -68,111 +83,115 @@ class ColetorEmendasTransparencia(ETLBase):
         print(f"   🔑 Chave API: {self.api_key[:10]}...")
         print(f"   📁 GCS disponível: {self.gcs_disponivel}")
 
-    def fazer_requisicao_api(self, params: Dict[str, Any]) -> Optional[List[Dict]]:
+    def fazer_requisicao_api(self, params: Dict[str, Any], url: Optional[str] = None) -> Optional[List[Dict]]:
         """
-        Faz requisição à API com tratamento de erros e rate limiting
-        """
-        try:
-            import requests
-            response = requests.get(self.base_url, headers=self.headers, params=params, timeout=30)
+        Faz requisição à API com cache de respostas, limitador da cota do portal e retry
+        
+        Args:
+            params: Parâmetros da consulta
+            url: Endpoint (padrão: listagem de emendas)
             
-            if response.status_code == 200:
-                data = response.json()
-                if isinstance(data, list):
-                    return data
-                elif isinstance(data, dict) and 'dados' in data:
-                    return data['dados']
-                else:
-                    return data
-            else:
-                print(f"      ❌ Erro HTTP {response.status_code}: {response.text[:200]}")
-                return None
-                
-        except Exception as e:
-            print(f"      ❌ Erro na requisição: {e}")
+        Returns:
+            List: Registros da página ou None em caso de erro
+        """
+        data = self.make_request(
+            url or self.base_url, params,
+            use_cache=True, timeout=self.transparencia_config.get('timeout', 30),
+            limitador=self.limitador, cache_ttl=self.cache_ttl
+        )
+        if data is None:
             return None
+        if isinstance(data, dict) and 'dados' in data:
+            return data['dados']
+        return data
 
-    def limpar_valor_monetario(self, valor) -> float:
+    def _paginar_concorrente(self, params: Dict[str, Any], url: Optional[str] = None,
+                             itens_por_pagina: Optional[int] = None, limite: Optional[int] = None) -> List[Dict]:
         """
-        Converte valor monetário para float de forma robusta
-        Baseado no código validado que funcionou
+        Percorre as páginas em janelas de `max_concorrencia` páginas simultâneas
+        
+        A API não informa o total de páginas: cada janela é buscada em paralelo e
+        a paginação termina na primeira página vazia (ou incompleta, quando o
+        tamanho da página é conhecido). No máximo uma janela extra é solicitada.
+        
+        Args:
+            params: Filtros da consulta (sem 'pagina')
+            url: Endpoint (padrão: listagem de emendas)
+            itens_por_pagina: Tamanho esperado da página, se enviado em params
+            limite: Máximo de registros
+            
+        Returns:
+            List: Registros na ordem das páginas
         """
-        if not valor:
-            return 0.0
+        max_paginas = self.transparencia_config.get('max_paginas', 100)
+        registros: List[Dict] = []
+        pagina = 1
         
-        try:
-            # Conversão robusta como no código validado
-            return float(str(valor).replace('.', '').replace(',', '.') or 0)
-        except (ValueError, AttributeError):
-            return 0.0
+        with ThreadPoolExecutor(max_workers=self.max_concorrencia) as executor:
+            while pagina <= max_paginas:
+                janela = list(range(pagina, min(pagina + self.max_concorrencia, max_paginas + 1)))
+                respostas = executor.map(lambda p: self.fazer_requisicao_api({**params, 'pagina': p}, url), janela)
+                
+                fim = False
+                for numero, dados in zip(janela, respostas):
+                    if not dados:
+                        fim = True
+                        break
+                    registros.extend(dados)
+                    print(f"      📄 Página {numero}: +{len(dados)} registros")
+                    if (itens_por_pagina and len(dados) < itens_por_pagina) or (limite and len(registros) >= limite):
+                        fim = True
+                        break
+                
+                if fim:
+                    break
+                pagina += len(janela)
+        
+        return registros[:limite] if limite else registros
 
     def buscar_documentos_emenda(self, codigo_emenda: str) -> List[Dict]:
         """
         Busca documentos relacionados à emenda
         Endpoint: /api-de-dados/emendas/documentos/{codigo}
         """
+        codigo_emenda = str(codigo_emenda)
+        if codigo_emenda in self._documentos:
+            return self._documentos[codigo_emenda]
+        
         try:
-            import requests
-            
             url = f"{self.base_url}/documentos/{codigo_emenda}"
-            params = {"pagina": 1}
-            
             documentos = []
-            while True:
-                response = requests.get(url, headers=self.headers, params=params, timeout=30)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if isinstance(data, list):
-                        docs_pagina = data
-                    elif isinstance(data, dict) and 'dados' in data:
-                        docs_pagina = data['dados']
-                    else:
-                        docs_pagina = []
-                    
-                    if not docs_pagina:
-                        break
-                        
-                    documentos.extend(docs_pagina)
-                    params["pagina"] += 1
-                    time.sleep(0.5)
-                else:
+            pagina = 1
+            while pagina <= self.transparencia_config.get('max_paginas', 100):
+                docs_pagina = self.fazer_requisicao_api({"pagina": pagina}, url)
+                if not docs_pagina:
                     break
+                documentos.extend(docs_pagina)
+                pagina += 1
             
+            self._documentos[codigo_emenda] = documentos
             return documentos
             
         except Exception as e:
             print(f"      ❌ Erro ao buscar documentos: {e}")
             return []
 
-    def extrair_campos_completos(self, emenda_data: Dict) -> Dict:
+    def buscar_documentos_emendas(self, codigos: List[str]) -> Dict[str, List[Dict]]:
         """
-        Extrai todos os campos financeiros e de otimização da API
-        """
-        campos_extraidos = {}
-        
-        # Campos financeiros adicionais do Portal da Transparência
-        campos_extraidos['valor_resto_inscrito'] = self.limpar_valor_monetario(
-            emenda_data.get('valorRestoInscrito', '0')
-        )
-        campos_extraidos['valor_resto_cancelado'] = self.limpar_valor_monetario(
-            emenda_data.get('valorRestoCancelado', '0')
-        )
-        campos_extraidos['valor_resto_pago'] = self.limpar_valor_monetario(
-            emenda_data.get('valorRestoPago', '0')
-        )
-        
-        # Campos de otimização com códigos da API
-        campos_extraidos['codigo_funcao_api'] = emenda_data.get('codigoFuncao')
-        campos_extraidos['codigo_subfuncao_api'] = emenda_data.get('codigoSubfuncao')
+        Busca os documentos de várias emendas em paralelo (limitado pela cota do portal)
         
-        # Campos de documentação
-        codigo_emenda = str(emenda_data.get('codigoEmenda', ''))
-        documentos = self.buscar_documentos_emenda(codigo_emenda)
-        campos_extraidos['documentos_url'] = f"{self.base_url}/documentos/{codigo_emenda}" if documentos else None
-        campos_extraidos['quantidade_documentos'] = len(documentos)
-        
-        return campos_extraidos
+        Args:
+            codigos: Códigos das emendas
+            
+        Returns:
+            Dict: codigoEmenda -> documentos
+        """
+        pendentes = [str(c) for c in dict.fromkeys(codigos) if str(c) not in self._documentos]
+        if pendentes:
+            print(f"   📎 Buscando documentos de {len(pendentes)} emendas ({self.max_concorrencia} em paralelo)")
+            with ThreadPoolExecutor(max_workers=self.max_concorrencia) as executor:
+                list(executor.map(self.buscar_documentos_emenda, pendentes))
+        return {str(c): self._documentos.get(str(c), []) for c in codigos}
 
     def buscar_todas_emendas_deputado(self, nome_deputado: str, ano: int) -> List[Dict]:
         """
@@ -181,33 +200,12 @@ class ColetorEmendasTransparencia(ETLBase):
         """
         print(f"   🔍 Buscando emendas de {nome_deputado} - {ano}")
         
-        todas_emendas = []
-        pagina = 1
-        
-        while True:
-            params = {
-                "ano": ano,
-                "nomeAutor": nome_deputado,  # Filtro específico por deputado
-                "pagina": pagina
-            }
-            
-            print(f"      📄 Página {pagina}...")
-            
-            emendas_pagina = self.fazer_requisicao_api(params)
-            if not emendas_pagina:
-                break
-            
-            if not emendas_pagina:  # Lista vazia = fim dos resultados
-                print(f"      ✅ Fim da coleta - página {pagina-1} foi a última")
-                break
-            
-            print(f"      → {len(emendas_pagina)} emendas encontradas")
-            todas_emendas.extend(emendas_pagina)
-            pagina += 1
-            
-            # Rate limiting
-            time.sleep(0.5)
+        todas_emendas = self._paginar_concorrente({
+            "ano": ano,
+            "nomeAutor": nome_deputado  # Filtro específico por deputado
+        })
         
+        print(f"      ✅ {len(todas_emendas)} emendas encontradas")
         return todas_emendas
 
     def buscar_emendas_ano(self, ano: int, limite: int = 1000) -> List[Dict]:
@@ -216,307 +214,70 @@ class ColetorEmendasTransparencia(ETLBase):
         """
         print(f"   🔍 Buscando emendas de {ano} (limite: {limite})")
         
-        todas_emendas = []
-        pagina = 1
-        
-        while len(todas_emendas) < limite:
-            params = {
-                'ano': ano,
-                'pagina': pagina,
-                'itens': min(100, limite - len(todas_emendas))
-            }
-            
-            emendas_pagina = self.fazer_requisicao_api(params)
-            if not emendas_pagina:
-                break
-            
-            todas_emendas.extend(emendas_pagina)
-            print(f"      📄 Página {pagina}: +{len(emendas_pagina)} emendas")
-            
-            # Se não tem mais resultados, parar
-            if len(emendas_pagina) < params['itens']:
-                break
-            
-            pagina += 1
-            if pagina > 100:  # Limite de segurança
-                break
-            
-            # Rate limiting
-            time.sleep(0.5)  # 500ms entre requisições
+        itens = min(self.transparencia_config.get('itens_por_pagina', 100), limite)
+        emendas = self._paginar_concorrente(
+            {'ano': ano, 'itens': itens},
+            itens_por_pagina=itens,
+            limite=limite
+        )
         
-        # Limitar ao número desejado
-        emendas = todas_emendas[:limite]
         print(f"      ✅ Total encontrado: {len(emendas)} emendas de {ano}")
-        
         return emendas
 
-    def mapear_tipo_emenda(self, tipo_emenda: str) -> str:
+    def _dados_emenda_gcs(self, emenda: EmendaParlamentar, emenda_data: Dict) -> Dict[str, Any]:
         """
-        Mapeia tipos de emenda da API para o modelo
+        Monta o documento JSON com os dados completos da emenda para o GCS
         """
-        tipo_normalizado = tipo_emenda.strip().upper()
-        
-        mapeamento = {
-            'EMENDA INDIVIDUAL': 'EMD',
-            'EMENDA DE BANCADA': 'EMB',
-            'EMENDA DE COMISSÃO': 'EMC',
-            'EMENDA DE RELATOR': 'EMR'
+        return {
+            'emenda': {
+                'id': emenda.id,
+                'api_camara_id': emenda.api_camara_id,
+                'tipo_emenda': emenda.tipo_emenda,
+                'numero': emenda.numero,
+                'ano': emenda.ano,
+                'emenda': emenda.emenda,
+                'local': emenda.local,
+                'natureza': emenda.natureza,
+                'tema': emenda.tema,
+                'valor_emenda': float(emenda.valor_emenda) if emenda.valor_emenda else None,
+                'beneficiario_principal': emenda.beneficiario_principal,
+                'situacao': emenda.situacao,
+                'data_apresentacao': emenda.data_apresentacao.isoformat() if emenda.data_apresentacao else None,
+                'autor': emenda.autor,
+                'partido_autor': emenda.partido_autor,
+                'uf_autor': emenda.uf_autor,
+                'url_documento': emenda.url_documento,
+                'created_at': emenda.created_at.isoformat() if emenda.created_at else None
+            },
+            'dados_api_transparencia': emenda_data,
+            'metadados': {
+                'data_coleta': datetime.now().isoformat(),
+                'fonte': 'API Portal da Transparência',
+                'versao': '1.0'
+            }
         }
-        
-        return mapeamento.get(tipo_normalizado, 'EMD')
-
-    def extrair_local_emenda(self, funcao: str, subfuncao: str, localidade: str) -> Optional[str]:
-        """
-        Extrai local da emenda baseado na função e localidade
-        """
-        if not funcao:
-            return None
-        
-        funcao_lower = funcao.lower()
-        
-        # Mapeamento baseado em funções orçamentárias
-        if 'saúde' in funcao_lower or 'saude' in funcao_lower:
-            return 'SAÚDE'
-        elif 'educação' in funcao_lower or 'educacao' in funcao_lower:
-            return 'EDUCAÇÃO'
-        elif 'urbanismo' in funcao_lower:
-            return 'URBANISMO'
-        elif 'assistência' in funcao_lower or 'assistencia' in funcao_lower:
-            return 'ASSISTÊNCIA SOCIAL'
-        elif 'segurança' in funcao_lower or 'seguranca' in funcao_lower:
-            return 'SEGURANÇA'
-        elif 'infraestrutura' in funcao_lower:
-            return 'INFRAESTRUTURA'
-        else:
-            return funcao.upper()
-
-    def extrair_natureza_emenda(self, tipo_emenda: str, autor: str) -> str:
-        """
-        Extrai natureza da emenda baseado no tipo e autor
-        """
-        if 'BANCADA' in tipo_emenda.upper():
-            return 'Bancada'
-        elif 'INDIVIDUAL' in tipo_emenda.upper():
-            return 'Individual'
-        elif 'COMISSÃO' in tipo_emenda.upper() or 'COMISSAO' in tipo_emenda.upper():
-            return 'Comissão'
-        else:
-            return 'Individual'  # Default
-
-    def buscar_deputado_por_nome(self, nome_autor: str, db: Session) -> Optional[int]:
-        """
-        Busca ID do deputado pelo nome com estratégia robusta
-        """
-        if not nome_autor or 'BANCADA' in nome_autor.upper():
-            return None
-        
-        # Tentar match exato primeiro
-        deputado = db.query(Deputado).filter(
-            func.upper(Deputado.nome) == func.upper(nome_autor.strip())
-        ).first()
-        
-        if deputado:
-            return deputado.id
-        
-        # Tentar match parcial
-        deputado = db.query(Deputado).filter(
-            Deputado.nome.ilike(f"%{nome_autor.strip()}%")
-        ).first()
-        
-        if deputado:
-            return deputado.id
-        
-        # Tentar sem sobrenomes (fallback)
-        partes_nome = nome_autor.strip().split()
-        if len(partes_nome) >= 2:
-            primeiro_nome = partes_nome[0]
-            deputado = db.query(Deputado).filter(
-                Deputado.nome.ilike(f"{primeiro_nome}%")
-            ).first()
-            
-            if deputado:
-                return deputado.id
-        
-        return None
 
-    def salvar_emenda_transparencia(self, emenda_data: Dict, db: Session) -> Optional[EmendaParlamentar]:
+    def _criar_motor(self, db: Session) -> MotorIngestaoEmendas:
         """
-        Salva emenda do Portal da Transparência no banco
+        Motor de ingestão para a API: autor pelo nome (matcher em memória com
+        todos os deputados) e documento original de cada emenda enviado ao GCS
         """
-        try:
-            # Verificar se já existe
-            existente = db.query(EmendaParlamentar).filter(
-                EmendaParlamentar.api_camara_id == str(emenda_data['codigoEmenda'])
-            ).first()
-            
-            if existente:
-                return existente
-            
-            # Extrair dados da emenda
-            codigo_emenda = emenda_data['codigoEmenda']
-            ano = emenda_data['ano']
-            tipo_emenda_api = emenda_data['tipoEmenda']
-            autor = emenda_data['autor']
-            nome_autor = emenda_data.get('nomeAutor', autor)
-            
-            # Mapear tipo
-            tipo_mapeado = self.mapear_tipo_emenda(tipo_emenda_api)
-            
-            # Extrair valores
-            valor_empenhado = self.limpar_valor_monetario(emenda_data.get('valorEmpenhado', '0'))
-            valor_liquidado = self.limpar_valor_monetario(emenda_data.get('valorLiquidado', '0'))
-            valor_pago = self.limpar_valor_monetario(emenda_data.get('valorPago', '0'))
-            
-            # Usar o maior valor disponível
-            valor_emenda = max(
-                valor_empenhado or 0,
-                valor_liquidado or 0,
-                valor_pago or 0
-            ) or 0
-            
-            # Buscar deputado
-            deputado_id = self.buscar_deputado_por_nome(nome_autor, db)
-            
-            # Extrair informações adicionais
-            funcao = emenda_data.get('funcao', '')
-            subfuncao = emenda_data.get('subfuncao', '')
-            localidade = emenda_data.get('localidadeDoGasto', '')
-            
-            # Extrair campos completos da API
-            campos_completos = self.extrair_campos_completos(emenda_data)
-            
-            # Criar emenda
-            emenda = EmendaParlamentar(
-                api_camara_id=str(codigo_emenda),
-                deputado_id=deputado_id,
-                tipo_emenda=tipo_mapeado,
-                numero=emenda_data.get('numeroEmenda', 0),
-                ano=ano,
-                emenda=f"Emenda {tipo_emenda_api} - {funcao} - {localidade}",
-                local=self.extrair_local_emenda(funcao, subfuncao, localidade),
-                natureza=self.extrair_natureza_emenda(tipo_emenda_api, autor),
-                tema=funcao,
-                valor_emenda=valor_emenda,
-                beneficiario_principal=localidade,
-                situacao='Ativa',  # Default pois API não fornece
-                data_apresentacao=datetime(ano, 1, 1),  # Default início do ano
-                autor=nome_autor,
-                partido_autor=None,  # Não disponível nesta API
-                uf_autor=localidade.split('(')[-1].replace(')', '') if '(' in localidade else None,
-                url_documento=None,  # Não disponível nesta API
-                
-                # Novos campos financeiros do Portal da Transparência
-                valor_resto_inscrito=campos_completos['valor_resto_inscrito'],
-                valor_resto_cancelado=campos_completos['valor_resto_cancelado'],
-                valor_resto_pago=campos_completos['valor_resto_pago'],
-                
-                # Campos de otimização com códigos da API
-                codigo_funcao_api=campos_completos['codigo_funcao_api'],
-                codigo_subfuncao_api=campos_completos['codigo_subfuncao_api'],
-                
-                # Campos de documentação
-                documentos_url=campos_completos['documentos_url'],
-                quantidade_documentos=campos_completos['quantidade_documentos']
-            )
-            
-            db.add(emenda)
-            db.flush()  # Para obter o ID
-            
-            # Salvar detalhes específicos
-            self._salvar_detalhes_emenda_transparencia(emenda, emenda_data, db)
-            
-            # Upload para GCS
-            gcs_url = self._upload_emenda_gcs(emenda, emenda_data, db)
-            if gcs_url:
-                emenda.gcs_url = gcs_url
-            
-            db.commit()
-            print(f"      ✅ Emenda salva: {tipo_mapeado} {emenda.numero}/{ano} - R$ {valor_emenda:,.2f}")
-            return emenda
-            
-        except Exception as e:
-            print(f"      ❌ Erro ao salvar emenda: {e}")
-            db.rollback()
-            return None
-
-    def _salvar_detalhes_emenda_transparencia(self, emenda: EmendaParlamentar, emenda_data: Dict, db: Session):
-        """Salva detalhes específicos da emenda do Portal da Transparência"""
-        try:
-            detalhe = DetalheEmenda(
-                emenda_id=emenda.id,
-                ementa=f"Emenda {emenda_data.get('tipoEmenda')} para {emenda_data.get('funcao', 'função não informada')}",
-                justificativa=f"Localidade do gasto: {emenda_data.get('localidadeDoGasto', 'N/A')}",
-                texto_completo=f"Função: {emenda_data.get('funcao', 'N/A')}\n"
-                               f"Subfunção: {emenda_data.get('subfuncao', 'N/A')}\n"
-                               f"Localidade: {emenda_data.get('localidadeDoGasto', 'N/A')}\n"
-                               f"Valor Empenhado: {emenda_data.get('valorEmpenhado', '0')}\n"
-                               f"Valor Liquidado: {emenda_data.get('valorLiquidado', '0')}\n"
-                               f"Valor Pago: {emenda_data.get('valorPago', '0')}",
-                pdf_url=None
-            )
-            db.add(detalhe)
-        except Exception as e:
-            print(f"      ⚠️ Erro ao salvar detalhes: {e}")
-
-    def _upload_emenda_gcs(self, emenda: EmendaParlamentar, emenda_data: Dict, db: Session) -> Optional[str]:
-        """
-        Faz upload dos dados completos da emenda para o GCS
-        """
-        try:
-            # Preparar dados completos da emenda
-            dados_completos = {
-                'emenda': {
-                    'id': emenda.id,
-                    'api_camara_id': emenda.api_camara_id,
-                    'tipo_emenda': emenda.tipo_emenda,
-                    'numero': emenda.numero,
-                    'ano': emenda.ano,
-                    'emenda': emenda.emenda,
-                    'local': emenda.local,
-                    'natureza': emenda.natureza,
-                    'tema': emenda.tema,
-                    'valor_emenda': float(emenda.valor_emenda) if emenda.valor_emenda else None,
-                    'beneficiario_principal': emenda.beneficiario_principal,
-                    'situacao': emenda.situacao,
-                    'data_apresentacao': emenda.data_apresentacao.isoformat() if emenda.data_apresentacao else None,
-                    'autor': emenda.autor,
-                    'partido_autor': emenda.partido_autor,
-                    'uf_autor': emenda.uf_autor,
-                    'url_documento': emenda.url_documento,
-                    'created_at': emenda.created_at.isoformat() if emenda.created_at else None
-                },
-                'dados_api_transparencia': emenda_data,
-                'metadados': {
-                    'data_coleta': datetime.now().isoformat(),
-                    'fonte': 'API Portal da Transparência',
-                    'versao': '1.0'
-                }
-            }
-            
-            # Obter GCS Manager
-            gcs = get_gcs_manager()
-            if not gcs.is_available():
-                print(f"      ⚠️ GCS não disponível, pulando upload")
-                return None
-            
-            # Fazer upload
-            gcs_url = gcs.upload_emenda(dados_completos, emenda.ano, str(emenda.api_camara_id))
-            
-            if gcs_url:
-                print(f"      📁 Upload GCS realizado: {emenda.tipo_emenda} {emenda.numero}/{emenda.ano}")
-                return gcs_url
-            else:
-                print(f"      ❌ Erro no upload GCS")
-                return None
-                
-        except Exception as e:
-            print(f"      ❌ Erro no upload GCS: {e}")
-            return None
+        matcher = MatcherAutores(db.query(Deputado.id, Deputado.nome).all())
+        return MotorIngestaoEmendas(
+            db, EmendaParlamentar, DetalheEmenda,
+            resolver_por_nome(matcher),
+            gcs_manager=self.gcs_manager if self.gcs_disponivel else None,
+            documento_gcs=lambda emenda, linha: self._dados_emenda_gcs(emenda, linha['registro_api'])
+        )
 
-    def coletar_emendas_periodo(self, ano: int, limite: int = 500, db: Session = None) -> Dict[str, int]:
+    def coletar_emendas_periodo(self, ano: int, limite: int = 500, db: Session = None, checkpoint: Optional[Any] = None) -> Dict[str, int]:
         """
         Coleta emendas orçamentárias do Portal da Transparência
         Respeitando configuração centralizada de filtro temporal
+        
+        Com checkpoint do pipeline, o índice da última emenda gravada é salvo
+        periodicamente e uma nova tentativa continua a partir dele; um erro
+        geral é propagado para que a etapa não seja marcada como concluída.
         """
         print(f"\n💰 COLETANDO EMENDAS ORÇAMENTÁRIAS - Portal da Transparência")
         print("=" * 70)
@@ -549,60 +310,36 @@ class ColetorEmendasTransparencia(ETLBase):
         else:
             fechar_db = False
         
-        resultados = {
-            'emendas_encontradas': 0,
-            'emendas_salvas': 0,
-            'emendas_com_autor': 0,
-            'emendas_com_gcs': 0,
-            'valor_total_empenhado': 0.0,
-            'valor_total_liquidado': 0.0,
-            'valor_total_pago': 0.0,
-            'erros': 0
-        }
+        resultados = MotorIngestaoEmendas.novos_resultados()
+        
+        indice_inicial = checkpoint.cursor.get('indice', 0) if checkpoint else 0
+        if indice_inicial:
+            resultados.update({k: v for k, v in checkpoint.contagens.items() if k in resultados})
+            print(f"♻️ Retomando após a emenda {indice_inicial}")
         
         try:
-            # Buscar emendas da API
-            emendas = self.buscar_emendas_ano(ano, limite)
-            resultados['emendas_encontradas'] = len(emendas)
+            # Registros da API em chunks, carregados em lote pelo motor comum
+            fonte = FonteTransparenciaAPI(self, ano, limite, inicio=indice_inicial)
             
-            if not emendas:
-                print(f"   ⚠️ Nenhuma emenda encontrada para {ano}")
-                return resultados
+            def salvar_checkpoint(contagens: Dict[str, Any]):
+                # Cada chunk é gravado com um commit: o cursor avança junto
+                checkpoint.salvar({'indice': fonte.consumidos}, **contagens)
             
             print(f"\n💾 SALVANDO EMENDAS NO BANCO DE DADOS")
             print("-" * 50)
             
-            for i, emenda_data in enumerate(emendas, 1):
-                print(f"   📄 Processando {i}/{len(emendas)}: {emenda_data.get('codigoEmenda', 'N/A')}")
-                
-                try:
-                    # Salvar emenda
-                    emenda = self.salvar_emenda_transparencia(emenda_data, db)
-                    if emenda:
-                        resultados['emendas_salvas'] += 1
-                        
-                        if emenda.deputado_id:
-                            resultados['emendas_com_autor'] += 1
-                        
-                        if emenda.gcs_url:
-                            resultados['emendas_com_gcs'] += 1
-                        
-                        # Acumular valores
-                        valor_empenhado = self.limpar_valor_monetario(emenda_data.get('valorEmpenhado', '0')) or 0
-                        valor_liquidado = self.limpar_valor_monetario(emenda_data.get('valorLiquidado', '0')) or 0
-                        valor_pago = self.limpar_valor_monetario(emenda_data.get('valorPago', '0')) or 0
-                        
-                        resultados['valor_total_empenhado'] += valor_empenhado
-                        resultados['valor_total_liquidado'] += valor_liquidado
-                        resultados['valor_total_pago'] += valor_pago
-                    
-                    # Rate limiting
-                    time.sleep(0.3)  # 300ms entre registros
-                    
-                except Exception as e:
-                    print(f"      ❌ Erro ao processar emenda: {e}")
-                    resultados['erros'] += 1
-                    continue
+            self._criar_motor(db).processar(
+                fonte, resultados, ao_concluir_chunk=salvar_checkpoint if checkpoint else None
+            )
+            # Total da API, inclusive os registros já carregados antes da retomada
+            resultados['emendas_encontradas'] = fonte.total
+            
+            if not fonte.total:
+                print(f"   ⚠️ Nenhuma emenda encontrada para {ano}")
+                return resultados
+            
+            print(f"   ✅ {resultados['emendas_salvas']} salvas, {resultados['emendas_existentes']} já existentes, "
+                  f"{resultados['emendas_com_autor']} com autor identificado")
             
             # Gerar ranking
             if resultados['emendas_salvas'] > 0:
@@ -611,6 +348,9 @@ class ColetorEmendasTransparencia(ETLBase):
         except Exception as e:
             print(f"❌ Erro geral na coleta: {e}")
             resultados['erros'] += 1
+            if checkpoint:
+                # Etapa do pipeline: falha visível mantém o checkpoint para a retomada
+                raise
         
         finally:
             if fechar_db:
@@ -621,41 +361,18 @@ class ColetorEmendasTransparencia(ETLBase):
     def gerar_ranking_emendas_transparencia(self, ano: int, db: Session):
         """
         Gera ranking de emendas por deputado (dados do Portal da Transparência)
+        
+        Substitui o ranking do ano em uma transação (regenerar_ranking_emendas).
         """
         try:
             print(f"\n🏆 GERANDO RANKING DE EMENDAS - {ano}")
             print("=" * 40)
             
-            # Consulta para ranking
-            ranking_query = db.query(
-                EmendaParlamentar.deputado_id,
-                func.count(EmendaParlamentar.id).label('quantidade'),
-                func.sum(EmendaParlamentar.valor_emenda).label('valor_total'),
-                func.avg(EmendaParlamentar.valor_emenda).label('valor_medio')
-            ).filter(
-                EmendaParlamentar.ano == ano,
-                EmendaParlamentar.deputado_id.isnot(None),
-                EmendaParlamentar.valor_emenda > 0
-            ).group_by(EmendaParlamentar.deputado_id).all()
-            
-            # Salvar ranking
-            for i, (deputado_id, quantidade, valor_total, valor_medio) in enumerate(ranking_query, 1):
-                ranking = RankingEmendas(
-                    deputado_id=deputado_id,
-                    ano_referencia=ano,
-                    quantidade_emendas=quantidade,
-                    valor_total_emendas=valor_total or 0,
-                    valor_medio_emenda=valor_medio or 0,
-                    ranking_quantidade=i
-                )
-                db.add(ranking)
-            
-            db.commit()
-            print(f"✅ Ranking gerado com {len(ranking_query)} deputados")
+            linhas = regenerar_ranking_emendas(db, ano)
+            print(f"✅ Ranking gerado com {linhas} linhas (anual + mensal)")
             
         except Exception as e:
             print(f"❌ Erro ao gerar ranking: {e}")
-            db.rollback()
 
 def main():
     """
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Carga em massa dos gastos da CEAP a partir dos arquivos anuais da Câmara
+
+O arquivo anual (Ano-AAAA.csv.zip) traz todas as despesas da Cota para o
+Exercício da Atividade Parlamentar do ano. O CSV é lido em streaming de dentro
+do ZIP, deduplicado pela chave do documento e copiado em lotes (COPY) para uma
+tabela temporária; ao final, um único INSERT ... SELECT ... ON CONFLICT leva as
+linhas para gastos_parlamentares na mesma transação.
+
+Autor: Kritikos Team
+"""
+
+import csv
+import hashlib
+import io
+import os
+import sys
+import time
+import zipfile
+from email.utils import formatdate
+from pathlib import Path
+from typing import Optional, Dict, Iterator, Iterable, List, Tuple
+
+import requests
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+try:
+    from .etl_utils import ETLBase
+    from .config import get_config
+except ImportError:
+    # Fallback para execução direta
+    from etl.etl_utils import ETLBase
+    from etl.config import get_config
+
+
+URL_ARQUIVO_CEAP = "https://www.camara.leg.br/cotas/Ano-{ano}.csv.zip"
+
+# Colunas da tabela temporária, na ordem do COPY
+COLUNAS_STAGING = (
+    'chave_documento', 'deputado_api_id', 'ano', 'mes', 'tipo_despesa', 'descricao',
+    'fornecedor_nome', 'fornecedor_cnpj', 'valor_documento', 'valor_glosa', 'valor_liquido',
+    'data_documento', 'numero_documento', 'numero_ressarcimento', 'parcela'
+)
+
+
+def chave_documento_ceap(
+    codigo_documento,
+    deputado_api_id=None,
+    ano=None,
+    mes=None,
+    numero_documento=None,
+    fornecedor_cnpj=None,
+    valor_documento=None,
+    parcela=None
+) -> Optional[str]:
+    """
+    Chave de deduplicação de uma despesa da CEAP
+
+    Usa o identificador oficial do documento (ideDocumento no arquivo anual,
+    codDocumento na API). Sem ele, deriva um hash dos campos que identificam
+    a despesa; sem deputado também não há chave.
+
+    Returns:
+        str: Chave do documento ou None
+    """
+    codigo = str(codigo_documento or '').strip()
+    if codigo and codigo != '0':
+        return codigo
+    if not deputado_api_id:
+        return None
+    partes = '|'.join(
+        str(parte or '').strip()
+        for parte in (deputado_api_id, ano, mes, numero_documento, fornecedor_cnpj, valor_documento, parcela)
+    )
+    return 'h' + hashlib.md5(partes.encode()).hexdigest()
+
+
+def _numero(valor: Optional[str]) -> Optional[str]:
+    """Normaliza número do CSV ('1.234,56' ou '1234.56') para o formato aceito pelo COPY."""
+    valor = (valor or '').strip()
+    if not valor:
+        return None
+    if ',' in valor:
+        valor = valor.replace('.', '').replace(',', '.')
+    float(valor)  # Valida (ValueError para valores corrompidos)
+    return valor
+
+
+def _inteiro(valor: Optional[str]) -> Optional[int]:
+    """Converte inteiro do CSV (vazio -> None)."""
+    valor = (valor or '').strip()
+    return int(valor) if valor else None
+
+
+class CarregadorGastosCEAP(ETLBase):
+    """
+    Carregador dos arquivos anuais da CEAP para gastos_parlamentares
+
+    Um ano inteiro é carregado em uma passada: download único (reaproveitado
+    se não mudou), leitura em streaming, COPY em lotes e um INSERT final.
+    """
+
+    def __init__(self):
+        """Inicializa o carregador usando ETLBase"""
+        super().__init__()
+        self.tamanho_lote = get_config('performance', 'tamanho_lote_upsert') or 1000
+        base_cache = Path(self.cache.cache_dir) if self.cache else Path("cache") / self.__class__.__name__.lower()
+        self.diretorio_arquivos = base_cache / "arquivos"
+
+    def baixar_arquivo_ano(self, ano: int) -> Optional[Path]:
+        """
+        Baixa o ZIP anual da CEAP para o cache em disco (streaming)
+
+        Com cópia local, faz GET condicional (If-Modified-Since) e reaproveita o
+        arquivo se o servidor responder 304.
+
+        Args:
+            ano: Ano do arquivo
+
+        Returns:
+            Path: Caminho do ZIP local ou None em caso de erro
+        """
+        self.diretorio_arquivos.mkdir(parents=True, exist_ok=True)
+        url = URL_ARQUIVO_CEAP.format(ano=ano)
+        caminho = self.diretorio_arquivos / f"Ano-{ano}.csv.zip"
+
+        headers = {'Accept': '*/*'}
+        if caminho.exists():
+            headers['If-Modified-Since'] = formatdate(caminho.stat().st_mtime, usegmt=True)
+
+        try:
+            with self.session.get(url, headers=headers, stream=True, timeout=120) as response:
+                if response.status_code == 304:
+                    print(f"   ♻️ Ano-{ano}.csv.zip não mudou desde o último download")
+                    return caminho
+
+                response.raise_for_status()
+                print(f"   📥 Baixando {url}...")
+                caminho_tmp = caminho.with_suffix('.tmp')
+                with open(caminho_tmp, 'wb') as f:
+                    for bloco in response.iter_content(chunk_size=1024 * 1024):
+                        f.write(bloco)
+                os.replace(caminho_tmp, caminho)
+
+            print(f"   ✅ Ano-{ano}.csv.zip salvo ({caminho.stat().st_size / 1024 / 1024:.1f} MB)")
+            return caminho
+
+        except requests.exceptions.RequestException as e:
+            if caminho.exists():
+                print(f"   ⚠️ Falha ao atualizar arquivo da CEAP {ano} ({e}) - usando cópia local")
+                return caminho
+            print(f"❌ Erro ao baixar arquivo da CEAP {ano}: {e}")
+            return None
+
+    def iterar_despesas(self, caminho_zip: Path) -> Iterator[Dict[str, str]]:
+        """
+        Itera as linhas do CSV de dentro do ZIP, sem extrair para o disco
+
+        Args:
+            caminho_zip: ZIP anual da CEAP
+
+        Yields:
+            Dict: Linha do CSV (cabeçalho oficial: ideCadastro, numMes, vlrLiquido...)
+        """
+        with zipfile.ZipFile(caminho_zip) as arquivo_zip:
+            nome_csv = next(nome for nome in arquivo_zip.namelist() if nome.lower().endswith('.csv'))
+            with arquivo_zip.open(nome_csv) as bruto:
+                texto = io.TextIOWrapper(bruto, encoding='utf-8-sig', newline='')
+                yield from csv.DictReader(texto, delimiter=';')
+
+    def _linha_staging(self, registro: Dict[str, str]) -> Tuple:
+        """
+        Converte uma linha do CSV para a tupla da tabela temporária
+
+        Raises:
+            ValueError: Se algum campo numérico estiver corrompido
+        """
+        deputado_api_id = _inteiro(registro.get('ideCadastro'))
+        ano = _inteiro(registro.get('numAno'))
+        mes = _inteiro(registro.get('numMes'))
+        numero_documento = (registro.get('txtNumero') or '').strip() or None
+        fornecedor_cnpj = (registro.get('txtCNPJCPF') or '').strip() or None
+        valor_documento = _numero(registro.get('vlrDocumento'))
+        parcela = _inteiro(registro.get('numParcela'))
+        data_emissao = (registro.get('datEmissao') or '').strip()[:10] or None
+
+        return (
+            chave_documento_ceap(
+                registro.get('ideDocumento'), deputado_api_id, ano, mes,
+                numero_documento, fornecedor_cnpj, valor_documento, parcela
+            ),
+            deputado_api_id,
+            ano,
+            mes,
+            (registro.get('txtDescricao') or '').strip() or 'Não informado',
+            (registro.get('txtDescricaoEspecificacao') or '').strip() or None,
+            (registro.get('txtFornecedor') or '').strip() or None,
+            fornecedor_cnpj,
+            valor_documento,
+            _numero(registro.get('vlrGlosa')),
+            _numero(registro.get('vlrLiquido')),
+            data_emissao,
+            numero_documento,
+            (registro.get('numRessarcimento') or '').strip() or None,
+            parcela,
+        )
+
+    def _copiar_lote(self, cursor, lote: List[Tuple]):
+        """Envia um lote para a tabela temporária via COPY (formato CSV; vazio = NULL)."""
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        escritor.writerows(lote)
+        buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY tmp_gastos_ceap ({', '.join(COLUNAS_STAGING)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+    def carregar_ano(self, db: Session, ano: int, meses: Optional[Iterable[int]] = None) -> Dict[str, int]:
+        """
+        Carrega as despesas de um ano inteiro em gastos_parlamentares
+
+        Despesas de deputados fora da tabela deputados e documentos já
+        carregados (mesma chave_documento) são ignorados. Gastos sem
+        chave_documento (gravados pela API antes da coluna existir) dos
+        deputados/meses presentes no arquivo são substituídos pelas linhas do
+        arquivo, para não ficarem duplicados.
+
+        Args:
+            db: Sessão do banco
+            ano: Ano do arquivo da CEAP
+            meses: Restringe a carga a estes meses (padrão: todos)
+
+        Returns:
+            Dict: Estatísticas da carga (lidas, duplicadas, copiadas, inseridas...)
+        """
+        print(f"\n💰 Carregando gastos da CEAP {ano} (arquivo anual)...")
+        estatisticas = {
+            'lidas': 0,
+            'sem_deputado': 0,
+            'invalidas': 0,
+            'fora_periodo': 0,
+            'duplicadas_arquivo': 0,
+            'copiadas': 0,
+            'substituidas': 0,
+            'inseridas': 0
+        }
+
+        caminho = self.baixar_arquivo_ano(ano)
+        if not caminho:
+            return estatisticas
+
+        meses_aceitos = set(meses) if meses else None
+        inicio = time.time()
+        cursor = db.connection().connection.cursor()
+
+        try:
+            cursor.execute("""
+                CREATE TEMP TABLE tmp_gastos_ceap (
+                    chave_documento TEXT,
+                    deputado_api_id INTEGER,
+                    ano INTEGER,
+                    mes INTEGER,
+                    tipo_despesa TEXT,
+                    descricao TEXT,
+                    fornecedor_nome TEXT,
+                    fornecedor_cnpj TEXT,
+                    valor_documento NUMERIC,
+                    valor_glosa NUMERIC,
+                    valor_liquido NUMERIC,
+                    data_documento DATE,
+                    numero_documento TEXT,
+                    numero_ressarcimento TEXT,
+                    parcela INTEGER
+                ) ON COMMIT DROP
+            """)
+
+            chaves_vistas = set()
+            lote: List[Tuple] = []
+
+            for registro in self.iterar_despesas(caminho):
+                estatisticas['lidas'] += 1
+
+                # Linhas sem deputado (ex.: lideranças partidárias) não entram no ranking
+                if not (registro.get('ideCadastro') or '').strip():
+                    estatisticas['sem_deputado'] += 1
+                    continue
+
+                try:
+                    linha = self._linha_staging(registro)
+                except ValueError:
+                    estatisticas['invalidas'] += 1
+                    continue
+
+                if meses_aceitos and linha[3] not in meses_aceitos:
+                    estatisticas['fora_periodo'] += 1
+                    continue
+
+                if linha[0] in chaves_vistas:
+                    estatisticas['duplicadas_arquivo'] += 1
+                    continue
+                chaves_vistas.add(linha[0])
+
+                lote.append(linha)
+                if len(lote) >= self.tamanho_lote:
+                    self._copiar_lote(cursor, lote)
+                    estatisticas['copiadas'] += len(lote)
+                    lote.clear()
+
+            if lote:
+                self._copiar_lote(cursor, lote)
+                estatisticas['copiadas'] += len(lote)
+
+            # Linhas antigas sem chave não conflitam no ON CONFLICT: o arquivo as substitui
+            resultado = db.execute(text("""
+                DELETE FROM gastos_parlamentares g
+                USING (
+                    SELECT DISTINCT d.id AS deputado_id, t.ano, t.mes
+                    FROM tmp_gastos_ceap t
+                    JOIN deputados d ON d.api_camara_id = t.deputado_api_id
+                ) p
+                WHERE g.chave_documento IS NULL
+                  AND g.deputado_id = p.deputado_id AND g.ano = p.ano AND g.mes = p.mes
+            """))
+            estatisticas['substituidas'] = resultado.rowcount
+
+            resultado = db.execute(text("""
+                INSERT INTO gastos_parlamentares (
+                    deputado_id, ano, mes, tipo_despesa, descricao, fornecedor_nome, fornecedor_cnpj,
+                    valor_documento, valor_glosa, valor_liquido, data_documento, numero_documento,
+                    numero_ressarcimento, parcela, chave_documento
+                )
+                SELECT
+                    d.id, t.ano, t.mes, LEFT(t.tipo_despesa, 255), t.descricao, LEFT(t.fornecedor_nome, 255),
+                    LEFT(t.fornecedor_cnpj, 18), t.valor_documento, COALESCE(t.valor_glosa, 0), t.valor_liquido,
+                    t.data_documento, LEFT(t.numero_documento, 255), LEFT(t.numero_ressarcimento, 255),
+                    t.parcela, t.chave_documento
+                FROM tmp_gastos_ceap t
+                JOIN deputados d ON d.api_camara_id = t.deputado_api_id
+                ON CONFLICT (chave_documento) DO NOTHING
+            """))
+            estatisticas['inseridas'] = resultado.rowcount
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Erro na carga da CEAP {ano}: {e}")
+            raise
+        finally:
+            cursor.close()
+
+        print(
+            f"✅ CEAP {ano}: {estatisticas['lidas']} linhas lidas, {estatisticas['copiadas']} copiadas, "
+            f"{estatisticas['inseridas']} inseridas ({estatisticas['duplicadas_arquivo']} duplicadas no arquivo, "
+            f"{estatisticas['substituidas']} sem chave substituídas) "
+            f"em {time.time() - inicio:.1f}s"
+        )
+        return estatisticas
+
+
+if __name__ == "__main__":
+    # Uso: python coleta_gastos_ceap.py 2025 [2024 ...]
+    from models.db_utils import get_db_session
+
+    anos = [int(ano) for ano in sys.argv[1:]] or [get_config('hackathon', 'ano_limite')]
+    db_session = get_db_session()
+    try:
+        carregador = CarregadorGastosCEAP()
+        for ano_carga in anos:
+            carregador.carregar_ano(db_session, ano_carga)
+    finally:
+        db_session.close()
@@ -10,8 +10,10 @@ import requests
 import json
 import os
 from datetime import datetime, date
-from typing import List, Dict, Any, Optional, Tuple
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Iterable
 from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from models.db_utils import get_db_session
 from models.proposicao_models import Proposicao, Autoria
 from models.politico_models import Deputado
@@ -19,9 +21,25 @@ from utils.common_utils import setup_logging
 from utils.cache_utils import CacheManager
 from utils.gcs_utils import get_gcs_manager
 from utils.texto_utils import TextoProposicaoUtils
+from etl.config import get_config
+from etl.fila_textos_module import enfileirar_textos_proposicoes
+from etl.http_client import get_token_bucket, buscar_json_concorrente, HTTPX_AVAILABLE
+from etl.watermarks import obter_watermark, salvar_watermark
+from etl.staging_parquet import AreaStaging, checksum_arquivo
+from etl.indice_deduplicacao import indice_por_tabela
+
+# Parser JSON incremental (opcional): sem ele o arquivo é carregado inteiro com json.load
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+URL_ARQUIVO_PROPOSICOES = "https://dadosabertos.camara.leg.br/arquivos/proposicoes/json/proposicoes-{ano}.json"
+URL_ARQUIVO_AUTORES = "https://dadosabertos.camara.leg.br/arquivos/proposicoesAutores/json/proposicoesAutores-{ano}.json"
+
 
 class ColetorProposicoes:
     """
@@ -60,6 +78,19 @@ class ColetorProposicoes:
         
         self.session = get_db_session()
         
+        # Arquivos anuais já baixados/validados nesta execução (url -> caminho local)
+        self._arquivos_baixados: Dict[str, Path] = {}
+        
+        # Staging Parquet dos arquivos anuais: (caminho, mtime) -> checksum já calculado
+        self.staging = AreaStaging()
+        self._checksums: Dict[Tuple[str, float], str] = {}
+        
+        # api_camara_id já gravados (tabela inteira: o mesmo ID pode ter outro ano/tipo
+        # no banco), carregados na primeira verificação
+        self._indice_proposicoes = indice_por_tabela(
+            self.session, 'proposicoes', ['api_camara_id'], normalizar=str
+        )
+        
         # Inicializar GCS Manager
         self.gcs_manager = get_gcs_manager()
         self.gcs_disponivel = self.gcs_manager is not None and self.gcs_manager.is_available()
@@ -72,57 +103,235 @@ class ColetorProposicoes:
         else:
             logger.warning("⚠️ GCS não disponível - usando apenas banco de dados local")
         
-    def baixar_json_proposicoes(self, tipo: str, ano: int) -> Optional[List[Dict]]:
+    def baixar_arquivo_anual(self, url: str) -> Optional[Path]:
         """
-        Baixa arquivo JSON de proposições por tipo e ano usando ARQUIVO OFICIAL COMPLETO.
+        Baixa um arquivo anual de dados abertos para o cache em disco.
+        
+        Usa GET condicional (If-None-Match / If-Modified-Since) com o ETag e o
+        Last-Modified da última resposta: se o arquivo não mudou (304), reaproveita
+        a cópia local. O corpo é gravado em streaming, sem passar pela memória.
         
         Args:
-            tipo: Tipo da proposição (PEC, PL, etc.)
-            ano: Ano das proposições
+            url: URL do arquivo oficial
             
         Returns:
-            Lista de proposições ou None em caso de erro
+            Caminho do arquivo local ou None em caso de erro
         """
+        diretorio = Path(self.cache.cache_dir) / "arquivos"
+        diretorio.mkdir(parents=True, exist_ok=True)
+        
+        nome_arquivo = url.rsplit('/', 1)[-1]
+        caminho = diretorio / nome_arquivo
+        caminho_meta = diretorio / f"{nome_arquivo}.meta.json"
+        
+        # Já baixado nesta execução
+        if url in self._arquivos_baixados:
+            return self._arquivos_baixados[url]
+        
+        headers = {}
+        if caminho.exists() and caminho_meta.exists():
+            try:
+                with open(caminho_meta, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if meta.get('etag'):
+                    headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    headers['If-Modified-Since'] = meta['last_modified']
+            except (OSError, ValueError):
+                headers = {}
+        
         try:
-            # Usar ARQUIVO OFICIAL COMPLETO da Câmara (não API limitada)
-            url = f"https://dadosabertos.camara.leg.br/arquivos/proposicoes/json/proposicoes-{ano}.json"
+            get_token_bucket().adquirir()
+            with requests.get(url, headers=headers, timeout=60, stream=True) as response:
+                if response.status_code == 304:
+                    logger.info(f"♻️ {nome_arquivo} não mudou desde o último download (cache local)")
+                    self._arquivos_baixados[url] = caminho
+                    return caminho
+                
+                response.raise_for_status()
+                
+                logger.info(f"📥 Baixando {nome_arquivo}...")
+                caminho_tmp = caminho.with_suffix(caminho.suffix + '.tmp')
+                with open(caminho_tmp, 'wb') as f:
+                    for bloco in response.iter_content(chunk_size=1024 * 1024):
+                        f.write(bloco)
+                os.replace(caminho_tmp, caminho)
+                
+                with open(caminho_meta, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'url': url,
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                        'baixado_em': datetime.now().isoformat()
+                    }, f)
+            
+            logger.info(f"✅ {nome_arquivo} salvo em cache ({caminho.stat().st_size / 1024 / 1024:.1f} MB)")
+            self._arquivos_baixados[url] = caminho
+            return caminho
             
-            logger.info(f"📥 Baixando JSON COMPLETO de proposições de {ano}...")
+        except Exception as e:
+            if caminho.exists():
+                logger.warning(f"⚠️ Falha ao atualizar {nome_arquivo} ({e}) - usando cópia local")
+                self._arquivos_baixados[url] = caminho
+                return caminho
+            logger.error(f"❌ Erro ao baixar {nome_arquivo}: {e}")
+            return None
+    
+    def metadados_arquivo_anual(self, url: str) -> Dict[str, Any]:
+        """
+        Lê ETag/Last-Modified gravados no último download do arquivo anual.
+        
+        Args:
+            url: URL do arquivo oficial
             
-            response = requests.get(url, timeout=60)  # Timeout maior para arquivo grande
-            response.raise_for_status()
+        Returns:
+            Dicionário do .meta.json (vazio se não houver)
+        """
+        nome_arquivo = url.rsplit('/', 1)[-1]
+        caminho_meta = Path(self.cache.cache_dir) / "arquivos" / f"{nome_arquivo}.meta.json"
+        try:
+            with open(caminho_meta, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _iterar_registros_arquivo(self, caminho: Path) -> Iterator[Dict]:
+        """
+        Itera os registros da chave 'dados' de um arquivo de dados abertos.
+        
+        Com ijson o parse é incremental (memória constante); sem ele, cai para
+        json.load do arquivo inteiro.
+        
+        Args:
+            caminho: Arquivo JSON local
             
-            dados = response.json()
-            proposicoes = dados.get('dados', [])
+        Yields:
+            Cada registro de 'dados'
+        """
+        with open(caminho, 'rb') as f:
+            if IJSON_AVAILABLE:
+                # use_float evita Decimal nos campos numéricos
+                yield from ijson.items(f, 'dados.item', use_float=True)
+            else:
+                logger.warning(f"⚠️ ijson indisponível - {caminho.name} será carregado inteiro em memória")
+                yield from json.load(f).get('dados', [])
+    
+    def _iterar_registros_staging(self, caminho: Path, fonte: str, ano: int, tipos: Iterable[str]) -> Iterator[Dict]:
+        """
+        Registros do arquivo anual, via staging Parquet quando a versão já foi convertida.
+        
+        Na primeira leitura de uma versão (checksum) o arquivo JSON é percorrido
+        inteiro e convertido para o staging (todas as partições ano/tipo); nas
+        seguintes só as partições pedidas são lidas, sem parse do JSON.
+        
+        Args:
+            caminho: Arquivo JSON local
+            fonte: Nome da fonte no staging (um por arquivo anual)
+            ano: Partição de ano a ler do staging
+            tipos: Partições de tipo a ler do staging
+            
+        Yields:
+            Registros originais de 'dados'
+        """
+        chave = (str(caminho), caminho.stat().st_mtime)
+        if chave not in self._checksums:
+            self._checksums[chave] = checksum_arquivo(caminho)
+        checksum = self._checksums[chave]
+        
+        if self.staging.disponivel(fonte, checksum):
+            logger.info(f"♻️ {caminho.name} lido do staging Parquet ({', '.join(sorted(tipos))})")
+            yield from self.staging.ler_registros(fonte, checksum, ano=ano, tipos=tipos)
+            return
+        
+        gravador = self.staging.gravador(fonte, checksum, ('ano', 'siglaTipo'))
+        if not gravador:
+            yield from self._iterar_registros_arquivo(caminho)
+            return
+        
+        concluido = False
+        lote: List[Dict] = []
+        try:
+            for registro in self._iterar_registros_arquivo(caminho):
+                lote.append(registro)
+                if len(lote) >= self.staging.linhas_por_arquivo:
+                    gravador.adicionar_registros(lote)
+                    lote = []
+                yield registro
+            gravador.adicionar_registros(lote)
+            gravador.concluir(caminho.name)
+            concluido = True
+        finally:
+            # Consumidor parou antes do fim ou erro: não publica staging parcial
+            if not concluido:
+                gravador.descartar()
+    
+    def iterar_proposicoes_ano(self, ano: int, tipos: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Percorre o arquivo anual de proposições uma única vez, roteando por tipo.
+        
+        Args:
+            ano: Ano das proposições
+            tipos: Tipos aceitos (padrão: tipos_relevantes)
             
-            # Filtrar por tipo e ano
-            props_filtradas = [
-                p for p in proposicoes 
-                if p.get('siglaTipo') == tipo and p.get('ano') == ano
-            ]
+        Yields:
+            Tuplas (siglaTipo, proposição) apenas dos tipos aceitos
+        """
+        tipos_aceitos = set(tipos or self.tipos_relevantes)
+        caminho = self.baixar_arquivo_anual(URL_ARQUIVO_PROPOSICOES.format(ano=ano))
+        if not caminho:
+            return
+        
+        total = 0
+        por_tipo: Dict[str, int] = {}
+        for proposicao in self._iterar_registros_staging(caminho, f"proposicoes_{ano}", ano, tipos_aceitos):
+            total += 1
+            tipo = proposicao.get('siglaTipo')
+            if tipo in tipos_aceitos and proposicao.get('ano') == ano:
+                por_tipo[tipo] = por_tipo.get(tipo, 0) + 1
+                yield tipo, proposicao
+        
+        resumo = ", ".join(f"{t}: {q}" for t, q in sorted(por_tipo.items()))
+        logger.info(f"✅ Arquivo {ano} processado: {sum(por_tipo.values())} de {total} proposições ({resumo})")
+    
+    def baixar_json_proposicoes(self, tipo: str, ano: int) -> Optional[List[Dict]]:
+        """
+        Baixa arquivo JSON de proposições por tipo e ano usando ARQUIVO OFICIAL COMPLETO.
+        
+        O arquivo é baixado uma vez e reaproveitado do cache em disco nas
+        chamadas seguintes (um tipo por chamada).
+        
+        Args:
+            tipo: Tipo da proposição (PEC, PL, etc.)
+            ano: Ano das proposições
             
-            logger.info(f"✅ Download {tipo}: {len(props_filtradas)} proposições (de {len(proposicoes)} totais)")
+        Returns:
+            Lista de proposições ou None em caso de erro
+        """
+        try:
+            props_filtradas = [dados for _, dados in self.iterar_proposicoes_ano(ano, [tipo])]
+            logger.info(f"✅ Download {tipo}: {len(props_filtradas)} proposições")
             return props_filtradas
             
         except Exception as e:
             logger.error(f"❌ Erro ao baixar JSON de {tipo}s: {e}")
             return None
     
-    def buscar_proposicoes_deputado_api(self, deputado_id: int) -> Optional[List[Dict]]:
+    def buscar_proposicoes_deputado_api(self, deputado_id: int, data_inicio: Optional[date] = None) -> Optional[List[Dict]]:
         """
         Busca proposições de um deputado específico via API.
         
         Args:
             deputado_id: ID do deputado na API da Câmara
+            data_inicio: Só proposições apresentadas a partir desta data (modo delta)
             
         Returns:
             Lista de proposições ou None em caso de erro
         """
         try:
-            url = f"{self.base_url}/deputados/{deputado_id}/proposicoes"
+            url, params = self._requisicao_proposicoes_deputado(deputado_id, data_inicio)
             
             # Cache para evitar requisições repetidas
-            cache_key = f"deputado_{deputado_id}_proposicoes"
+            cache_key = self._chave_cache_deputado(deputado_id, data_inicio)
             cached_data = self.cache.get(cache_key)
             if cached_data:
                 logger.info(f"📦 Cache hit: proposições do deputado {deputado_id}")
@@ -130,28 +339,87 @@ class ColetorProposicoes:
             
             logger.info(f"🔍 Buscando proposições do deputado {deputado_id}...")
             
-            response = requests.get(url, timeout=30)
+            get_token_bucket().adquirir()
+            response = requests.get(url, params=params, timeout=30)
             response.raise_for_status()
             
-            dados = response.json()
-            proposicoes = dados.get('dados', [])
-            
-            # Filtrar apenas tipos relevantes
-            props_filtradas = [
-                p for p in proposicoes 
-                if p.get('siglaTipo') in self.tipos_relevantes
-            ]
-            
-            # Salvar no cache por 1 hora
-            self.cache.set(cache_key, props_filtradas, ttl=3600)
-            
-            logger.info(f"✅ API deputado {deputado_id}: {len(props_filtradas)} proposições relevantes")
-            return props_filtradas
+            return self._guardar_proposicoes_deputado(deputado_id, cache_key, response.json())
             
         except Exception as e:
             logger.error(f"❌ Erro ao buscar proposições do deputado {deputado_id}: {e}")
             return None
     
+    def buscar_proposicoes_deputados_api(
+        self,
+        deputados: List[Tuple[int, Optional[date]]]
+    ) -> Dict[int, Optional[List[Dict]]]:
+        """
+        Busca as proposições de vários deputados em paralelo.
+        
+        As requisições que não estão em cache saem juntas pelo cliente
+        assíncrono compartilhado (ClienteHTTPCamara): concorrência máxima e
+        taxa do token bucket global de API_CONFIG, com retry e jitter. Sem
+        httpx, cai para as buscas sequenciais de buscar_proposicoes_deputado_api.
+        
+        Args:
+            deputados: Pares (ID do deputado na API, dataInicio ou None)
+            
+        Returns:
+            Dicionário ID do deputado -> proposições relevantes (None em caso de erro)
+        """
+        if not HTTPX_AVAILABLE:
+            return {
+                deputado_id: self.buscar_proposicoes_deputado_api(deputado_id, data_inicio)
+                for deputado_id, data_inicio in deputados
+            }
+        
+        resultados: Dict[int, Optional[List[Dict]]] = {}
+        pendentes = []
+        for deputado_id, data_inicio in deputados:
+            cache_key = self._chave_cache_deputado(deputado_id, data_inicio)
+            cached_data = self.cache.get(cache_key)
+            if cached_data:
+                resultados[deputado_id] = cached_data
+            else:
+                pendentes.append((deputado_id, data_inicio, cache_key))
+        
+        if pendentes:
+            logger.info(f"🔍 Buscando proposições de {len(pendentes)} deputados em paralelo...")
+            respostas = buscar_json_concorrente([
+                self._requisicao_proposicoes_deputado(deputado_id, data_inicio)
+                for deputado_id, data_inicio, _ in pendentes
+            ])
+            for (deputado_id, _, cache_key), resposta in zip(pendentes, respostas):
+                if resposta is None:
+                    logger.error(f"❌ Erro ao buscar proposições do deputado {deputado_id}")
+                    resultados[deputado_id] = None
+                else:
+                    resultados[deputado_id] = self._guardar_proposicoes_deputado(deputado_id, cache_key, resposta)
+        
+        return resultados
+    
+    def _requisicao_proposicoes_deputado(self, deputado_id: int, data_inicio: Optional[date]) -> Tuple[str, Optional[Dict]]:
+        """URL e parâmetros da listagem de proposições de um deputado."""
+        params = {'dataInicio': data_inicio.isoformat()} if data_inicio else None
+        return f"{self.base_url}/deputados/{deputado_id}/proposicoes", params
+    
+    def _chave_cache_deputado(self, deputado_id: int, data_inicio: Optional[date]) -> str:
+        cache_key = f"deputado_{deputado_id}_proposicoes"
+        if data_inicio:
+            cache_key += f"_desde_{data_inicio.isoformat()}"
+        return cache_key
+    
+    def _guardar_proposicoes_deputado(self, deputado_id: int, cache_key: str, dados: Dict) -> List[Dict]:
+        """Filtra os tipos relevantes da resposta da API e guarda no cache por 1 hora."""
+        props_filtradas = [
+            p for p in dados.get('dados', [])
+            if p.get('siglaTipo') in self.tipos_relevantes
+        ]
+        self.cache.set(cache_key, props_filtradas, ttl=3600)
+        
+        logger.info(f"✅ API deputado {deputado_id}: {len(props_filtradas)} proposições relevantes")
+        return props_filtradas
+    
     def calcular_pontos_proposicao(self, proposicao: Dict) -> float:
         """
         Calcula pontos de uma proposição baseado no tipo e status.
@@ -182,26 +450,30 @@ class ColetorProposicoes:
     
     def salvar_proposicao(self, dados_proposicao: Dict, salvar_gcs: bool = True, autores_dict: Optional[Dict] = None) -> Optional[int]:
         """
-        Salva uma proposição no banco de dados e opcionalmente no GCS.
+        Salva uma proposição no banco de dados e opcionalmente enfileira o texto para o GCS.
+        
+        O download do inteiro teor não acontece aqui: o job entra em
+        fila_textos_proposicoes e é processado por ProcessadorFilaTextos.
         
         Args:
             dados_proposicao: Dicionário com dados da proposição
-            salvar_gcs: Se deve salvar no GCS (padrão: True)
+            salvar_gcs: Se deve enfileirar o texto completo para o GCS (padrão: True)
             autores_dict: Dicionário de autores pré-carregado (otimização)
             
         Returns:
             ID da proposição salva ou None em caso de erro
         """
         try:
-            # Verificar se já existe
+            # Verificar se já existe (consulta só quando o índice acusa o ID)
             api_id = dados_proposicao.get('id')
-            existente = self.session.execute(
-                text("SELECT id FROM proposicoes WHERE api_camara_id = :api_id"),
-                {'api_id': api_id}
-            ).scalar()
-            
-            if existente:
-                return existente
+            if self._indice_proposicoes.contem(api_id):
+                existente = self.session.execute(
+                    text("SELECT id FROM proposicoes WHERE api_camara_id = :api_id"),
+                    {'api_id': api_id}
+                ).scalar()
+                
+                if existente:
+                    return existente
             
             # Usar autores do dicionário pré-carregado (OTIMIZAÇÃO)
             autores = []
@@ -211,27 +483,6 @@ class ColetorProposicoes:
                 # Fallback: buscar via API (apenas se necessário)
                 autores = self._buscar_autores_proposicao(api_id)
             
-            # Baixar texto completo usando o novo utilitário
-            texto_completo = None
-            uri_proposicao = dados_proposicao.get('uri', '')
-            if uri_proposicao:
-                logger.info(f"🔍 Buscando texto completo para {api_id}...")
-                texto_completo = self.texto_utils.obter_texto_completo(uri_proposicao, str(api_id))
-                if texto_completo:
-                    logger.info(f"✅ Texto obtido: {len(texto_completo)} caracteres")
-                else:
-                    logger.warning(f"⚠️ Não foi possível obter texto completo para {api_id}")
-            
-            # Salvar no GCS se disponível
-            gcs_url = None
-            if salvar_gcs and texto_completo:
-                logger.info(f"💾 Salvando texto no GCS para {api_id}...")
-                gcs_url = self._salvar_texto_completo_gcs(dados_proposicao, texto_completo)
-                if gcs_url:
-                    logger.info(f"✅ Texto salvo no GCS: {gcs_url}")
-                else:
-                    logger.warning(f"⚠️ Falha ao salvar texto no GCS para {api_id}")
-            
             # Mapear campos com tratamento de encoding
             proposicao = Proposicao(
                 api_camara_id=api_id,
@@ -244,7 +495,7 @@ class ColetorProposicoes:
                 situacao=self._clean_text(dados_proposicao.get('statusProposicao', {}).get('descricao', '')),
                 link_inteiro_teor=dados_proposicao.get('uri', ''),
                 keywords=self._clean_text(dados_proposicao.get('keywords', '')),
-                gcs_url=gcs_url or dados_proposicao.get('urlInteiroTeor', '')
+                gcs_url=dados_proposicao.get('urlInteiroTeor', '')
             )
             
             self.session.add(proposicao)
@@ -252,10 +503,13 @@ class ColetorProposicoes:
             
             # Salvar autoria no banco (OTIMIZADO)
             self._salvar_autoria_otimizado(proposicao.id, autores)
+            self._indice_proposicoes.adicionar(api_id)
+            
+            # Texto completo: apenas enfileirado, processado pelo worker da fila de textos
+            if salvar_gcs and dados_proposicao.get('uri'):
+                enfileirar_textos_proposicoes(self.session, [proposicao.id])
             
             logger.info(f"💾 Salva proposição {proposicao.tipo} {proposicao.numero}/{proposicao.ano}")
-            if gcs_url:
-                logger.info(f"📁 GCS: {gcs_url}")
             
             return proposicao.id
             
@@ -264,6 +518,207 @@ class ColetorProposicoes:
             self.session.rollback()
             return None
     
+    # ------------------------------------------------------------------
+    # Carga em lote (INSERT ... ON CONFLICT)
+    # ------------------------------------------------------------------
+    
+    def _carregar_ids_existentes(self) -> Tuple[set, Dict[int, int]]:
+        """
+        Pré-carrega, em duas consultas, o que a carga em lote precisa consultar.
+        
+        Returns:
+            Tupla (api_camara_ids de proposições existentes,
+                   mapa api_camara_id do deputado -> id interno)
+        """
+        proposicoes_existentes = {
+            row[0] for row in self.session.execute(
+                text("SELECT api_camara_id FROM proposicoes WHERE api_camara_id IS NOT NULL")
+            )
+        }
+        mapa_deputados = {
+            row[0]: row[1] for row in self.session.execute(
+                text("SELECT api_camara_id, id FROM deputados WHERE api_camara_id IS NOT NULL")
+            )
+        }
+        logger.info(
+            f"📋 Pré-carga: {len(proposicoes_existentes)} proposições, {len(mapa_deputados)} deputados"
+        )
+        return proposicoes_existentes, mapa_deputados
+    
+    def _linha_proposicao(self, dados_proposicao: Dict) -> Dict[str, Any]:
+        """Converte o registro do arquivo/API na linha da tabela proposicoes."""
+        return {
+            'api_camara_id': dados_proposicao.get('id'),
+            'tipo': dados_proposicao.get('siglaTipo', ''),
+            'numero': dados_proposicao.get('numero', 0),
+            'ano': dados_proposicao.get('ano', 2025),
+            'ementa': self._clean_text(dados_proposicao.get('ementa', '')),
+            'explicacao': self._clean_text(dados_proposicao.get('descricao', '')),
+            'data_apresentacao': self._parse_data(dados_proposicao.get('dataApresentacao')) or datetime.now().date(),
+            'situacao': self._clean_text((dados_proposicao.get('statusProposicao') or {}).get('descricao', '')),
+            'link_inteiro_teor': dados_proposicao.get('uri', ''),
+            'keywords': self._clean_text(dados_proposicao.get('keywords', '')),
+            'gcs_url': dados_proposicao.get('urlInteiroTeor', '')
+        }
+    
+    def _gravar_lote(
+        self,
+        lote: List[Dict],
+        autores_dict: Optional[Dict],
+        mapa_deputados: Dict[int, int]
+    ) -> List[Tuple[int, Dict]]:
+        """
+        Grava um lote de proposições, deputados ausentes e autorias.
+        
+        Args:
+            lote: Registros de proposições ainda não existentes no banco
+            autores_dict: Autores pré-carregados por idProposicao
+            mapa_deputados: Mapa api_camara_id -> id (atualizado in-place)
+            
+        Returns:
+            Lista (id interno, registro) das proposições efetivamente inseridas
+        """
+        linhas = [self._linha_proposicao(dados) for dados in lote]
+        
+        # Conflito em api_camara_id ou em (tipo, numero, ano): ignora a linha
+        inseridas = self.session.execute(
+            pg_insert(Proposicao.__table__).values(linhas)
+            .on_conflict_do_nothing()
+            .returning(Proposicao.__table__.c.id, Proposicao.__table__.c.api_camara_id)
+        ).fetchall()
+        ids_por_api = {api_id: prop_id for prop_id, api_id in inseridas}
+        
+        # Jobs de texto completo entram na mesma transação do lote
+        enfileirar_textos_proposicoes(
+            self.session,
+            [ids_por_api[d.get('id')] for d in lote if d.get('id') in ids_por_api and d.get('uri')]
+        )
+        
+        if not ids_por_api or not autores_dict:
+            return [(ids_por_api[d.get('id')], d) for d in lote if d.get('id') in ids_por_api]
+        
+        # Autores de deputados ainda não cadastrados (legislaturas anteriores)
+        novos_deputados = {}
+        for api_id in ids_por_api:
+            for autor in autores_dict.get(api_id, []):
+                deputado_api_id = autor.get('idDeputadoAutor')
+                if deputado_api_id and int(deputado_api_id) not in mapa_deputados:
+                    novos_deputados[int(deputado_api_id)] = {
+                        'api_camara_id': int(deputado_api_id),
+                        'nome': autor.get('nomeAutor', ''),
+                        'situacao': 'Fora de Exercício'
+                    }
+        
+        if novos_deputados:
+            criados = self.session.execute(
+                pg_insert(Deputado.__table__).values(list(novos_deputados.values()))
+                .on_conflict_do_nothing(index_elements=['api_camara_id'])
+                .returning(Deputado.__table__.c.api_camara_id, Deputado.__table__.c.id)
+            ).fetchall()
+            mapa_deputados.update({api_id: dep_id for api_id, dep_id in criados})
+            logger.info(f"   🆕 {len(criados)} deputados criados a partir de autorias")
+        
+        # Autorias do lote em um único INSERT
+        autorias = {}
+        for api_id, proposicao_id in ids_por_api.items():
+            for autor in autores_dict.get(api_id, []):
+                deputado_api_id = autor.get('idDeputadoAutor')
+                deputado_id = mapa_deputados.get(int(deputado_api_id)) if deputado_api_id else None
+                if not deputado_id:
+                    continue
+                tipo_autoria = autor.get('tipoAutor', 'Autor')
+                autorias[(proposicao_id, deputado_id, tipo_autoria)] = {
+                    'proposicao_id': proposicao_id,
+                    'deputado_id': deputado_id,
+                    'tipo_autoria': tipo_autoria,
+                    'ordem': int(autor.get('ordemAssinatura', 1) or 1)
+                }
+        
+        if autorias:
+            self.session.execute(
+                pg_insert(Autoria.__table__).values(list(autorias.values()))
+                .on_conflict_do_nothing(constraint='_autoria_uc')
+            )
+        
+        return [(ids_por_api[d.get('id')], d) for d in lote if d.get('id') in ids_por_api]
+    
+    def salvar_proposicoes_em_lote(
+        self,
+        proposicoes: Iterable[Dict],
+        autores_dict: Optional[Dict] = None,
+        tamanho_lote: Optional[int] = None
+    ) -> Tuple[List[Tuple[int, Dict]], int]:
+        """
+        Caminho de carga em lote: proposições e autorias em INSERT ... ON CONFLICT.
+        
+        IDs existentes e o mapa de deputados são carregados uma única vez; cada
+        lote é gravado com três INSERTs (proposições, deputados ausentes,
+        autorias) e um commit. O texto completo só é enfileirado em
+        fila_textos_proposicoes. Se um lote falha, seus registros são
+        regravados um a um para isolar os que de fato falham.
+        
+        Args:
+            proposicoes: Registros de proposições (lista ou gerador)
+            autores_dict: Autores pré-carregados por idProposicao
+            tamanho_lote: Registros por lote (padrão: PERFORMANCE_CONFIG)
+            
+        Returns:
+            Tupla (lista (id interno, registro) das proposições inseridas,
+            quantidade de registros que não puderam ser gravados)
+        """
+        tamanho_lote = tamanho_lote or get_config('performance', 'tamanho_lote_upsert') or 1000
+        existentes, mapa_deputados = self._carregar_ids_existentes()
+        
+        inseridas: List[Tuple[int, Dict]] = []
+        lote: List[Dict] = []
+        falhas = [0]
+        
+        def _gravar(registros: List[Dict]):
+            # Deputados criados numa transação desfeita não podem ficar no mapa
+            mapa_anterior = dict(mapa_deputados)
+            try:
+                novas = self._gravar_lote(registros, autores_dict, mapa_deputados)
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                mapa_deputados.clear()
+                mapa_deputados.update(mapa_anterior)
+                raise
+            inseridas.extend(novas)
+            for _, dados in novas:
+                self._indice_proposicoes.adicionar(dados.get('id'))
+        
+        def _descarregar():
+            try:
+                _gravar(lote)
+                logger.info(f"💾 Lote gravado: {len(inseridas)} proposições novas até agora")
+            except Exception as e:
+                logger.error(f"❌ Erro ao gravar lote de proposições: {e} - regravando registro a registro")
+                for dados in lote:
+                    try:
+                        _gravar([dados])
+                    except Exception as erro_registro:
+                        falhas[0] += 1
+                        existentes.discard(dados.get('id'))
+                        logger.error(f"❌ Proposição {dados.get('id')} não gravada: {erro_registro}")
+            lote.clear()
+        
+        for dados in proposicoes:
+            api_id = dados.get('id')
+            if not api_id or api_id in existentes:
+                continue
+            existentes.add(api_id)
+            lote.append(dados)
+            if len(lote) >= tamanho_lote:
+                _descarregar()
+        
+        if lote:
+            _descarregar()
+        
+        if falhas[0]:
+            logger.warning(f"⚠️ {falhas[0]} proposições não gravadas nesta carga")
+        return inseridas, falhas[0]
+    
     def _buscar_autores_proposicao(self, proposicao_id: int) -> List[Dict]:
         """
         Busca autores de uma proposição específica via API.
@@ -277,6 +732,7 @@ class ColetorProposicoes:
         try:
             url = f"{self.base_url}/proposicoes/{proposicao_id}/autores"
             
+            get_token_bucket().adquirir()
             response = requests.get(url, timeout=30)
             response.raise_for_status()
             
@@ -301,26 +757,22 @@ class ColetorProposicoes:
             Dicionário mapeando ID da proposição -> lista de autores
         """
         try:
-            # Usar ARQUIVO OFICIAL COMPLETO da Câmara
-            url = f"https://dadosabertos.camara.leg.br/arquivos/proposicoesAutores/json/proposicoesAutores-{ano}.json"
-            
-            logger.info(f"📥 Baixando JSON COMPLETO de autores de {ano}...")
-            
-            response = requests.get(url, timeout=60)  # Timeout maior para arquivo grande
-            response.raise_for_status()
-            
-            dados = response.json()
-            autores_data = dados.get('dados', [])
+            # Usar ARQUIVO OFICIAL COMPLETO da Câmara (cache em disco + GET condicional)
+            caminho = self.baixar_arquivo_anual(URL_ARQUIVO_AUTORES.format(ano=ano))
+            if not caminho:
+                return None
             
             # Criar dicionário: id_proposicao -> lista de autores
             autores_dict = {}
-            for autor_info in autores_data:
+            total_registros = 0
+            for autor_info in self._iterar_registros_arquivo(caminho):
+                total_registros += 1
                 prop_id = autor_info.get('idProposicao')
                 if prop_id not in autores_dict:
                     autores_dict[prop_id] = []
                 autores_dict[prop_id].append(autor_info)
             
-            logger.info(f"✅ Download autores: {len(autores_data)} registros para {len(autores_dict)} proposições")
+            logger.info(f"✅ Download autores: {total_registros} registros para {len(autores_dict)} proposições")
             return autores_dict
             
         except Exception as e:
@@ -524,6 +976,7 @@ class ColetorProposicoes:
         try:
             logger.info(f"📄 Baixando documento: {url_inteiro_teor}")
             
+            get_token_bucket().adquirir()
             response = requests.get(url_inteiro_teor, timeout=30)
             response.raise_for_status()
             
@@ -749,95 +1202,165 @@ class ColetorProposicoes:
             logger.error(f"❌ Erro ao limpar bucket: {e}")
             return False
     
-    def coletar_por_json(self, ano: int = 2024) -> int:
+    def _data_apresentacao(self, dados_proposicao: Dict) -> Optional[date]:
+        """Data de apresentação (campo ISO 'dataApresentacao', ex.: 2025-03-10T14:30)."""
+        return self._parse_data((dados_proposicao.get('dataApresentacao') or '')[:10])
+    
+    def coletar_por_json(self, ano: int = 2024, delta: bool = False) -> int:
         """
         Coleta proposições usando download de arquivos JSON OFICIAIS COMPLETOS.
         
+        Em modo delta, a marca d'água 'proposicoes_json:<ano>' guarda o ETag do
+        arquivo e a maior data de apresentação já carregada: se o arquivo não
+        mudou a execução termina sem parse nem acesso ao banco; se mudou, só os
+        registros apresentados a partir da marca são processados.
+        
         Args:
             ano: Ano das proposições a coletar
+            delta: Processar apenas o que mudou desde a última execução
             
         Returns:
             Quantidade de proposições coletadas
         """
-        logger.info(f"🚀 Iniciando coleta por JSON COMPLETO - Ano {ano}")
+        logger.info(f"🚀 Iniciando coleta por JSON COMPLETO - Ano {ano}{' (delta)' if delta else ''}")
+        
+        fonte = f"proposicoes_json:{ano}"
+        url_proposicoes = URL_ARQUIVO_PROPOSICOES.format(ano=ano)
+        watermark = obter_watermark(self.session, fonte) if delta else {}
+        
+        if delta:
+            if not self.baixar_arquivo_anual(url_proposicoes):
+                return 0
+            meta = self.metadados_arquivo_anual(url_proposicoes)
+            if watermark.get('etag') and meta.get('etag') == watermark['etag']:
+                logger.info(f"♻️ Arquivo de proposições {ano} inalterado (ETag {meta['etag']}) - nada a coletar")
+                return 0
         
         # Baixar arquivo COMPLETO de autores uma vez só
         logger.info("📥 Baixando arquivo COMPLETO de autores...")
         autores_dict = self.baixar_json_autores(ano)
         
-        total_coletadas = 0
+        # Registros no mesmo dia da marca são reprocessados: o filtro de IDs
+        # existentes do caminho em lote descarta os já carregados
+        desde = watermark.get('ultima_data_apresentacao')
+        if desde:
+            logger.info(f"📍 Processando proposições apresentadas desde {desde}")
+        maior_data = [desde]
         
-        for tipo in self.tipos_relevantes:
-            logger.info(f"📥 Processando tipo: {tipo}")
-            
-            proposicoes = self.baixar_json_proposicoes(tipo, ano)
-            if not proposicoes:
-                continue
-            
-            for dados_prop in proposicoes:
-                # Usar autores do dicionário pré-carregado (mais eficiente)
-                api_id = dados_prop.get('id')
-                autores = autores_dict.get(api_id, []) if autores_dict else []
-                
-                if self.salvar_proposicao(dados_prop, salvar_gcs=True, autores_dict=autores_dict):
-                    total_coletadas += 1
+        def _registros():
+            # Arquivo de proposições baixado uma vez e percorrido uma vez para todos os tipos
+            for _, dados in self.iterar_proposicoes_ano(ano, self.tipos_relevantes):
+                data_apresentacao = self._data_apresentacao(dados)
+                if desde and data_apresentacao and data_apresentacao < desde:
+                    continue
+                if data_apresentacao and (maior_data[0] is None or data_apresentacao > maior_data[0]):
+                    maior_data[0] = data_apresentacao
+                yield dados
         
-        try:
-            self.session.commit()
-            logger.info(f"✅ Coleta JSON COMPLETO concluída: {total_coletadas} proposições")
-        except Exception as e:
-            logger.error(f"❌ Erro no commit: {e}")
-            self.session.rollback()
+        inseridas, falhas = self.salvar_proposicoes_em_lote(_registros(), autores_dict)
+        
+        # Marca só avança se todos os lotes foram gravados: do contrário o
+        # próximo delta pararia no ETag/data e os registros perdidos não voltariam
+        if falhas:
+            logger.warning(f"⚠️ {falhas} proposições não gravadas - marca d'água de {fonte} mantida")
+        else:
+            meta = self.metadados_arquivo_anual(url_proposicoes)
+            salvar_watermark(
+                self.session, fonte,
+                ultima_data_apresentacao=maior_data[0],
+                etag=meta.get('etag'),
+                last_modified=meta.get('last_modified')
+            )
         
+        total_coletadas = len(inseridas)
+        logger.info(f"✅ Coleta JSON COMPLETO concluída: {total_coletadas} proposições (textos enfileirados)")
         return total_coletadas
     
-    def coletar_por_deputados(self, limite_deputados: int = 50) -> int:
+    def coletar_por_deputados(self, limite_deputados: int = 50, delta: bool = False) -> int:
         """
         Coleta proposições buscando por cada deputado via API.
         
+        Em modo delta, cada deputado tem sua marca d'água
+        ('proposicoes_api:<api_camara_id>') com a data da última coleta
+        concluída, usada como dataInicio na API. A marca só avança quando a
+        busca e a gravação de todas as proposições do deputado deram certo, e
+        os deputados há mais tempo sem coleta são processados primeiro, de modo
+        que o limite não deixa ninguém para trás.
+        
         Args:
             limite_deputados: Limite de deputados para processar
+            delta: Buscar apenas proposições desde a última coleta de cada deputado
             
         Returns:
             Quantidade de proposições coletadas
         """
         logger.info(f"🚀 Iniciando coleta por deputados - Limite: {limite_deputados}")
         
-        # Buscar deputados ativos
+        inicio_execucao = date.today()
+        
+        # Deputados ativos, começando pelos nunca coletados ou coletados há mais tempo
         deputados = self.session.execute(
-            text("SELECT api_camara_id, nome FROM deputados WHERE situacao = 'Exercício' LIMIT :limite"),
+            text("""
+                SELECT d.api_camara_id, d.nome, w.ultima_data_inicio
+                FROM deputados d
+                LEFT JOIN coleta_watermarks w ON w.fonte = 'proposicoes_api:' || d.api_camara_id
+                WHERE d.situacao = 'Exercício'
+                ORDER BY w.ultima_data_inicio NULLS FIRST, d.api_camara_id
+                LIMIT :limite
+            """),
             {'limite': limite_deputados}
         ).fetchall()
         
         total_coletadas = 0
+        deputados_com_erro = 0
+        
+        # Requisições de todos os deputados em paralelo; a gravação segue sequencial
+        por_deputado = self.buscar_proposicoes_deputados_api([
+            (api_id, ultima_coleta if delta else None) for api_id, _, ultima_coleta in deputados
+        ])
         
-        for api_id, nome in deputados:
+        for api_id, nome, ultima_coleta in deputados:
             logger.info(f"👥 Processando deputado: {nome}")
+            if delta and ultima_coleta:
+                logger.info(f"📍 Proposições apresentadas desde {ultima_coleta}")
             
-            proposicoes = self.buscar_proposicoes_deputado_api(api_id)
-            if not proposicoes:
+            proposicoes = por_deputado.get(api_id)
+            if proposicoes is None:
+                deputados_com_erro += 1
                 continue
             
-            for dados_prop in proposicoes:
-                if self.salvar_proposicao(dados_prop):
-                    total_coletadas += 1
+            # salvar_proposicao desfaz a transação em caso de erro: commit por deputado
+            salvas = [self.salvar_proposicao(dados_prop) for dados_prop in proposicoes]
+            if not all(salvas):
+                deputados_com_erro += 1
+                logger.warning(f"⚠️ Proposições de {nome} com erro - marca d'água mantida")
+                continue
+            
+            try:
+                self.session.commit()
+            except Exception as e:
+                logger.error(f"❌ Erro no commit: {e}")
+                self.session.rollback()
+                deputados_com_erro += 1
+                continue
+            
+            total_coletadas += len(salvas)
+            salvar_watermark(self.session, f"proposicoes_api:{api_id}", ultima_data_inicio=inicio_execucao)
         
-        try:
-            self.session.commit()
-            logger.info(f"✅ Coleta por deputados concluída: {total_coletadas} proposições")
-        except Exception as e:
-            logger.error(f"❌ Erro no commit: {e}")
-            self.session.rollback()
+        if deputados_com_erro:
+            logger.warning(f"⚠️ {deputados_com_erro} deputados com erro serão reprocessados na próxima execução")
+        logger.info(f"✅ Coleta por deputados concluída: {total_coletadas} proposições")
         
         return total_coletadas
     
-    def coletar_hibrido(self, ano_json: int = 2024, limite_api: int = 20) -> Tuple[int, int]:
+    def coletar_hibrido(self, ano_json: int = 2024, limite_api: int = 20, delta: bool = False) -> Tuple[int, int]:
         """
         Coleta usando abordagem híbrida: JSON para carga inicial + API para atualizações.
         
         Args:
             ano_json: Ano para coleta por JSON
             limite_api: Limite de deputados para coleta por API
+            delta: Coletar apenas o que mudou desde a última execução
             
         Returns:
             Tupla (coletadas_json, coletadas_api)
@@ -846,11 +1369,11 @@ class ColetorProposicoes:
         
         # Fase 1: Coleta por JSON (rápida)
         logger.info("📥 FASE 1: Coleta por JSON (carga inicial)")
-        coletadas_json = self.coletar_por_json(ano_json)
+        coletadas_json = self.coletar_por_json(ano_json, delta=delta)
         
         # Fase 2: Coleta por API (atualizações)
         logger.info("🔍 FASE 2: Coleta por API (atualizações)")
-        coletadas_api = self.coletar_por_deputados(limite_api)
+        coletadas_api = self.coletar_por_deputados(limite_api, delta=delta)
         
         return coletadas_json, coletadas_api
     
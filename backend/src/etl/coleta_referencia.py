@@ -8,9 +8,11 @@ Refatorado para usar ETL Utils - elimina redundâncias e padroniza operações
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, tuple_, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 # --- Bloco de Configuração de Caminho ---
 SRC_DIR = Path(__file__).resolve().parent.parent
@@ -33,6 +35,8 @@ from models.financeiro_models import GastoParlamentar
 
 # Importar ETL utils
 from .etl_utils import ETLBase, DateParser, ProgressLogger, DatabaseManager, HashGenerator
+from .coleta_gastos_ceap import CarregadorGastosCEAP, chave_documento_ceap
+from .indice_deduplicacao import indice_por_tabela
 
 
 class ColetorDadosCamara(ETLBase):
@@ -124,157 +128,138 @@ class ColetorDadosCamara(ETLBase):
         """
         Busca deputados em exercício na API da Câmara com limitações do hackathon.
         Retorna o número de deputados processados.
+        
+        Os detalhes são buscados em paralelo (limitados pelo token bucket global)
+        e deputados e mandatos são gravados com upserts em lote, em uma única
+        transação. Campos alterados na API atualizam o registro existente.
         """
         config_dep = self.config['deputados']
         limite_total = config_dep['limite_total']
         
         print(f"\n👥 Buscando dados de deputados (limite: {limite_total})...")
-        url = f"{self.api_base_url}/deputados?itens={get_config('api', 'batch_size')}&ordem=ASC&ordenarPor=nome"
-        
-        deputados_processados = 0
-        
-        while url and deputados_processados < limite_total:
-            data = self.make_request(url)
-            if not data:
-                break
-                
-            deputados_api = data.get("dados", [])
-            print(f"   📊 Processando lote de {len(deputados_api)} deputados...")
-            
-            for deputado_data in deputados_api:
-                if deputados_processados >= limite_total:
-                    print(f"   ⏹️ Limite de {limite_total} deputados atingido")
-                    break
-                
-                try:
-                    # Buscar detalhes completos do deputado
-                    detalhes = self._buscar_detalhes_deputado(deputado_data['id'])
-                    if not detalhes:
-                        print(f"      ⚠️ Não foi possível obter detalhes do deputado {deputado_data.get('nome', 'desconhecido')}")
-                        continue
-                    
-                    # Combinar dados básicos com detalhes
-                    dados_completos = {**deputado_data, **detalhes}
-                    
-                    # Verificar duplicação por ID da API
-                    if self._verificar_duplicacao('deputados', dados_completos, db):
-                        print(f"      ⏭️  {dados_completos['nome']}: já existe")
-                        continue
-                    
-                    # Criar novo deputado
-                    novo_deputado = self._criar_deputado(dados_completos, db)
-                    db.add(novo_deputado)
-                    db.commit()  # Commit imediato para garantir persistência
-                    print(f"      ✅ Inserido: {dados_completos['nome']} ({dados_completos.get('siglaPartido', 'N/A')})")
-                    
-                    # Criar/atualizar mandato atual
-                    self._processar_mandato(db, dados_completos)
-                    db.commit()  # Commit do mandato também
-                    
-                    deputados_processados += 1
-                    
-                except KeyError as e:
-                    print(f"      ⚠️ Campo ausente nos dados do deputado {deputado_data.get('nome', 'desconhecido')}: {e}")
-                    continue
-                except Exception as e:
-                    print(f"      ❌ Erro ao processar deputado {deputado_data.get('nome', 'desconhecido')}: {e}")
-                    db.rollback()
-                    continue
-            
-            # Verificar próxima página
-            links = {link['rel']: link['href'] for link in data.get('links', [])}
-            url = links.get('next')
-        
-        db.commit()
-        print(f"✅ Busca de deputados concluída. Total processados: {deputados_processados}")
-        return deputados_processados
-
-    def _criar_deputado(self, detalhes: Dict, db: Session) -> Deputado:
-        """Cria um novo objeto Deputado com dados da API."""
-        # Buscar referências - tratar caso não tenha siglaPartido
-        partido = None
-        sigla_partido = detalhes.get('siglaPartido')
-        if sigla_partido:
-            partido = db.query(Partido).filter(Partido.sigla == sigla_partido).first()
-        
-        return Deputado(
-            api_camara_id=detalhes['id'],
-            nome=detalhes['nome'],
-            nome_civil=detalhes.get('nomeCivil'),
-            cpf=detalhes.get('cpf'),
-            sexo=detalhes.get('sexo'),
-            data_nascimento=DateParser.parse_date(detalhes.get('dataNascimento')),
-            municipio_nascimento=detalhes.get('municipioNascimento'),
-            uf_nascimento=detalhes.get('ufNascimento'),
-            escolaridade=detalhes.get('escolaridade'),
-            profissao=detalhes.get('profissao'),
-            email=detalhes.get('email'),
-            telefone=detalhes.get('telefone'),
-            foto_url=detalhes.get('urlFoto'),
-            situacao=detalhes.get('situacao', 'Exercício'),
-            condicao=detalhes.get('condicaoEleitoral')
+        deputados_api = self.paginated_request(
+            f"{self.api_base_url}/deputados",
+            {'itens': get_config('api', 'batch_size'), 'ordem': 'ASC', 'ordenarPor': 'nome'},
+            max_items=limite_total
         )
+        if not deputados_api:
+            print("   ⚠️ Nenhum deputado retornado pela API")
+            return 0
+        
+        # Detalhes em paralelo; make_request consome do token bucket compartilhado
+        max_workers = self.api_config.get('max_concorrencia', 8)
+        print(f"   🚀 Buscando detalhes de {len(deputados_api)} deputados ({max_workers} em paralelo)...")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            detalhes_lista = list(executor.map(
+                self._buscar_detalhes_deputado, [d['id'] for d in deputados_api]
+            ))
+        
+        dados_completos = []
+        for deputado_data, detalhes in zip(deputados_api, detalhes_lista):
+            if not detalhes:
+                print(f"      ⚠️ Não foi possível obter detalhes do deputado {deputado_data.get('nome', 'desconhecido')}")
+                continue
+            dados_completos.append({**deputado_data, **detalhes})
+        
+        try:
+            inseridos, atualizados = self._upsert_deputados(db, dados_completos)
+            mandatos = self._upsert_mandatos(db, dados_completos)
+            db.commit()
+        except Exception as e:
+            print(f"❌ Erro ao gravar deputados: {e}")
+            db.rollback()
+            raise
+        
+        print(
+            f"✅ Busca de deputados concluída. Total processados: {len(dados_completos)} "
+            f"({inseridos} novos, {atualizados} atualizados, {mandatos} mandatos gravados)"
+        )
+        return len(dados_completos)
 
-    def _atualizar_deputado(self, deputado: Deputado, detalhes: Dict):
-        """Atualiza dados de um deputado existente."""
-        deputado.nome = detalhes['nome']
-        deputado.nome_civil = detalhes.get('nomeCivil')
-        deputado.cpf = detalhes.get('cpf')
-        deputado.sexo = detalhes.get('sexo')
-        deputado.data_nascimento = DateParser.parse_date(detalhes.get('dataNascimento'))
-        deputado.municipio_nascimento = detalhes.get('municipioNascimento')
-        deputado.uf_nascimento = detalhes.get('ufNascimento')
-        deputado.escolaridade = detalhes.get('escolaridade')
-        deputado.profissao = detalhes.get('profissao')
-        deputado.email = detalhes.get('email')
-        deputado.telefone = detalhes.get('telefone')
-        deputado.foto_url = detalhes.get('urlFoto')
-        deputado.situacao = detalhes.get('situacao', 'Exercício')
-        deputado.condicao = detalhes.get('condicaoEleitoral')
+    def _linha_deputado(self, detalhes: Dict) -> Dict[str, Any]:
+        """Converte os dados da API para as colunas de deputados."""
+        return {
+            'api_camara_id': detalhes['id'],
+            'nome': detalhes['nome'],
+            'nome_civil': detalhes.get('nomeCivil'),
+            'cpf': detalhes.get('cpf') or None,
+            'sexo': detalhes.get('sexo'),
+            'data_nascimento': DateParser.parse_date(detalhes.get('dataNascimento')),
+            'municipio_nascimento': detalhes.get('municipioNascimento'),
+            'uf_nascimento': detalhes.get('ufNascimento'),
+            'escolaridade': detalhes.get('escolaridade'),
+            'profissao': detalhes.get('profissao'),
+            'email': detalhes.get('email'),
+            'telefone': detalhes.get('telefone'),
+            'foto_url': detalhes.get('urlFoto'),
+            'situacao': detalhes.get('situacao', 'Exercício'),
+            'condicao': detalhes.get('condicaoEleitoral')
+        }
 
-    def _processar_mandato(self, db: Session, detalhes: Dict):
-        """Processa e cria/atualiza o mandato atual do deputado."""
-        # Buscar referências - tratar campos opcionais
-        sigla_partido = detalhes.get('siglaPartido')
-        sigla_uf = detalhes.get('siglaUf')
-        
-        partido = None
-        if sigla_partido:
-            partido = db.query(Partido).filter(Partido.sigla == sigla_partido).first()
-        
-        estado = None
-        if sigla_uf:
-            estado = db.query(Estado).filter(Estado.sigla == sigla_uf).first()
-        
-        if not partido and sigla_partido:
-            print(f"      ⚠️ Partido {sigla_partido} não encontrado para {detalhes['nome']}")
-            # Criar partido se não existir
-            partido = Partido(
-                sigla=sigla_partido,
-                nome=sigla_partido,  # Usar sigla como nome temporariamente
-                status='Ativo'
-            )
-            db.add(partido)
-            db.commit()
-            print(f"      ✅ Partido {sigla_partido} criado automaticamente")
-        
-        if not estado and sigla_uf:
-            print(f"      ⚠️ Estado {sigla_uf} não encontrado para {detalhes['nome']}")
-            # Criar estado se não existir
-            estado = Estado(
-                sigla=sigla_uf,
-                nome=sigla_uf,  # Usar sigla como nome temporariamente
-                regiao='Sudeste'  # Valor padrão, será atualizado depois
+    def _upsert_deputados(self, db: Session, dados_completos: List[Dict]) -> Tuple[int, int]:
+        """
+        INSERT ... ON CONFLICT (api_camara_id) DO UPDATE apenas quando algum campo mudou.
+        Não faz commit. Retorna (inseridos, atualizados).
+        """
+        linhas = {}
+        for dados in dados_completos:
+            linhas[dados['id']] = self._linha_deputado(dados)
+        if not linhas:
+            return 0, 0
+        
+        # CPF é único: não sobrescrever CPF que pertence a outro deputado
+        cpfs = {l['cpf'] for l in linhas.values() if l['cpf']}
+        dono_cpf = dict(
+            db.query(Deputado.cpf, Deputado.api_camara_id).filter(Deputado.cpf.in_(cpfs)).all()
+        ) if cpfs else {}
+        vistos = set()
+        for api_id, linha in linhas.items():
+            cpf = linha['cpf']
+            if cpf and (cpf in vistos or dono_cpf.get(cpf, api_id) != api_id):
+                linha['cpf'] = None
+            vistos.add(cpf)
+        
+        stmt = pg_insert(Deputado).values(list(linhas.values()))
+        colunas = [c for c in next(iter(linhas.values())) if c != 'api_camara_id']
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['api_camara_id'],
+            set_={**{c: stmt.excluded[c] for c in colunas}, 'updated_at': func.now()},
+            where=tuple_(*[getattr(Deputado, c) for c in colunas]).is_distinct_from(
+                tuple_(*[stmt.excluded[c] for c in colunas])
             )
-            db.add(estado)
-            db.commit()
-            print(f"      ✅ Estado {sigla_uf} criado automaticamente")
+        ).returning(literal_column('(xmax = 0)'))
+        
+        resultado = db.execute(stmt).fetchall()
+        inseridos = sum(1 for (inserido,) in resultado if inserido)
+        return inseridos, len(resultado) - inseridos
+
+    def _upsert_mandatos(self, db: Session, dados_completos: List[Dict]) -> int:
+        """
+        Cria partidos/estados/legislatura ausentes e grava os mandatos da
+        legislatura ativa em lote (partido/UF alterados são atualizados).
+        Não faz commit. Retorna o número de mandatos inseridos ou alterados.
+        """
+        # Partidos e estados ausentes criados de uma vez
+        siglas_partido = {d['siglaPartido'] for d in dados_completos if d.get('siglaPartido')}
+        siglas_uf = {d['siglaUf'] for d in dados_completos if d.get('siglaUf')}
+        if siglas_partido:
+            db.execute(pg_insert(Partido).values([
+                {'sigla': sigla, 'nome': sigla, 'status': 'Ativo'}  # Usar sigla como nome temporariamente
+                for sigla in siglas_partido
+            ]).on_conflict_do_nothing(index_elements=['sigla']))
+        if siglas_uf:
+            db.execute(pg_insert(Estado).values([
+                {'sigla': sigla, 'nome': sigla, 'regiao': 'Sudeste'}  # Valor padrão, será atualizado depois
+                for sigla in siglas_uf
+            ]).on_conflict_do_nothing(index_elements=['sigla']))
+        
+        partidos = dict(db.query(Partido.sigla, Partido.id).filter(Partido.sigla.in_(siglas_partido)).all()) if siglas_partido else {}
+        estados = dict(db.query(Estado.sigla, Estado.id).filter(Estado.sigla.in_(siglas_uf)).all()) if siglas_uf else {}
         
         # Buscar legislatura atual
         legislatura = db.query(Legislatura).filter(Legislatura.ativa == True).first()
         if not legislatura:
             print(f"      ⚠️ Nenhuma legislatura ativa encontrada")
-            # Criar legislatura atual
             ano_atual = datetime.now().year
             legislatura = Legislatura(
                 numero=ano_atual,  # Simplificado
@@ -283,46 +268,77 @@ class ColetorDadosCamara(ETLBase):
                 ativa=True
             )
             db.add(legislatura)
-            db.commit()
+            db.flush()
             print(f"      ✅ Legislatura {ano_atual} criada automaticamente")
         
-        # Buscar deputado
-        deputado = db.query(Deputado).filter(Deputado.api_camara_id == detalhes['id']).first()
+        ids_deputados = dict(
+            db.query(Deputado.api_camara_id, Deputado.id)
+            .filter(Deputado.api_camara_id.in_([d['id'] for d in dados_completos])).all()
+        )
         
-        # Verificar se mandato já existe
-        mandato_existente = db.query(Mandato).filter(
-            and_(
-                Mandato.deputado_id == deputado.id,
-                Mandato.legislatura_id == legislatura.id
-            )
-        ).first()
-        
-        if not mandato_existente and partido and estado:
-            novo_mandato = Mandato(
-                deputado_id=deputado.id,
-                legislatura_id=legislatura.id,
-                partido_id=partido.id,
-                estado_id=estado.id,
-                data_inicio=datetime.now().date()  # Será atualizado com dados reais
+        linhas = {}
+        for dados in dados_completos:
+            partido_id = partidos.get(dados.get('siglaPartido'))
+            estado_id = estados.get(dados.get('siglaUf'))
+            deputado_id = ids_deputados.get(dados['id'])
+            if not (partido_id and estado_id and deputado_id):
+                print(f"      ⚠️ Mandato não criado para {dados['nome']}: partido ou estado não disponível")
+                continue
+            linhas[deputado_id] = {
+                'deputado_id': deputado_id,
+                'legislatura_id': legislatura.id,
+                'partido_id': partido_id,
+                'estado_id': estado_id,
+                'data_inicio': datetime.now().date()  # Será atualizado com dados reais
+            }
+        if not linhas:
+            return 0
+        
+        stmt = pg_insert(Mandato).values(list(linhas.values()))
+        stmt = stmt.on_conflict_do_update(
+            constraint='_deputado_legislatura_uc',
+            set_={
+                'partido_id': stmt.excluded.partido_id,
+                'estado_id': stmt.excluded.estado_id,
+                'updated_at': func.now()
+            },
+            where=tuple_(Mandato.partido_id, Mandato.estado_id).is_distinct_from(
+                tuple_(stmt.excluded.partido_id, stmt.excluded.estado_id)
             )
-            db.add(novo_mandato)
-        elif not mandato_existente:
-            print(f"      ⚠️ Mandato não criado para {detalhes['nome']}: partido ou estado não disponível")
+        )
+        return db.execute(stmt).rowcount
 
-    def buscar_e_salvar_gastos(self, db: Session, meses_historico: int = 12) -> int:
+    def buscar_e_salvar_gastos(self, db: Session, meses_historico: int = 12, checkpoint: Optional[Any] = None) -> int:
         """
         Busca gastos parlamentares dos últimos meses e salva no banco.
         Retorna o número de registros processados.
+        
+        Com checkpoint, grava a cada deputado e salva o último deputado concluído
+        no cursor ('gastos_ultimo_deputado_id'); uma nova tentativa continua dali.
         """
         print(f"\n💰 Buscando gastos dos últimos {meses_historico} meses...")
         
         gastos_processados = 0
         data_atual = datetime.now()
         
-        # Buscar todos os deputados ativos
-        deputados = db.query(Deputado).filter(
+        # Buscar todos os deputados ativos (ordem estável para o cursor de retomada)
+        query = db.query(Deputado).filter(
             Deputado.situacao == 'Exercício'
-        ).all()
+        ).order_by(Deputado.id)
+        
+        ultimo_deputado_id = checkpoint.cursor.get('gastos_ultimo_deputado_id') if checkpoint else None
+        if ultimo_deputado_id:
+            gastos_processados = checkpoint.contagens.get('gastos_parcial', 0)
+            query = query.filter(Deputado.id > ultimo_deputado_id)
+            print(f"   ♻️ Retomando após o deputado {ultimo_deputado_id} ({gastos_processados} gastos já gravados)")
+        
+        deputados = query.all()
+        
+        # Meses já coletados, carregados uma vez por ano em vez de um COUNT por deputado/mês
+        meses_coletados = indice_por_tabela(
+            db, 'gastos_parlamentares', ['deputado_id', 'mes'], ['ano'],
+            normalizar=lambda chave: (int(chave[0]), int(chave[1]))
+        )
         
         print(f"   📊 Processando gastos para {len(deputados)} deputados...")
         
@@ -334,16 +350,17 @@ class ColetorDadosCamara(ETLBase):
                     mes = data_ref.month
                     
                     # Verificar se já temos gastos para este período
-                    gastos_existentes = db.query(GastoParlamentar).filter(
-                        and_(
-                            GastoParlamentar.deputado_id == deputado.id,
-                            GastoParlamentar.ano == ano,
-                            GastoParlamentar.mes == mes
-                        )
-                    ).count()
-                    
-                    if gastos_existentes > 0:
-                        print(f"      ⏭️  {deputado.nome} - {mes}/{ano}: já coletado ({gastos_existentes} registros)")
+                    # (com filtro de Bloom, um acerto ainda é confirmado no banco)
+                    if meses_coletados.contem((deputado.id, mes), (ano,)) and (
+                        meses_coletados.exato or db.query(GastoParlamentar.id).filter(
+                            and_(
+                                GastoParlamentar.deputado_id == deputado.id,
+                                GastoParlamentar.ano == ano,
+                                GastoParlamentar.mes == mes
+                            )
+                        ).first() is not None
+                    ):
+                        print(f"      ⏭️  {deputado.nome} - {mes}/{ano}: já coletado")
                         continue
                     
                     # Buscar gastos da API
@@ -379,16 +396,25 @@ class ColetorDadosCamara(ETLBase):
                             data_documento=DateParser.parse_date(despesa.get('dataDocumento')),
                             numero_documento=despesa.get('numeroDocumento'),
                             numero_ressarcimento=despesa.get('numeroRessarcimento'),
-                            parcela=despesa.get('parcela')
+                            parcela=despesa.get('parcela'),
+                            chave_documento=chave_documento_ceap(despesa.get('codDocumento'))
                         )
                         db.add(gasto)
                         gastos_processados += 1
+                    meses_coletados.adicionar((deputado.id, mes), (ano,))
                     
                     print(f"      💸 {deputado.nome} - {mes}/{ano}: {len(despesas)} despesas")
                     
                 except Exception as e:
                     print(f"      ❌ Erro ao processar gastos de {deputado.nome}: {e}")
                     continue
+            
+            if checkpoint:
+                db.commit()
+                checkpoint.salvar(
+                    {**checkpoint.cursor, 'gastos_ultimo_deputado_id': deputado.id},
+                    gastos_parcial=gastos_processados
+                )
         
         db.commit()
         print(f"✅ Busca de gastos concluída. Total processados: {gastos_processados}")
@@ -396,6 +422,26 @@ class ColetorDadosCamara(ETLBase):
 
 
 
+    def carregar_gastos_arquivos_anuais(self, db: Session, meses_historico: int = 12) -> int:
+        """
+        Carrega os gastos dos últimos meses a partir dos arquivos anuais da CEAP.
+        Cada ano envolvido é carregado em uma única passada (COPY em lote).
+        Retorna o número de registros inseridos.
+        """
+        data_atual = datetime.now()
+        meses_por_ano: Dict[int, set] = {}
+        for mes_offset in range(meses_historico):
+            data_ref = data_atual - timedelta(days=mes_offset * 30)
+            meses_por_ano.setdefault(data_ref.year, set()).add(data_ref.month)
+        
+        carregador = CarregadorGastosCEAP()
+        inseridos = 0
+        for ano, meses in sorted(meses_por_ano.items()):
+            inseridos += carregador.carregar_ano(db, ano, meses)['inseridas']
+        
+        print(f"✅ Carga de gastos (arquivos anuais) concluída. Total inseridos: {inseridos}")
+        return inseridos
+
     def _verificar_duplicacao(self, tipo: str, dados: Dict, db: Session) -> bool:
         """
         Verifica se um registro já existe no banco usando a estratégia de deduplicação.
@@ -452,25 +498,42 @@ class ColetorDadosCamara(ETLBase):
         return False
 
 
-    def executar_coleta_completa(self, db: Session) -> Dict[str, int]:
+    def executar_coleta_completa(self, db: Session, checkpoint: Optional[Any] = None) -> Dict[str, int]:
         """
         Executa toda a coleta de dados de forma organizada.
         Retorna um dicionário com contadores de cada tipo de dado coletado.
+        
+        Com checkpoint do pipeline, subetapas já concluídas (partidos,
+        deputados, gastos) são puladas na retomada.
         """
         print("🚀 INICIANDO COLETA COMPLETA DE DADOS DA CÂMARA")
         print("=" * 60)
         
         resultados = {}
+        concluidas = list(checkpoint.cursor.get('subetapas_concluidas', [])) if checkpoint else []
+        
+        def _subetapa(nome: str, funcao):
+            if nome in concluidas:
+                resultados[nome] = checkpoint.contagens.get(nome, 0)
+                print(f"   ⏭️ {nome.capitalize()}: já concluído nesta execução ({resultados[nome]} registros)")
+                return
+            resultados[nome] = funcao()
+            if checkpoint:
+                concluidas.append(nome)
+                checkpoint.salvar({**checkpoint.cursor, 'subetapas_concluidas': concluidas}, **{nome: resultados[nome]})
         
         # 1. Coletar dados de referência (partidos, deputados)
         print("\n📋 ETAPA 1: DADOS DE REFERÊNCIA")
-        resultados['partidos'] = self.buscar_e_salvar_partidos(db)
-        resultados['deputados'] = self.buscar_e_salvar_deputados(db)
+        _subetapa('partidos', lambda: self.buscar_e_salvar_partidos(db))
+        _subetapa('deputados', lambda: self.buscar_e_salvar_deputados(db))
         
         # 2. Coletar dados financeiros
         print("\n💰 ETAPA 2: DADOS FINANCEIROS")
         meses_historico = self.config['gastos']['meses_historico']
-        resultados['gastos'] = self.buscar_e_salvar_gastos(db, meses_historico=meses_historico)
+        if self.config['gastos'].get('fonte') == 'arquivo_anual':
+            _subetapa('gastos', lambda: self.carregar_gastos_arquivos_anuais(db, meses_historico=meses_historico))
+        else:
+            _subetapa('gastos', lambda: self.buscar_e_salvar_gastos(db, meses_historico=meses_historico, checkpoint=checkpoint))
         
         # 3. Proposições e Frequência removidos - Evolução Futura
         print("\n📄 ETAPA 3: PROPOSIÇÕES E FREQUÊNCIA (REMOVIDOS)")
@@ -14,10 +14,26 @@ API_CONFIG = {
     'user_agent': 'KritikosETL/1.0 (Hackathon 2025)',
     'timeout': 15,
     'rate_limit_delay': 0.3,  # Reduzido para 0.3s para mais velocidade
+    'requests_por_segundo': 3.0,  # Taxa sustentada do token bucket global (todos os coletores)
+    'burst': 5,  # Rajada máxima do token bucket
+    'max_concorrencia': 8,  # Requisições simultâneas no cliente assíncrono
+    'backoff_base': 0.5,  # Backoff exponencial com jitter (segundos)
+    'backoff_max': 10.0,
     'max_retries': 3,
     'batch_size': 50  # Reduzido de 100 para 50 para processamento mais rápido
 }
 
+# API do Portal da Transparência (cota própria, separada da API da Câmara)
+TRANSPARENCIA_CONFIG = {
+    'requests_por_segundo': 1.4,  # Cota diurna do portal: 90 requisições/minuto por chave
+    'burst': 3,
+    'max_concorrencia': 4,  # Páginas/documentos buscados em paralelo
+    'itens_por_pagina': 100,
+    'timeout': 30,
+    'max_paginas': 100,  # Limite de segurança por consulta
+    'cache_horas': 6  # TTL do cache de respostas (páginas e documentos)
+}
+
 # Configurações do Google Cloud Storage
 GCS_CONFIG = {
     'bucket_name': os.getenv('GCS_BUCKET_NAME', 'kritikos-emendas-prod'),
@@ -26,7 +42,11 @@ GCS_CONFIG = {
     'compress_files': True,  # Comprimir arquivos com gzip
     'cache_ttl_hours': 6,  # TTL para cache local
     'storage_class': 'Standard',  # Classe de armazenamento
-    'location': 'southamerica-east1'  # Região (São Paulo)
+    'location': 'southamerica-east1',  # Região (São Paulo)
+    'upload_workers': 8,  # Threads da fila de upload de emendas
+    'modo_upload_emendas': 'objeto',  # 'objeto' (um JSON por emenda) ou 'shard' (NDJSON.gz por ano/lote)
+    'emendas_por_shard': 5000,  # Emendas por arquivo NDJSON.gz no modo 'shard'
+    'tamanho_lote_urls': 500  # gcs_url gravados por UPDATE em lote
 }
 
 # Configurações de coleta para Hackathon 2025
@@ -48,7 +68,8 @@ HACKATHON_CONFIG = {
         'meses_para_coletar': [7, 8, 9, 10, 11, 12],  # Meses do hackathon em diante
         'limite_por_deputado': 200,  # Aumentar limite para capturar todos os gastos
         'valor_minimo': 0.01,  # Ignorar gastos muito pequenos
-        'data_inicio': '2025-01-01'  # Início do período
+        'data_inicio': '2025-01-01',  # Início do período
+        'fonte': 'arquivo_anual'  # 'arquivo_anual' (CSV anual da CEAP via COPY) ou 'api' (deputado x mês)
     },
     
     # Configurações de proposições (HABILITADO - Integração Completa)
@@ -90,7 +111,9 @@ DEDUPLICATION_CONFIG = {
         'partidos': ['sigla']
     },
     'verificar_existencia': True,  # Sempre verificar se já existe antes de inserir
-    'atualizar_existentes': True   # Atualizar registros existentes com dados mais recentes
+    'atualizar_existentes': True,  # Atualizar registros existentes com dados mais recentes
+    'indice_memoria': 'set',  # Índice de chaves existentes: 'set' (exato) ou 'bloom' (compacto)
+    'bloom_taxa_falsos_positivos': 0.001  # Taxa alvo do filtro de Bloom
 }
 
 # Configurações de logging
@@ -106,11 +129,26 @@ LOGGING_CONFIG = {
 PERFORMANCE_CONFIG = {
     'usar_bulk_insert': True,
     'batch_commit_size': 50,
+    'tamanho_lote_upsert': 1000,  # Linhas por INSERT ... ON CONFLICT nas cargas em lote
     'paralelizar_requisicoes': False,  # Manter False para não sobrecarregar API
+    'prefetch_paginas': True,  # Buscar páginas conhecidas (link 'last') em paralelo, limitado pelo token bucket
+    'retomar_pipeline': True,  # Retomar execução falha do pipeline a partir dos checkpoints (pipeline_stage_state)
+    'janela_retomada_horas': 24,  # Execuções falhas mais antigas que isso começam do zero
     'cache_sessao': True,
     'timeout_por_lote': 300  # 5 minutos por lote
 }
 
+# Diretório backend/, para caminhos de dados que não dependem do diretório de execução
+DIRETORIO_BACKEND = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+# Staging colunar (Parquet) das fontes brutas já baixadas
+STAGING_CONFIG = {
+    'habilitado': True,  # Sem pyarrow o staging é ignorado e as fontes são lidas como antes
+    'diretorio': os.path.join(DIRETORIO_BACKEND, 'staging'),
+    'linhas_por_arquivo': 50000,  # Registros acumulados antes de gravar cada arquivo Parquet
+    'validade_horas': 24  # Dentro desta janela o ZIP de emendas já preparado não é baixado de novo
+}
+
 # Configurações de ambiente
 AMBIENTE = 'hackathon'  # 'hackathon', 'desenvolvimento', 'producao'
 
@@ -186,7 +224,10 @@ def get_config(tipo: str, chave: str = None) -> Any:
         'hackathon': HACKATHON_CONFIG,
         'deduplication': DEDUPLICATION_CONFIG,
         'logging': LOGGING_CONFIG,
-        'performance': PERFORMANCE_CONFIG
+        'performance': PERFORMANCE_CONFIG,
+        'staging': STAGING_CONFIG,
+        'gcs': GCS_CONFIG,
+        'transparencia': TRANSPARENCIA_CONFIG
     }
     
     config = configs.get(tipo, {})
@@ -254,7 +295,11 @@ COLETA_CONFIG = {
         'respeitar_data_inicio': True,
         'descricao': 'Proposições Legislativas com GCS',
         'ano_coleta': 2025,
-        'data_inicio': '2025-01-01'
+        'data_inicio': '2025-01-01',
+        'workers_texto': 4,  # Threads do worker da fila de textos completos
+        'max_tentativas_texto': 3,  # Tentativas por job antes de desistir
+        'timeout_job_texto_min': 30,  # Jobs 'processando' há mais tempo voltam para a fila
+        'modo_delta': True  # Coleta incremental a partir da marca d'água (coleta_watermarks)
     },
 }
 
@@ -382,6 +427,8 @@ EMENDAS_CONFIG = {
     'normalizar_nomes': True,  # Aplicar normalização de nomes
     'gerar_ranking': True,  # Gerar ranking automático
     'batch_size': 50,  # Tamanho do lote para commits
+    'tamanho_chunk_csv': 50000,  # Linhas por chunk lidas direto do ZIP (limita a memória)
+    'registrar_execucao_mensal': True,  # Snapshot mensal de execução (execucao_emendas) das emendas alteradas
     'mostrar_progresso': True  # Mostrar progresso detalhado
 }
 
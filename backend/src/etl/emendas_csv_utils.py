@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+Transformações vetorizadas do CSV de emendas do Portal da Transparência
+
+Funções coluna a coluna (pandas) usadas pelos coletores de emendas via CSV
+no lugar do processamento linha a linha com iterrows, mais o anti-join dos
+códigos já carregados e a inserção em lote de emendas e detalhes.
+
+O CSV é lido direto do membro do ZIP em chunks de tamanho fixo, sem extrair
+para o disco; encoding e separador são detectados uma vez pelos primeiros KB.
+Na primeira leitura de cada ZIP os chunks também vão para o staging Parquet
+(staging_parquet), e as leituras seguintes do mesmo arquivo saem de lá.
+
+As funções de banco recebem as classes de modelo como parâmetro porque os
+coletores importam os modelos por caminhos diferentes (models.* e src.models.*).
+
+Autor: Kritikos Team
+"""
+
+import codecs
+import csv
+import logging
+import zipfile
+from pathlib import Path
+from typing import Optional, Dict, List, Any, Tuple, Iterator, Iterable, Callable
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+try:
+    from .staging_parquet import AreaStaging, checksum_arquivo
+except ImportError:
+    # Fallback para execução com o diretório etl no sys.path
+    from staging_parquet import AreaStaging, checksum_arquivo
+
+logger = logging.getLogger(__name__)
+
+
+MAPA_TIPOS_EMENDA = {
+    'EMENDA INDIVIDUAL': 'EMD',
+    'EMENDA DE BANCADA': 'EMB',
+    'EMENDA DE COMISSÃO': 'EMC',
+    'EMENDA DE RELATOR': 'EMR'
+}
+
+MAPA_UFS = {
+    'ACRE': 'AC',
+    'ALAGOAS': 'AL',
+    'AMAPÁ': 'AP',
+    'AMAZONAS': 'AM',
+    'BAHIA': 'BA',
+    'CEARÁ': 'CE',
+    'DISTRITO FEDERAL': 'DF',
+    'ESPÍRITO SANTO': 'ES',
+    'GOIÁS': 'GO',
+    'MARANHÃO': 'MA',
+    'MATO GROSSO': 'MT',
+    'MATO GROSSO DO SUL': 'MS',
+    'MINAS GERAIS': 'MG',
+    'PARÁ': 'PA',
+    'PARAÍBA': 'PB',
+    'PARANÁ': 'PR',
+    'PERNAMBUCO': 'PE',
+    'PIAUÍ': 'PI',
+    'RIO DE JANEIRO': 'RJ',
+    'RIO GRANDE DO NORTE': 'RN',
+    'RIO GRANDE DO SUL': 'RS',
+    'RONDÔNIA': 'RO',
+    'RORAIMA': 'RR',
+    'SANTA CATARINA': 'SC',
+    'SÃO PAULO': 'SP',
+    'SERGIPE': 'SE',
+    'TOCANTINS': 'TO'
+}
+
+# Bytes lidos do início do CSV para detectar encoding e separador
+TAMANHO_AMOSTRA_FORMATO = 64 * 1024
+
+# Encodings de 1 byte tentados quando a amostra não é UTF-8 comprovado (padrão do Portal: cp1252)
+ENCODINGS_CSV = ['cp1252', 'latin-1']
+
+# Nome da fonte do ZIP de emendas na área de staging
+FONTE_STAGING_EMENDAS = 'emendas_csv'
+SEPARADORES_CSV = ';,\t'
+
+# Nome da coluna no CSV do Portal (após padronizar_colunas ou original) -> nome interno
+MAPA_COLUNAS_CSV = {
+    # Identificação
+    'Autor': 'autor',
+    'Nome_do_Autor': 'autor',
+    'Nome do Autor da Emenda': 'autor',
+    'Ano': 'ano',
+    'Ano_da_Emenda': 'ano',
+    'Ano Emenda': 'ano',
+    'Número_Emenda': 'numero_emenda',
+    'Número da emenda': 'numero_emenda',
+    'Numero Emenda': 'numero_emenda',
+    'Código_da_Emenda': 'codigo_emenda',
+    'Código da Emenda': 'codigo_emenda',
+    'Código_do_Autor_da_Emenda': 'codigo_autor_emenda',
+    'Código do Autor da Emenda': 'codigo_autor_emenda',
+
+    # Tipo
+    'Tipo_Emenda': 'tipo_emenda',
+    'Tipo de Emenda': 'tipo_emenda',
+    'Tipo Emenda': 'tipo_emenda',
+
+    # Financeiros
+    'Valor_Empenhado': 'valor_empenhado',
+    'Valor Empenhado': 'valor_empenhado',
+    'Valor_Liquidado': 'valor_liquidado',
+    'Valor Liquidado': 'valor_liquidado',
+    'Valor_Pago': 'valor_pago',
+    'Valor Pago': 'valor_pago',
+
+    # Localização
+    'UF': 'uf',
+    'Função': 'funcao',
+    'Nome_Função': 'funcao',
+    'Nome Função': 'funcao',
+    'Subfunção': 'subfuncao',
+    'Nome_Subfunção': 'subfuncao',
+    'Nome Subfunção': 'subfuncao',
+    'Localidade_do_Gasto': 'localidade',
+    'Localidade do gasto': 'localidade',
+    'Localidade de aplicação do recurso': 'localidade',
+    'Município': 'municipio',
+
+    # Datas
+    'Data_do_Empenho': 'data_empenho',
+    'Data do Empenho': 'data_empenho',
+    'Data Empenho': 'data_empenho',
+
+    # Códigos
+    'Código_Função': 'codigo_funcao',
+    'Código Função': 'codigo_funcao',
+    'Código_Subfunção': 'codigo_subfuncao',
+    'Código Subfunção': 'codigo_subfuncao',
+    'Nome_Programa': 'programa',
+    'Nome Programa': 'programa',
+    'Nome_Ação': 'acao',
+    'Nome Ação': 'acao'
+}
+
+# Padrão (regex, minúsculas) da função orçamentária -> local da emenda, na ordem de prioridade
+LOCAIS_POR_FUNCAO = [
+    ('saúde|saude', 'SAÚDE'),
+    ('educação|educacao', 'EDUCAÇÃO'),
+    ('urbanismo', 'URBANISMO'),
+    ('assistência|assistencia', 'ASSISTÊNCIA SOCIAL'),
+    ('segurança|seguranca', 'SEGURANÇA'),
+    ('infraestrutura', 'INFRAESTRUTURA'),
+]
+
+
+def localizar_csv_no_zip(zip_ref: zipfile.ZipFile, nome_preferido: Optional[str] = None) -> Optional[str]:
+    """
+    Nome do membro CSV dentro do ZIP
+
+    Args:
+        zip_ref: Arquivo ZIP aberto
+        nome_preferido: Trecho do nome esperado (ex.: 'EmendasParlamentares.csv')
+
+    Returns:
+        str: Nome do membro ou None se não houver CSV
+    """
+    csvs = [nome for nome in zip_ref.namelist() if nome.lower().endswith('.csv')]
+    if nome_preferido:
+        for nome in csvs:
+            if nome_preferido.lower() in nome.lower():
+                return nome
+    return csvs[0] if csvs else None
+
+
+def detectar_formato_csv(amostra: bytes) -> Tuple[str, str]:
+    """
+    Detecta encoding e separador a partir do início do arquivo
+
+    UTF-8 só é escolhido com BOM ou quando a amostra tem bytes não ASCII que
+    formam UTF-8 válido: uma amostra só ASCII não prova nada sobre o resto do
+    arquivo, e o Portal publica em cp1252.
+
+    Args:
+        amostra: Primeiros bytes do CSV
+
+    Returns:
+        Tuple: (encoding, separador)
+    """
+    encoding, texto_amostra = 'latin-1', None
+    if amostra.startswith(codecs.BOM_UTF8):
+        encoding = 'utf-8-sig'
+        texto_amostra = amostra[len(codecs.BOM_UTF8):].decode('utf-8', errors='ignore')
+    else:
+        candidatos = ENCODINGS_CSV if amostra.isascii() else ['utf-8'] + ENCODINGS_CSV
+        for candidato in candidatos:
+            try:
+                # Decoder incremental tolera um caractere multibyte cortado no fim da amostra
+                texto_amostra = codecs.getincrementaldecoder(candidato)().decode(amostra, final=False)
+                encoding = candidato
+                break
+            except UnicodeDecodeError:
+                continue
+
+    linhas = (texto_amostra or amostra.decode('latin-1')).splitlines()
+    # A última linha da amostra pode estar incompleta
+    amostra_linhas = '\n'.join(linhas[:-1] if len(linhas) > 1 else linhas)
+    try:
+        separador = csv.Sniffer().sniff(amostra_linhas, delimiters=SEPARADORES_CSV).delimiter
+    except csv.Error:
+        cabecalho = linhas[0] if linhas else ''
+        separador = max(SEPARADORES_CSV, key=cabecalho.count)
+
+    return encoding, separador
+
+
+def mapear_colunas_csv(colunas: Iterable[str]) -> Dict[str, str]:
+    """Colunas reconhecidas do CSV -> nome interno (as demais ficam de fora)."""
+    return {coluna: MAPA_COLUNAS_CSV[coluna] for coluna in colunas if coluna in MAPA_COLUNAS_CSV}
+
+
+def padronizar_colunas(colunas: pd.Index) -> pd.Index:
+    """Remove espaços e caracteres especiais dos nomes de colunas."""
+    return colunas.str.strip().str.replace(' ', '_').str.replace(r'[^\w_]', '', regex=True)
+
+
+def iterar_csv_zip(
+    zip_path: Path,
+    tamanho_chunk: int = 50000,
+    nome_preferido: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Lê o CSV de dentro do ZIP em chunks, sem extrair para o disco
+
+    O formato é detectado uma única vez; a memória fica limitada ao tamanho do
+    chunk mesmo para o arquivo com todos os anos. Bytes inválidos no encoding
+    detectado (fora da amostra) viram U+FFFD em vez de abortar a leitura.
+
+    Args:
+        zip_path: Caminho do ZIP baixado
+        tamanho_chunk: Linhas por DataFrame
+        nome_preferido: Trecho do nome do CSV esperado dentro do ZIP
+
+    Yields:
+        pd.DataFrame: Chunk com colunas padronizadas (ainda não mapeadas)
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        membro = localizar_csv_no_zip(zip_ref, nome_preferido)
+        if not membro:
+            raise ValueError(f"Nenhum arquivo CSV encontrado em {zip_path}")
+
+        with zip_ref.open(membro) as arquivo:
+            encoding, separador = detectar_formato_csv(arquivo.read(TAMANHO_AMOSTRA_FORMATO))
+
+        logger.info(f"📄 {membro}: encoding={encoding}, separador={separador!r}, chunks de {tamanho_chunk} linhas")
+
+        with zip_ref.open(membro) as arquivo:
+            leitor = pd.read_csv(
+                arquivo, encoding=encoding, encoding_errors='replace', sep=separador,
+                decimal=',', thousands='.', chunksize=tamanho_chunk, low_memory=True
+            )
+            for chunk in leitor:
+                chunk.columns = padronizar_colunas(chunk.columns)
+                yield chunk
+
+
+def iterar_emendas_zip(
+    zip_path: Optional[Path],
+    mapear_colunas: Callable[[pd.Index], Dict[str, str]],
+    ano: Optional[int] = None,
+    tamanho_chunk: int = 50000,
+    nome_preferido: Optional[str] = None,
+    checksum: Optional[str] = None,
+    area: Optional[AreaStaging] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Chunks do CSV de emendas com colunas mapeadas e filtrados pelo ano
+
+    Se a versão do ZIP (checksum) já está no staging, lê só a partição do ano
+    em Parquet; senão lê o ZIP e grava o staging (colunas originais, todos os
+    anos) enquanto entrega os chunks.
+
+    Args:
+        zip_path: ZIP baixado (pode ser None se checksum já estiver no staging)
+        mapear_colunas: Função colunas originais -> {original: nome interno}
+        ano: Ano das emendas (None = todos)
+        tamanho_chunk: Linhas por chunk na leitura do ZIP
+        nome_preferido: Trecho do nome do CSV esperado dentro do ZIP
+        checksum: Checksum do ZIP, se já conhecido
+        area: Área de staging (padrão: STAGING_CONFIG)
+
+    Yields:
+        pd.DataFrame: Chunk mapeado e filtrado (pode vir vazio)
+    """
+    area = area or AreaStaging()
+    checksum = checksum or checksum_arquivo(zip_path)
+
+    if area.disponivel(FONTE_STAGING_EMENDAS, checksum):
+        logger.info(f"♻️ Emendas lidas do staging Parquet ({checksum[:12]})")
+        for chunk in area.ler(FONTE_STAGING_EMENDAS, checksum, ano=ano):
+            yield filtrar_ano(chunk.rename(columns=mapear_colunas(chunk.columns)), ano)
+        return
+
+    gravador = None
+    concluido = False
+    try:
+        for chunk in iterar_csv_zip(zip_path, tamanho_chunk, nome_preferido):
+            mapeamento = mapear_colunas(chunk.columns)
+            if gravador is None:
+                origem = {destino: original for original, destino in mapeamento.items()}
+                gravador = area.gravador(
+                    FONTE_STAGING_EMENDAS, checksum,
+                    (origem.get('ano', 'ano'), origem.get('tipo_emenda', 'tipo_emenda'))
+                ) or False
+            if gravador:
+                gravador.adicionar(chunk)
+            yield filtrar_ano(chunk.rename(columns=mapeamento), ano)
+
+        if gravador:
+            gravador.concluir(Path(zip_path).name)
+            concluido = True
+    finally:
+        # Leitura interrompida (erro ou consumidor parou antes do fim): não publica staging parcial
+        if gravador and not concluido:
+            gravador.descartar()
+
+
+def filtrar_ano(df: pd.DataFrame, ano: Optional[int]) -> pd.DataFrame:
+    """Linhas do ano informado (coluna 'ano' já mapeada); sem coluna ou sem ano, retorna tudo."""
+    if not ano or 'ano' not in df.columns:
+        return df
+    return df[pd.to_numeric(df['ano'], errors='coerce') == ano]
+
+
+def coluna(df: pd.DataFrame, nome: str, padrao: Any = None) -> pd.Series:
+    """Coluna do DataFrame ou uma série constante se o CSV não a tiver."""
+    if nome in df.columns:
+        return df[nome]
+    return pd.Series(padrao, index=df.index, dtype=object)
+
+
+def texto(serie: pd.Series) -> pd.Series:
+    """Série como texto, com vazio no lugar de nulos."""
+    return serie.fillna('').astype(str).str.strip()
+
+
+def limpar_valores_monetarios(serie: pd.Series) -> pd.Series:
+    """
+    Converte uma coluna de valores monetários para float (nulos e inválidos = 0)
+
+    Colunas já numéricas (read_csv com decimal=',') passam direto; colunas de
+    texto no formato brasileiro ('R$ 1.234,56') são convertidas de uma vez.
+    """
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype(float).fillna(0.0)
+
+    valores = (
+        texto(serie)
+        .str.replace('R$', '', regex=False)
+        .str.replace('.', '', regex=False)
+        .str.replace(',', '.', regex=False)
+        .str.strip()
+    )
+    return pd.to_numeric(valores, errors='coerce').fillna(0.0)
+
+
+def converter_ufs_para_sigla(serie: pd.Series) -> pd.Series:
+    """Converte nomes de estado para siglas de 2 caracteres (siglas passam direto)."""
+    ufs = texto(serie).str.upper()
+    siglas = ufs.map(MAPA_UFS)
+    return siglas.where(siglas.notna(), ufs.str[:2])
+
+
+def mapear_tipos_emenda(serie: pd.Series) -> pd.Series:
+    """Tipo de emenda do CSV -> sigla do modelo (EMD quando desconhecido)."""
+    return texto(serie).str.upper().map(MAPA_TIPOS_EMENDA).fillna('EMD')
+
+
+def extrair_locais_emenda(funcoes: pd.Series, padrao_vazio: Optional[str] = None) -> pd.Series:
+    """
+    Local da emenda a partir da função orçamentária
+
+    Args:
+        funcoes: Coluna de função
+        padrao_vazio: Valor para função vazia
+
+    Returns:
+        pd.Series: Área mapeada ou a própria função em maiúsculas
+    """
+    funcoes_texto = texto(funcoes)
+    minusculas = funcoes_texto.str.lower()
+    condicoes = [minusculas.str.contains(padrao, regex=True) for padrao, _ in LOCAIS_POR_FUNCAO]
+    locais = [local for _, local in LOCAIS_POR_FUNCAO]
+    resultado = np.select(condicoes, locais, default=funcoes_texto.str.upper().to_numpy(dtype=object))
+    resultado = pd.Series(resultado, index=funcoes.index, dtype=object)
+    return resultado.where(funcoes_texto != '', padrao_vazio)
+
+
+def extrair_naturezas_emenda(tipos: pd.Series) -> pd.Series:
+    """Natureza (Individual, Bancada, Comissão) a partir do tipo de emenda."""
+    maiusculas = texto(tipos).str.upper()
+    return pd.Series(
+        np.select(
+            [
+                maiusculas.str.contains('BANCADA', regex=False),
+                maiusculas.str.contains('INDIVIDUAL', regex=False),
+                maiusculas.str.contains('COMISSÃO|COMISSAO', regex=True),
+            ],
+            ['Bancada', 'Individual', 'Comissão'],
+            default='Individual'
+        ),
+        index=tipos.index,
+        dtype=object
+    )
+
+
+def numeros_inteiros(serie: pd.Series, padrao: int = 0) -> pd.Series:
+    """Coluna numérica como int (inválidos = padrao)."""
+    return pd.to_numeric(serie, errors='coerce').fillna(padrao).astype(int)
+
+
+def codigos_como_texto(serie: pd.Series) -> pd.Series:
+    """Códigos como texto sem o '.0' que o pandas adiciona em colunas float."""
+    numericos = pd.to_numeric(serie, errors='coerce')
+    inteiros = numericos.notna() & (numericos % 1 == 0)
+    resultado = texto(serie).where(~inteiros, numericos.fillna(0).astype('int64').astype(str))
+    return resultado.where(resultado != '', None)
+
+
+def montar_detalhes_emenda(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Colunas de DetalheEmenda (ementa, justificativa, texto completo) para todas as linhas
+
+    Args:
+        df: CSV com colunas já mapeadas (tipo_emenda, funcao, localidade...)
+
+    Returns:
+        pd.DataFrame: Uma linha de detalhe por linha de df (mesmo índice)
+    """
+    def campo(nome: str, padrao: str = 'N/A') -> pd.Series:
+        return coluna(df, nome).fillna(padrao).astype(str)
+
+    return pd.DataFrame({
+        'ementa': 'Emenda ' + campo('tipo_emenda', 'None') + ' para ' + campo('funcao', 'função não informada'),
+        'justificativa': 'Localidade do gasto: ' + campo('localidade'),
+        'texto_completo': (
+            'Função: ' + campo('funcao') + '\n'
+            + 'Subfunção: ' + campo('subfuncao') + '\n'
+            + 'Programa: ' + campo('programa') + '\n'
+            + 'Ação: ' + campo('acao') + '\n'
+            + 'Localidade: ' + campo('localidade') + '\n'
+            + 'Município: ' + campo('municipio') + '\n'
+            + 'UF: ' + campo('uf') + '\n'
+            + 'Valor Empenhado: ' + campo('valor_empenhado', '0') + '\n'
+            + 'Valor Liquidado: ' + campo('valor_liquidado', '0') + '\n'
+            + 'Valor Pago: ' + campo('valor_pago', '0')
+        ),
+        'pdf_url': None
+    }, index=df.index)
+
+
+def para_registros(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """DataFrame -> lista de dicts com None no lugar de NaN/NaT (pronta para o driver)."""
+    return df.astype(object).where(pd.notna(df), None).to_dict('records')
+
+
+def filtrar_codigos_existentes(
+    db: Session,
+    modelo_emenda,
+    codigos: pd.Series,
+    tamanho_lote: int = 5000
+) -> pd.Series:
+    """
+    Anti-join: marca os códigos que ainda não estão no banco
+
+    Args:
+        db: Sessão do banco
+        modelo_emenda: Classe EmendaParlamentar
+        codigos: Coluna de códigos (api_camara_id)
+        tamanho_lote: Códigos por consulta IN
+
+    Returns:
+        pd.Series[bool]: True para linhas cujo código é novo
+    """
+    unicos = codigos.dropna().unique().tolist()
+    existentes = set()
+    for inicio in range(0, len(unicos), tamanho_lote):
+        lote = unicos[inicio:inicio + tamanho_lote]
+        existentes.update(
+            codigo for (codigo,) in db.query(modelo_emenda.api_camara_id)
+            .filter(modelo_emenda.api_camara_id.in_(lote)).all()
+        )
+    return ~codigos.isin(existentes)
+
+
+def inserir_emendas_com_detalhes(
+    db: Session,
+    modelo_emenda,
+    modelo_detalhe,
+    emendas: List[Dict[str, Any]],
+    detalhes: List[Dict[str, Any]],
+    tamanho_lote: int = 1000
+) -> Dict[str, int]:
+    """
+    INSERT em lote das emendas (ON CONFLICT DO NOTHING) e dos respectivos detalhes
+
+    Não faz commit.
+
+    Args:
+        db: Sessão do banco
+        modelo_emenda: Classe EmendaParlamentar
+        modelo_detalhe: Classe DetalheEmenda
+        emendas: Linhas de emendas_parlamentares
+        detalhes: Linhas de detalhes_emendas, alinhadas por posição com `emendas`
+        tamanho_lote: Linhas por INSERT
+
+    Returns:
+        Dict: api_camara_id -> id das emendas efetivamente inseridas
+    """
+    ids_por_codigo: Dict[str, int] = {}
+
+    for inicio in range(0, len(emendas), tamanho_lote):
+        lote = emendas[inicio:inicio + tamanho_lote]
+        resultado = db.execute(
+            pg_insert(modelo_emenda.__table__).values(lote)
+            .on_conflict_do_nothing(index_elements=['api_camara_id'])
+            .returning(modelo_emenda.__table__.c.id, modelo_emenda.__table__.c.api_camara_id)
+        )
+        ids_lote = {codigo: emenda_id for emenda_id, codigo in resultado}
+        ids_por_codigo.update(ids_lote)
+
+        linhas_detalhe = [
+            {**detalhe, 'emenda_id': ids_lote[emenda['api_camara_id']]}
+            for emenda, detalhe in zip(lote, detalhes[inicio:inicio + tamanho_lote])
+            if emenda['api_camara_id'] in ids_lote
+        ]
+        if linhas_detalhe:
+            db.execute(pg_insert(modelo_detalhe.__table__).values(linhas_detalhe))
+
+    return ids_por_codigo
+
+
+def resumir_valores(emendas: pd.DataFrame) -> Tuple[float, float, float]:
+    """Somas de valor empenhado, liquidado e pago de um conjunto de emendas."""
+    return (
+        float(emendas['valor_empenhado'].sum()),
+        float(emendas['valor_liquidado'].sum()),
+        float(emendas['valor_pago'].sum())
+    )
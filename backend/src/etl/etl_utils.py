@@ -9,8 +9,10 @@ Data: Outubro/2025
 
 import requests
 import time
-from datetime import datetime
-from typing import Optional, Dict, List, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Any, Union, Iterator
+from urllib.parse import urlparse, parse_qs
 from sqlalchemy.orm import Session
 from abc import ABC, abstractmethod
 import hashlib
@@ -31,9 +33,13 @@ except ImportError:
 
 try:
     from .config import get_config
+    from .http_client import TokenBucket, get_token_bucket, calcular_backoff, STATUS_RETENTAVEIS
+    from .indice_deduplicacao import IndiceDeduplicacao
 except ImportError:
     # Fallback para execução direta
     from etl.config import get_config
+    from etl.http_client import TokenBucket, get_token_bucket, calcular_backoff, STATUS_RETENTAVEIS
+    from etl.indice_deduplicacao import IndiceDeduplicacao
 
 
 class ETLBase(ABC):
@@ -77,6 +83,11 @@ class ETLBase(ABC):
             'User-Agent': self.api_config['user_agent'],
             'Accept': 'application/json'
         })
+        # Pool de conexões dimensionado para uso a partir de várias threads
+        pool_size = self.api_config.get('max_concorrencia', 8)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
         return session
     
     def _setup_cache(self) -> Optional[CacheManager]:
@@ -93,15 +104,18 @@ class ETLBase(ABC):
             print(f"⚠️ Cache não disponível: {e}")
             return None
     
-    def make_request(self, url: str, params: Optional[Dict] = None, use_cache: bool = True, timeout: int = None) -> Optional[Dict]:
+    def make_request(self, url: str, params: Optional[Dict] = None, use_cache: bool = True, timeout: int = None,
+                     limitador: Optional[TokenBucket] = None, cache_ttl: Optional[timedelta] = None) -> Optional[Dict]:
         """
-        Método unificado para requisições HTTP com cache e rate limiting
+        Método unificado para requisições HTTP com cache, rate limiting global e retry
         
         Args:
             url: URL da API
             params: Parâmetros da requisição
             use_cache: Se deve usar cache
             timeout: Timeout personalizado
+            limitador: Token bucket da API de destino (padrão: API da Câmara)
+            cache_ttl: Validade da resposta no cache (padrão: 2 horas)
             
         Returns:
             Dict: Resposta da API ou None se erro
@@ -114,33 +128,53 @@ class ETLBase(ABC):
                 print(f"      📦 Cache hit: {url}")
                 return cached_data
         
-        try:
-            # Rate limiting
-            time.sleep(self.api_config['rate_limit_delay'])
-            
-            # Fazer requisição
-            response = self.session.get(
-                url, 
-                params=params, 
-                timeout=timeout or self.api_config['timeout']
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Salvar no cache
-            if use_cache and self.cache and data:
-                from datetime import timedelta
-                self.cache.set(cache_key, data, ttl=timedelta(hours=2))
+        timeout = timeout or self.api_config['timeout']
+        max_retries = self.api_config.get('max_retries', 3)
+        
+        for tentativa in range(max_retries):
+            # Rate limiting global (token bucket compartilhado entre coletores)
+            (limitador or get_token_bucket()).adquirir()
+            retry_after = None
             
-            return data
+            try:
+                response = self.session.get(url, params=params, timeout=timeout)
+                
+                if response.status_code in STATUS_RETENTAVEIS:
+                    retry_after = response.headers.get('Retry-After')
+                    erro = f"HTTP {response.status_code}"
+                else:
+                    response.raise_for_status()
+                    data = response.json()
+                    
+                    # Salvar no cache
+                    if use_cache and self.cache and data:
+                        self.cache.set(cache_key, data, ttl=cache_ttl or timedelta(hours=2))
+                    
+                    return data
+                    
+            except requests.exceptions.HTTPError as e:
+                # 4xx: não adianta tentar de novo
+                print(f"❌ Erro na requisição {url}: {e}")
+                return None
+            except requests.exceptions.RequestException as e:
+                erro = str(e)
+            except Exception as e:
+                print(f"❌ Erro ao processar resposta: {e}")
+                return None
             
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Erro na requisição {url}: {e}")
-            return None
-        except Exception as e:
-            print(f"❌ Erro ao processar resposta: {e}")
-            return None
+            if tentativa < max_retries - 1:
+                espera = calcular_backoff(
+                    tentativa,
+                    self.api_config.get('backoff_base', 0.5),
+                    self.api_config.get('backoff_max', 10.0),
+                    retry_after
+                )
+                print(f"      ⚠️ Tentativa {tentativa + 1} falhou ({erro}), nova tentativa em {espera:.1f}s")
+                time.sleep(espera)
+            else:
+                print(f"❌ Erro na requisição {url} após {max_retries} tentativas: {erro}")
+        
+        return None
     
     def paginated_request(self, endpoint: str, params: Optional[Dict] = None, max_pages: int = None, max_items: int = None) -> List[Dict]:
         """
@@ -155,49 +189,127 @@ class ETLBase(ABC):
         Returns:
             List[Dict]: Lista de todos os itens retornados
         """
-        all_items = []
-        page = 1
-        pages_processed = 0
+        return list(self.iter_paginated_request(endpoint, params, max_pages, max_items))
+    
+    def iter_paginated_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        max_pages: int = None,
+        max_items: int = None,
+        prefetch: Optional[bool] = None
+    ) -> Iterator[Dict]:
+        """
+        Itera os itens de um endpoint paginado, página a página, em ordem
+        
+        Quando a primeira resposta traz o link 'last', as páginas restantes já
+        são conhecidas e são buscadas em paralelo (respeitando o token bucket
+        global), mas entregues na ordem original. Sem 'last', segue 'next'
+        sequencialmente.
         
-        while True:
-            # Adicionar página aos parâmetros
-            pag_params = params.copy() if params else {}
-            pag_params['pagina'] = page
-            pag_params['itens'] = pag_params.get('itens', 100)
-            
-            print(f"      📄 Página {page}...")
-            data = self.make_request(endpoint, pag_params, use_cache=False)
-            
-            if not data:
-                break
-            
-            items = data.get('dados', [])
-            if not items:
-                print(f"      📄 Página {page} vazia")
-                break
+        Args:
+            endpoint: Endpoint da API
+            params: Parâmetros da requisição
+            max_pages: Número máximo de páginas
+            max_items: Número máximo de itens
+            prefetch: Buscar páginas em paralelo (padrão: PERFORMANCE_CONFIG)
             
-            all_items.extend(items)
-            pages_processed += 1
+        Yields:
+            Dict: Cada item de 'dados'
+        """
+        if prefetch is None:
+            prefetch = get_config('performance', 'prefetch_paginas')
+        
+        base_params = params.copy() if params else {}
+        base_params['itens'] = base_params.get('itens', 100)
+        
+        def _buscar_pagina(pagina: int) -> Optional[Dict]:
+            pag_params = dict(base_params, pagina=pagina)
+            return self.make_request(endpoint, pag_params, use_cache=False)
+        
+        print(f"      📄 Página 1...")
+        data = _buscar_pagina(1)
+        if not data or not data.get('dados'):
+            return
+        
+        total_itens = 0
+        
+        def _emitir(pagina: int, items: List[Dict]):
+            nonlocal total_itens
+            restante = max_items - total_itens if max_items else len(items)
+            items = items[:restante]
+            total_itens += len(items)
+            print(f"      📊 Página {pagina}: +{len(items)} itens (total: {total_itens})")
+            return items
+        
+        yield from _emitir(1, data['dados'])
+        
+        links = {link['rel']: link['href'] for link in data.get('links', [])}
+        ultima_pagina = self._extrair_numero_pagina(links.get('last'))
+        
+        if prefetch and ultima_pagina and ultima_pagina > 1:
+            if max_pages:
+                ultima_pagina = min(ultima_pagina, max_pages)
+            if max_items:
+                ultima_pagina = min(ultima_pagina, -(-max_items // base_params['itens']))
             
-            print(f"      📊 Página {page}: +{len(items)} itens (total: {len(all_items)})")
+            paginas = list(range(2, ultima_pagina + 1))
+            max_workers = self.api_config.get('max_concorrencia', 8)
+            print(f"      🚀 Prefetch de {len(paginas)} páginas ({max_workers} em paralelo)")
             
-            # Verificar limites
-            if max_pages and pages_processed >= max_pages:
+            # Janelas de max_workers páginas: no máximo uma janela em memória
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for inicio in range(0, len(paginas), max_workers):
+                    janela = paginas[inicio:inicio + max_workers]
+                    for pagina, pagina_data in zip(janela, executor.map(_buscar_pagina, janela)):
+                        items = (pagina_data or {}).get('dados', [])
+                        if not items:
+                            print(f"      📄 Página {pagina} vazia")
+                            return
+                        yield from _emitir(pagina, items)
+                        if max_items and total_itens >= max_items:
+                            print(f"      ⏹️ Limite de itens ({max_items}) atingido")
+                            return
+            return
+        
+        # Modo sequencial: seguir links.next
+        page = 1
+        while links.get('next'):
+            if max_pages and page >= max_pages:
                 print(f"      ⏹️ Limite de páginas ({max_pages}) atingido")
                 break
-            
-            if max_items and len(all_items) >= max_items:
+            if max_items and total_itens >= max_items:
                 print(f"      ⏹️ Limite de itens ({max_items}) atingido")
                 break
             
-            # Verificar próxima página
-            links = {link['rel']: link['href'] for link in data.get('links', [])}
-            if not links.get('next'):
+            page += 1
+            print(f"      📄 Página {page}...")
+            data = _buscar_pagina(page)
+            if not data or not data.get('dados'):
+                print(f"      📄 Página {page} vazia")
                 break
             
-            page += 1
+            yield from _emitir(page, data['dados'])
+            links = {link['rel']: link['href'] for link in data.get('links', [])}
+    
+    @staticmethod
+    def _extrair_numero_pagina(href: Optional[str]) -> Optional[int]:
+        """
+        Extrai o parâmetro 'pagina' de um link de paginação da API
         
-        return all_items
+        Args:
+            href: URL do link (ex.: rel='last')
+            
+        Returns:
+            int: Número da página ou None
+        """
+        if not href:
+            return None
+        try:
+            valores = parse_qs(urlparse(href).query).get('pagina')
+            return int(valores[0]) if valores else None
+        except (ValueError, TypeError):
+            return None
 
 
 class DateParser:
@@ -310,11 +422,16 @@ class DatabaseManager:
         """
         self.db = db
         self.batch_size = batch_size
+        # (modelo, campo) -> valores existentes, carregados na primeira verificação
+        self._indices: Dict[tuple, IndiceDeduplicacao] = {}
     
     def check_duplicate(self, model_class, unique_field: str, value: Any) -> bool:
         """
         Verifica se registro já existe
         
+        Os valores do campo são carregados uma vez em um índice em memória;
+        o banco só é consultado para confirmar acertos de um filtro de Bloom.
+        
         Args:
             model_class: Classe do modelo
             unique_field: Campo único
@@ -324,6 +441,19 @@ class DatabaseManager:
             bool: True se existe, False caso contrário
         """
         try:
+            indice = self._indices.get((model_class, unique_field))
+            if indice is None:
+                coluna = getattr(model_class, unique_field)
+                indice = IndiceDeduplicacao(
+                    lambda particao: (valor for (valor,) in self.db.query(coluna).filter(coluna.isnot(None)))
+                )
+                self._indices[(model_class, unique_field)] = indice
+            
+            if not indice.contem(value):
+                return False
+            if indice.exato:
+                return True
+            
             filter_kwargs = {unique_field: value}
             existing = self.db.query(model_class).filter_by(**filter_kwargs).first()
             return existing is not None
@@ -331,6 +461,19 @@ class DatabaseManager:
             print(f"❌ Erro ao verificar duplicata: {e}")
             return False
     
+    def register_key(self, model_class, unique_field: str, value: Any):
+        """
+        Registra no índice de check_duplicate um valor inserido fora de bulk_save
+        
+        Args:
+            model_class: Classe do modelo
+            unique_field: Campo único
+            value: Valor inserido
+        """
+        indice = self._indices.get((model_class, unique_field))
+        if indice is not None:
+            indice.adicionar(value)
+    
     def bulk_save(self, objects: List[Any]) -> int:
         """
         Salva objetos em lote com commit automático
@@ -350,6 +493,9 @@ class DatabaseManager:
             for obj in objects:
                 self.db.add(obj)
                 saved_count += 1
+                for (model_class, unique_field), indice in self._indices.items():
+                    if isinstance(obj, model_class):
+                        indice.adicionar(getattr(obj, unique_field, None))
                 
                 # Commit em lote
                 if saved_count % self.batch_size == 0:
@@ -363,6 +509,8 @@ class DatabaseManager:
         except Exception as e:
             print(f"❌ Erro ao salvar em lote: {e}")
             self.db.rollback()
+            # Índices podem conter chaves que não foram gravadas
+            self._indices.clear()
             return 0
         
         return saved_count
@@ -580,7 +728,9 @@ class APIRateLimiter:
         self.last_request = None
     
     def wait_if_needed(self):
-        """Aguarda se necessário para respeitar rate limit"""
+        """Aguarda se necessário para respeitar rate limit (local e global)"""
+        get_token_bucket().adquirir()
+        
         if self.last_request:
             elapsed = time.time() - self.last_request
             if elapsed < self.delay:
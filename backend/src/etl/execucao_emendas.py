@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Histórico mensal da execução financeira das emendas
+
+A cada carga os valores empenhado, liquidado e pago vinham sobrescritos em
+emendas_parlamentares, sem histórico. Este carregador grava em
+execucao_emendas um snapshot por emenda e mês, em lote e só para as emendas
+cujos valores mudaram desde o último snapshot:
+
+- um único INSERT ... SELECT por lote, com os valores recebidos como arrays
+  (unnest) e comparados ao snapshot mais recente de cada emenda
+- nova carga no mesmo mês atualiza o snapshot do mês (idempotente)
+- a tabela é particionada por ano_execucao; a partição do ano é criada
+  sob demanda e as análises de um período leem só as partições dele
+
+emendas_parlamentares continua com a posição atual (atualizada no mesmo lote).
+
+Autor: Kritikos Team
+"""
+
+import logging
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import text
+
+try:
+    from .config import get_config
+except ImportError:
+    from config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Serializa a criação da partição do ano entre processos (lock liberado no commit)
+SQL_LOCK_PARTICAO = text("SELECT pg_advisory_xact_lock(hashtext('execucao_emendas'), :ano)")
+
+SQL_VALORES_LOTE = """
+    SELECT e.id AS emenda_id,
+           v.empenhado, v.liquidado, v.pago,
+           NULLIF(GREATEST(COALESCE(e.valor_emenda, 0), v.empenhado, v.liquidado, v.pago), 0) AS base
+    FROM unnest(CAST(:codigos AS text[]), CAST(:empenhados AS numeric[]),
+                CAST(:liquidados AS numeric[]), CAST(:pagos AS numeric[]))
+         AS v(codigo, empenhado, liquidado, pago)
+    JOIN emendas_parlamentares e ON e.api_camara_id = v.codigo
+"""
+
+SQL_REGISTRAR_SNAPSHOTS = text(f"""
+    WITH entrada AS ({SQL_VALORES_LOTE}),
+    ultimo AS (
+        -- Snapshot mais recente até o mês de referência (partições futuras podadas)
+        SELECT DISTINCT ON (x.emenda_id)
+               x.emenda_id, x.valor_empenhado_acumulado, x.valor_liquidado_acumulado, x.valor_pago_acumulado
+        FROM execucao_emendas x
+        WHERE x.emenda_id IN (SELECT emenda_id FROM entrada)
+          AND x.ano_execucao <= :ano
+          AND (x.ano_execucao, x.mes_execucao) <= (:ano, :mes)
+        ORDER BY x.emenda_id, x.ano_execucao DESC, x.mes_execucao DESC
+    )
+    INSERT INTO execucao_emendas (
+        emenda_id, ano_execucao, mes_execucao, data_referencia,
+        valor_empenhado_acumulado, valor_liquidado_acumulado, valor_pago_acumulado,
+        percentual_empenhado, percentual_liquidado, percentual_pago, status_execucao
+    )
+    SELECT n.emenda_id, :ano, :mes, :data_referencia,
+           n.empenhado, n.liquidado, n.pago,
+           COALESCE(LEAST(n.empenhado / n.base * 100, 100), 0),
+           COALESCE(LEAST(n.liquidado / n.base * 100, 100), 0),
+           COALESCE(LEAST(n.pago / n.base * 100, 100), 0),
+           CASE
+               WHEN n.base IS NOT NULL AND n.pago >= n.base THEN 'Concluída'
+               WHEN n.empenhado > 0 THEN 'Em execução'
+               ELSE 'Não iniciada'
+           END
+    FROM entrada n
+    LEFT JOIN ultimo u ON u.emenda_id = n.emenda_id
+    WHERE u.emenda_id IS NULL
+       OR (n.empenhado, n.liquidado, n.pago)
+          IS DISTINCT FROM (u.valor_empenhado_acumulado, u.valor_liquidado_acumulado, u.valor_pago_acumulado)
+    ON CONFLICT (emenda_id, ano_execucao, mes_execucao) DO UPDATE SET
+        valor_empenhado_acumulado = EXCLUDED.valor_empenhado_acumulado,
+        valor_liquidado_acumulado = EXCLUDED.valor_liquidado_acumulado,
+        valor_pago_acumulado = EXCLUDED.valor_pago_acumulado,
+        percentual_empenhado = EXCLUDED.percentual_empenhado,
+        percentual_liquidado = EXCLUDED.percentual_liquidado,
+        percentual_pago = EXCLUDED.percentual_pago,
+        status_execucao = EXCLUDED.status_execucao,
+        updated_at = now()
+""")
+
+SQL_ATUALIZAR_POSICAO = text(f"""
+    UPDATE emendas_parlamentares e
+    SET valor_empenhado = n.empenhado,
+        valor_liquidado = n.liquidado,
+        valor_pago = n.pago,
+        updated_at = now()
+    FROM ({SQL_VALORES_LOTE}) n
+    WHERE e.id = n.emenda_id
+      AND (e.valor_empenhado, e.valor_liquidado, e.valor_pago) IS DISTINCT FROM (n.empenhado, n.liquidado, n.pago)
+""")
+
+
+class CarregadorExecucaoEmendas:
+    """
+    Grava snapshots mensais de execução em lote, só para emendas alteradas
+
+    Uso:
+        carregador = CarregadorExecucaoEmendas(db)
+        gravados = carregador.registrar([
+            {'api_camara_id': '202512345678', 'valor_empenhado': 10.0,
+             'valor_liquidado': 5.0, 'valor_pago': 0.0},
+        ])
+    """
+
+    def __init__(self, db, data_referencia: Optional[date] = None, tamanho_lote: Optional[int] = None):
+        """
+        Args:
+            db: Sessão do banco
+            data_referencia: Dia da posição informada pela fonte (padrão: hoje)
+            tamanho_lote: Emendas por INSERT (padrão: PERFORMANCE_CONFIG)
+        """
+        self.db = db
+        self.data_referencia = data_referencia or date.today()
+        self.tamanho_lote = tamanho_lote or get_config('performance', 'tamanho_lote_upsert') or 1000
+        self._particoes: Set[int] = set()
+
+    @property
+    def ano(self) -> int:
+        return self.data_referencia.year
+
+    @property
+    def mes(self) -> int:
+        return self.data_referencia.month
+
+    def garantir_particao(self, ano: int):
+        """Cria (uma vez por execução) a partição execucao_emendas_<ano>."""
+        if ano in self._particoes:
+            return
+        ano = int(ano)
+        try:
+            self.db.execute(SQL_LOCK_PARTICAO, {'ano': ano})
+            self.db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS execucao_emendas_{ano} PARTITION OF execucao_emendas "
+                f"FOR VALUES FROM ({ano}) TO ({ano + 1})"
+            ))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self._particoes.add(ano)
+
+    def registrar(self, emendas: Iterable[Dict[str, Any]]) -> int:
+        """
+        Grava o snapshot do mês de referência das emendas cujos valores mudaram
+
+        Emendas ainda não carregadas em emendas_parlamentares são ignoradas.
+        A posição atual em emendas_parlamentares é atualizada na mesma transação.
+
+        Args:
+            emendas: Dicts com api_camara_id, valor_empenhado, valor_liquidado e valor_pago
+
+        Returns:
+            int: Quantidade de snapshots gravados (novos ou atualizados no mês)
+        """
+        # Um valor por emenda no lote (o último informado)
+        lote: List[Dict[str, Any]] = list({
+            str(e['api_camara_id']): e for e in emendas if e.get('api_camara_id')
+        }.values())
+        if not lote:
+            return 0
+
+        self.garantir_particao(self.ano)
+
+        gravados = 0
+        try:
+            for inicio in range(0, len(lote), self.tamanho_lote):
+                parametros = self._parametros(lote[inicio:inicio + self.tamanho_lote])
+                gravados += self.db.execute(SQL_REGISTRAR_SNAPSHOTS, parametros).rowcount
+                self.db.execute(SQL_ATUALIZAR_POSICAO, parametros)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        if gravados:
+            logger.info(f"   📈 {gravados} snapshots de execução gravados ({self.mes:02d}/{self.ano})")
+        return gravados
+
+    def _parametros(self, lote: List[Dict[str, Any]]) -> Dict[str, Any]:
+        def valores(campo: str) -> List[float]:
+            return [float(e.get(campo) or 0) for e in lote]
+
+        return {
+            'codigos': [str(e['api_camara_id']) for e in lote],
+            'empenhados': valores('valor_empenhado'),
+            'liquidados': valores('valor_liquidado'),
+            'pagos': valores('valor_pago'),
+            'ano': self.ano,
+            'mes': self.mes,
+            'data_referencia': self.data_referencia
+        }
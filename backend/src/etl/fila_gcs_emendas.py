@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Fila de upload assíncrono de emendas para o GCS
+
+Os coletores de emendas enviavam um objeto JSON por emenda, de forma síncrona,
+dentro do laço de carga. Esta fila tira o upload do caminho crítico:
+
+- enviar() apenas agenda o upload em um pool de threads (com limite de
+  pendências, para não acumular dados em memória)
+- no modo 'shard', as emendas são agrupadas por ano em arquivos NDJSON.gz
+  com até emendas_por_shard linhas, em vez de um objeto por emenda
+- gravar_urls() grava gcs_url dos uploads concluídos em UPDATEs em lote
+
+Autor: Kritikos Team
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+from sqlalchemy import text
+
+try:
+    from .config import get_config
+except ImportError:
+    from config import get_config
+
+logger = logging.getLogger(__name__)
+
+SQL_ATUALIZAR_GCS_URL = text("UPDATE emendas_parlamentares SET gcs_url = :gcs_url WHERE id = :id")
+
+
+class FilaUploadEmendasGCS:
+    """
+    Upload em segundo plano dos dados completos das emendas
+
+    Uso:
+        fila = FilaUploadEmendasGCS(get_gcs_manager())
+        fila.enviar(emenda_id, ano, api_id, dados_completos)
+        fila.gravar_urls(db)         # periodicamente, entre lotes
+        fila.finalizar(db)           # ao fim da coleta
+    """
+
+    def __init__(self, gcs_manager, modo: Optional[str] = None, max_workers: Optional[int] = None,
+                 emendas_por_shard: Optional[int] = None, tamanho_lote_urls: Optional[int] = None):
+        """
+        Args:
+            gcs_manager: GCSManager já inicializado
+            modo: 'objeto' (um JSON por emenda) ou 'shard' (NDJSON.gz por ano)
+            max_workers: Threads de upload
+            emendas_por_shard: Linhas por arquivo no modo 'shard'
+            tamanho_lote_urls: Linhas por UPDATE de gcs_url
+        """
+        config = get_config('gcs')
+        self.gcs = gcs_manager
+        self.modo = modo or config.get('modo_upload_emendas', 'objeto')
+        self.max_workers = max_workers or config.get('upload_workers', 8)
+        self.emendas_por_shard = emendas_por_shard or config.get('emendas_por_shard', 5000)
+        self.tamanho_lote_urls = tamanho_lote_urls or config.get('tamanho_lote_urls', 500)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='upload-emendas-gcs')
+        # Limita uploads pendentes: enviar() bloqueia se os workers ficarem para trás
+        self._vagas = threading.BoundedSemaphore(self.max_workers * 4)
+        # (futuro, emendas no upload): quantidade contada em falhas se o futuro levantar
+        self._futuros: List[Tuple[Future, int]] = []
+        self._shards: Dict[int, List[Tuple[int, Dict[str, Any]]]] = {}
+        self._urls_pendentes: List[Dict[str, Any]] = []
+        self._prefixo_shard = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self._numero_shard = 0
+        self._lock = threading.Lock()
+
+        self.enviadas = 0
+        self.falhas = 0
+
+    def enviar(self, emenda_id: int, ano: int, api_id: str, dados_completos: Dict[str, Any]):
+        """
+        Agenda o upload de uma emenda (não bloqueia a carga)
+
+        Args:
+            emenda_id: ID interno da emenda (para o UPDATE de gcs_url)
+            ano: Ano da emenda
+            api_id: Código da emenda na fonte
+            dados_completos: Documento JSON da emenda
+        """
+        if self.modo == 'shard':
+            buffer = self._shards.setdefault(ano, [])
+            buffer.append((emenda_id, dados_completos))
+            if len(buffer) >= self.emendas_por_shard:
+                self._fechar_shard(ano)
+        else:
+            self._agendar(1, self._upload_objeto, emenda_id, ano, api_id, dados_completos)
+
+    def gravar_urls(self, db, aguardar: bool = False) -> int:
+        """
+        Grava gcs_url dos uploads já concluídos em UPDATEs em lote
+
+        Args:
+            db: Sessão do banco
+            aguardar: Fecha os shards abertos e espera todos os uploads
+
+        Returns:
+            int: Quantidade de emendas com gcs_url gravado nesta chamada
+        """
+        if aguardar:
+            for ano in list(self._shards):
+                self._fechar_shard(ano)
+            wait([futuro for futuro, _ in self._futuros])
+
+        pendentes = []
+        for futuro, quantidade in self._futuros:
+            if not futuro.done():
+                pendentes.append((futuro, quantidade))
+                continue
+            try:
+                self._urls_pendentes.extend(futuro.result())
+            except Exception as e:
+                logger.error(f"❌ Erro no upload GCS: {e}")
+                with self._lock:
+                    self.falhas += quantidade
+        self._futuros = pendentes
+
+        gravadas = 0
+        while self._urls_pendentes and (aguardar or len(self._urls_pendentes) >= self.tamanho_lote_urls):
+            lote = self._urls_pendentes[:self.tamanho_lote_urls]
+            self._urls_pendentes = self._urls_pendentes[self.tamanho_lote_urls:]
+            db.execute(SQL_ATUALIZAR_GCS_URL, lote)
+            gravadas += len(lote)
+
+        if gravadas:
+            db.commit()
+            self.enviadas += gravadas
+        return gravadas
+
+    def finalizar(self, db) -> int:
+        """
+        Conclui todos os uploads, grava as URLs restantes e encerra o pool
+
+        Returns:
+            int: Quantidade de emendas com gcs_url gravado nesta chamada
+        """
+        try:
+            gravadas = self.gravar_urls(db, aguardar=True)
+        finally:
+            self._executor.shutdown(wait=True)
+
+        if self.falhas:
+            logger.warning(f"⚠️ {self.falhas} emendas sem upload no GCS")
+        logger.info(f"📁 Upload GCS concluído: {self.enviadas} emendas")
+        return gravadas
+
+    def _agendar(self, quantidade: int, funcao, *args):
+        """Submete ao pool (upload de `quantidade` emendas) respeitando o limite de pendências."""
+        self._vagas.acquire()
+        futuro = self._executor.submit(funcao, *args)
+        futuro.add_done_callback(lambda _: self._vagas.release())
+        self._futuros.append((futuro, quantidade))
+
+    def _fechar_shard(self, ano: int):
+        """Agenda o upload do buffer do ano como um arquivo NDJSON.gz."""
+        itens = self._shards.pop(ano, [])
+        if not itens:
+            return
+        self._numero_shard += 1
+        nome_shard = f"emendas_{ano}_{self._prefixo_shard}_{self._numero_shard:05d}"
+        self._agendar(len(itens), self._upload_shard, ano, nome_shard, itens)
+
+    def _upload_objeto(self, emenda_id: int, ano: int, api_id: str,
+                       dados_completos: Dict[str, Any]) -> List[Dict[str, Any]]:
+        gcs_url = self.gcs.upload_emenda(dados_completos, ano, api_id)
+        if not gcs_url:
+            with self._lock:
+                self.falhas += 1
+            return []
+        return [{'id': emenda_id, 'gcs_url': gcs_url}]
+
+    def _upload_shard(self, ano: int, nome_shard: str,
+                      itens: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        gcs_url = self.gcs.upload_emendas_ndjson([dados for _, dados in itens], ano, nome_shard)
+        if not gcs_url:
+            with self._lock:
+                self.falhas += len(itens)
+            return []
+        return [{'id': emenda_id, 'gcs_url': gcs_url} for emenda_id, _ in itens]
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Worker da fila de textos completos de proposições
+
+A carga de metadados apenas enfileira jobs em fila_textos_proposicoes. Este
+módulo consome a fila de forma concorrente, baixando o inteiro teor, salvando
+o texto no GCS e preenchendo proposicoes.gcs_url, fora da transação da carga.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Iterable, Optional
+
+from sqlalchemy import text
+
+from models.db_utils import get_db_session
+from utils.texto_utils import TextoProposicaoUtils
+from utils.gcs_utils import get_gcs_manager
+from etl.config import get_coleta_config
+
+logger = logging.getLogger(__name__)
+
+
+def enfileirar_textos_proposicoes(session, proposicao_ids: Iterable[int]) -> int:
+    """
+    Enfileira jobs de texto completo (ignora proposições já enfileiradas).
+
+    Não faz commit: o job entra na mesma transação dos metadados.
+
+    Args:
+        session: Sessão do banco
+        proposicao_ids: IDs internos das proposições
+
+    Returns:
+        Quantidade de IDs enviados para a fila
+    """
+    linhas = [{'proposicao_id': pid} for pid in proposicao_ids]
+    if not linhas:
+        return 0
+
+    session.execute(
+        text("""
+            INSERT INTO fila_textos_proposicoes (proposicao_id, status, tentativas)
+            VALUES (:proposicao_id, 'pendente', 0)
+            ON CONFLICT (proposicao_id) DO NOTHING
+        """),
+        linhas
+    )
+    return len(linhas)
+
+
+class ProcessadorFilaTextos:
+    """
+    Consome a fila persistente de textos com um pool de threads.
+
+    Os jobs são reivindicados com FOR UPDATE SKIP LOCKED, então vários
+    processos podem consumir a mesma fila sem processar o mesmo job duas vezes.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_tentativas: Optional[int] = None):
+        config = get_coleta_config('proposicoes')
+        self.max_workers = max_workers or config.get('workers_texto', 4)
+        self.max_tentativas = max_tentativas or config.get('max_tentativas_texto', 3)
+        self.timeout_processando_min = config.get('timeout_job_texto_min', 30)
+
+        self.gcs_manager = get_gcs_manager()
+        self.gcs_disponivel = self.gcs_manager is not None and self.gcs_manager.is_available()
+        
+        # Uma instância de TextoProposicaoUtils (e sua requests.Session) por thread
+        self._local = threading.local()
+
+    def _texto_utils(self) -> TextoProposicaoUtils:
+        """Utilitário de texto exclusivo da thread atual."""
+        if not hasattr(self._local, 'texto_utils'):
+            self._local.texto_utils = TextoProposicaoUtils()
+        return self._local.texto_utils
+
+    def _reivindicar_jobs(self, limite: int) -> List[Dict[str, Any]]:
+        """Marca até `limite` jobs pendentes como 'processando' e retorna seus dados."""
+        session = get_db_session()
+        try:
+            jobs = session.execute(text("""
+                UPDATE fila_textos_proposicoes f
+                SET status = 'processando', tentativas = f.tentativas + 1, updated_at = now()
+                FROM proposicoes p
+                WHERE f.id IN (
+                    SELECT id FROM fila_textos_proposicoes
+                    WHERE status = 'pendente'
+                       OR (status = 'erro' AND tentativas < :max_tentativas)
+                    ORDER BY id
+                    LIMIT :limite
+                    FOR UPDATE SKIP LOCKED
+                )
+                AND p.id = f.proposicao_id
+                RETURNING f.id, f.proposicao_id, p.api_camara_id, p.tipo, p.ano, p.link_inteiro_teor
+            """), {'limite': limite, 'max_tentativas': self.max_tentativas}).mappings().all()
+            session.commit()
+            return [dict(job) for job in jobs]
+        except Exception as e:
+            logger.error(f"❌ Erro ao reivindicar jobs de texto: {e}")
+            session.rollback()
+            return []
+        finally:
+            session.close()
+
+    def _liberar_jobs_travados(self):
+        """
+        Marca como 'erro' jobs 'processando' abandonados (ex.: processo interrompido).
+
+        A tentativa já foi contada ao reivindicar o job: como 'erro', ele volta
+        à fila só enquanto tentativas < max_tentativas, de modo que um PDF que
+        derruba o worker não é reprocessado para sempre.
+        """
+        session = get_db_session()
+        try:
+            resultado = session.execute(text("""
+                UPDATE fila_textos_proposicoes
+                SET status = 'erro',
+                    ultimo_erro = 'Processamento interrompido (job travado)',
+                    updated_at = now()
+                WHERE status = 'processando'
+                  AND updated_at < now() - make_interval(mins => :minutos)
+                RETURNING tentativas
+            """), {'minutos': self.timeout_processando_min}).fetchall()
+            session.commit()
+            if resultado:
+                esgotados = sum(1 for (tentativas,) in resultado if tentativas >= self.max_tentativas)
+                logger.info(
+                    f"♻️ {len(resultado) - esgotados} jobs de texto travados devolvidos à fila, "
+                    f"{esgotados} descartados após {self.max_tentativas} tentativas"
+                )
+        except Exception as e:
+            logger.error(f"❌ Erro ao liberar jobs travados: {e}")
+            session.rollback()
+        finally:
+            session.close()
+
+    def _processar_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Baixa o inteiro teor de um job e salva no GCS.
+
+        Returns:
+            Dicionário com id do job, status final, gcs_url e erro
+        """
+        api_id = job['api_camara_id']
+        try:
+            if not job.get('link_inteiro_teor'):
+                return {'id': job['id'], 'status': 'concluido', 'gcs_url': None, 'erro': 'Sem URI de inteiro teor'}
+
+            texto_completo = self._texto_utils().obter_texto_completo(job['link_inteiro_teor'], str(api_id))
+            if not texto_completo:
+                return {'id': job['id'], 'status': 'erro', 'gcs_url': None, 'erro': 'Texto não obtido'}
+
+            tipo = job['tipo']
+            blob_path = f"proposicoes/{job['ano']}/{tipo}/texto-completo/{tipo}-{api_id}-texto-completo.txt"
+            if not self.gcs_manager.upload_text(texto_completo, blob_path, compress=True):
+                return {'id': job['id'], 'status': 'erro', 'gcs_url': None, 'erro': 'Falha no upload GCS'}
+
+            gcs_url = f"https://storage.googleapis.com/{self.gcs_manager.bucket_name}/{blob_path}"
+            return {'id': job['id'], 'status': 'concluido', 'gcs_url': gcs_url, 'erro': None}
+
+        except Exception as e:
+            return {'id': job['id'], 'status': 'erro', 'gcs_url': None, 'erro': str(e)[:1000]}
+
+    def _registrar_resultados(self, jobs: List[Dict[str, Any]], resultados: List[Dict[str, Any]]):
+        """Grava status dos jobs e gcs_url das proposições em uma transação."""
+        proposicao_por_job = {job['id']: job['proposicao_id'] for job in jobs}
+        session = get_db_session()
+        try:
+            session.execute(
+                text("""
+                    UPDATE fila_textos_proposicoes
+                    SET status = :status, ultimo_erro = :erro, updated_at = now()
+                    WHERE id = :id
+                """),
+                [{'id': r['id'], 'status': r['status'], 'erro': r['erro']} for r in resultados]
+            )
+            urls = [
+                {'id': proposicao_por_job[r['id']], 'gcs_url': r['gcs_url']}
+                for r in resultados if r['gcs_url']
+            ]
+            if urls:
+                session.execute(
+                    text("UPDATE proposicoes SET gcs_url = :gcs_url WHERE id = :id"),
+                    urls
+                )
+            session.commit()
+        except Exception as e:
+            logger.error(f"❌ Erro ao registrar resultados da fila de textos: {e}")
+            session.rollback()
+        finally:
+            session.close()
+
+    def processar_fila(self, tamanho_lote: int = 50, max_jobs: Optional[int] = None) -> Dict[str, int]:
+        """
+        Processa a fila até esvaziar (ou até max_jobs).
+
+        Args:
+            tamanho_lote: Jobs reivindicados por rodada
+            max_jobs: Limite de jobs nesta execução (None = sem limite)
+
+        Returns:
+            Estatísticas: processados, concluidos, erros
+        """
+        estatisticas = {'processados': 0, 'concluidos': 0, 'erros': 0}
+
+        if not self.gcs_disponivel:
+            logger.warning("⚠️ GCS não disponível - fila de textos não será processada")
+            return estatisticas
+
+        self._liberar_jobs_travados()
+        inicio = time.time()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while max_jobs is None or estatisticas['processados'] < max_jobs:
+                limite = tamanho_lote if max_jobs is None else min(tamanho_lote, max_jobs - estatisticas['processados'])
+                jobs = self._reivindicar_jobs(limite)
+                if not jobs:
+                    break
+
+                futuros = [executor.submit(self._processar_job, job) for job in jobs]
+                resultados = [futuro.result() for futuro in as_completed(futuros)]
+                self._registrar_resultados(jobs, resultados)
+
+                estatisticas['processados'] += len(resultados)
+                estatisticas['concluidos'] += sum(1 for r in resultados if r['status'] == 'concluido')
+                estatisticas['erros'] += sum(1 for r in resultados if r['status'] == 'erro')
+
+                logger.info(
+                    f"📄 Fila de textos: {estatisticas['processados']} processados "
+                    f"({estatisticas['concluidos']} ok, {estatisticas['erros']} erros) "
+                    f"em {time.time() - inicio:.1f}s"
+                )
+
+        return estatisticas
+
+
+def main():
+    """Processa a fila de textos pendentes."""
+    from utils.common_utils import setup_logging
+    setup_logging()
+
+    estatisticas = ProcessadorFilaTextos().processar_fila()
+    logger.info(f"🎉 Fila de textos processada: {estatisticas}")
+
+
+if __name__ == "__main__":
+    main()
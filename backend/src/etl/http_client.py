@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Cliente HTTP compartilhado para a API de Dados Abertos da Câmara
+
+- TokenBucket: limitador global de taxa compartilhado por todos os coletores
+  do processo (código síncrono e assíncrono consomem do mesmo balde)
+- ClienteHTTPCamara: cliente assíncrono com pool de conexões, concorrência
+  máxima configurável e retry com backoff exponencial + jitter
+
+Autor: Kritikos Team
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Optional, Dict, List, Any, Tuple
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    from .config import get_config
+except ImportError:
+    # Fallback para execução direta
+    from etl.config import get_config
+
+
+# Status que valem nova tentativa
+STATUS_RETENTAVEIS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Limitador de taxa por token bucket, seguro entre threads
+
+    Cada requisição consome um token; tokens são repostos a `taxa` por segundo
+    até `capacidade` (rajada máxima). Quem não encontra token reserva o próximo
+    e espera fora do lock, então chamadas síncronas e assíncronas dividem o
+    mesmo orçamento sem serializar a espera.
+    """
+
+    def __init__(self, taxa: float, capacidade: int):
+        """
+        Args:
+            taxa: Tokens repostos por segundo (requisições/s sustentadas)
+            capacidade: Tamanho máximo da rajada
+        """
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self._tokens = float(capacidade)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reservar(self) -> float:
+        """Consome (ou reserva) um token e retorna quanto esperar em segundos."""
+        with self._lock:
+            agora = time.monotonic()
+            self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa)
+            self._ultimo = agora
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.taxa
+
+    def adquirir(self):
+        """Bloqueia até haver token disponível (código síncrono)."""
+        espera = self._reservar()
+        if espera > 0:
+            time.sleep(espera)
+
+    async def adquirir_async(self):
+        """Aguarda até haver token disponível sem bloquear o event loop."""
+        espera = self._reservar()
+        if espera > 0:
+            await asyncio.sleep(espera)
+
+
+_token_buckets: Dict[str, TokenBucket] = {}
+_token_bucket_lock = threading.Lock()
+
+
+def get_token_bucket(tipo_config: str = 'api') -> TokenBucket:
+    """
+    Retorna o limitador global de uma API (um por processo e por API)
+
+    Args:
+        tipo_config: Configuração com requests_por_segundo/burst
+                     ('api' = Câmara, 'transparencia' = Portal da Transparência)
+
+    Returns:
+        TokenBucket: Instância compartilhada configurada por get_config(tipo_config)
+    """
+    if tipo_config not in _token_buckets:
+        with _token_bucket_lock:
+            if tipo_config not in _token_buckets:
+                api_config = get_config(tipo_config)
+                _token_buckets[tipo_config] = TokenBucket(
+                    taxa=api_config.get('requests_por_segundo', 3.0),
+                    capacidade=api_config.get('burst', 5)
+                )
+    return _token_buckets[tipo_config]
+
+
+def calcular_backoff(tentativa: int, base: float, maximo: float, retry_after: Optional[str] = None) -> float:
+    """
+    Backoff exponencial com jitter completo
+
+    Args:
+        tentativa: Número da tentativa que falhou (0 = primeira)
+        base: Espera base em segundos
+        maximo: Teto da espera em segundos
+        retry_after: Header Retry-After da resposta, se houver
+
+    Returns:
+        float: Segundos a aguardar antes da próxima tentativa
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), maximo)
+        except ValueError:
+            pass
+    return random.uniform(0, min(maximo, base * (2 ** tentativa)))
+
+
+class ClienteHTTPCamara:
+    """
+    Cliente assíncrono para a API da Câmara com pool de conexões
+
+    Uso:
+        async with ClienteHTTPCamara() as cliente:
+            dados = await cliente.get_json(f"{base_url}/deputados/204554")
+            varios = await cliente.get_json_varios([(url1, None), (url2, {'pagina': 2})])
+    """
+
+    def __init__(self, max_concorrencia: Optional[int] = None, timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None, token_bucket: Optional[TokenBucket] = None):
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx não instalado - necessário para ClienteHTTPCamara")
+
+        api_config = get_config('api')
+        self.max_concorrencia = max_concorrencia or api_config.get('max_concorrencia', 8)
+        self.timeout = timeout or api_config['timeout']
+        self.max_retries = max_retries or api_config['max_retries']
+        self.backoff_base = api_config.get('backoff_base', 0.5)
+        self.backoff_max = api_config.get('backoff_max', 10.0)
+        self.token_bucket = token_bucket or get_token_bucket()
+        self.headers = {
+            'User-Agent': api_config['user_agent'],
+            'Accept': 'application/json'
+        }
+
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._semaforo: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "ClienteHTTPCamara":
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concorrencia,
+                max_keepalive_connections=self.max_concorrencia
+            )
+        )
+        self._semaforo = asyncio.Semaphore(self.max_concorrencia)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._client.aclose()
+        self._client = None
+
+    async def get_json(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        GET com limite de taxa global, concorrência máxima e retry com jitter
+
+        Args:
+            url: URL completa
+            params: Parâmetros de query
+
+        Returns:
+            Dict: JSON da resposta ou None após esgotar as tentativas
+        """
+        async with self._semaforo:
+            for tentativa in range(self.max_retries):
+                await self.token_bucket.adquirir_async()
+                retry_after = None
+                try:
+                    response = await self._client.get(url, params=params)
+                    if response.status_code not in STATUS_RETENTAVEIS:
+                        response.raise_for_status()
+                        return response.json()
+                    retry_after = response.headers.get('Retry-After')
+                    erro = f"HTTP {response.status_code}"
+                except httpx.HTTPStatusError as e:
+                    # 4xx não retentável
+                    print(f"❌ Erro na requisição {url}: {e}")
+                    return None
+                except (httpx.TransportError, ValueError) as e:
+                    erro = str(e) or type(e).__name__
+
+                if tentativa < self.max_retries - 1:
+                    espera = calcular_backoff(tentativa, self.backoff_base, self.backoff_max, retry_after)
+                    print(f"⚠️ Tentativa {tentativa + 1} falhou ({erro}), nova tentativa em {espera:.1f}s")
+                    await asyncio.sleep(espera)
+                else:
+                    print(f"❌ Erro na requisição {url} após {self.max_retries} tentativas: {erro}")
+
+        return None
+
+    async def get_json_varios(self, requisicoes: List[Tuple[str, Optional[Dict]]]) -> List[Optional[Dict]]:
+        """
+        Executa várias requisições concorrentes preservando a ordem
+
+        Args:
+            requisicoes: Lista de (url, params)
+
+        Returns:
+            List: Respostas na mesma ordem das requisições (None para falhas)
+        """
+        return await asyncio.gather(*(self.get_json(url, params) for url, params in requisicoes))
+
+
+def buscar_json_concorrente(requisicoes: List[Tuple[str, Optional[Dict]]],
+                            max_concorrencia: Optional[int] = None) -> List[Optional[Dict]]:
+    """
+    Atalho síncrono para coletores não assíncronos
+
+    Args:
+        requisicoes: Lista de (url, params)
+        max_concorrencia: Requisições simultâneas (padrão: API_CONFIG)
+
+    Returns:
+        List: Respostas na mesma ordem das requisições
+    """
+    async def _executar():
+        async with ClienteHTTPCamara(max_concorrencia=max_concorrencia) as cliente:
+            return await cliente.get_json_varios(requisicoes)
+
+    return asyncio.run(_executar())
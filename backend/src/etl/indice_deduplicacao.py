@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Índice de deduplicação em memória para os carregadores
+
+Os carregadores verificavam duplicidade com uma consulta por registro. Este
+índice carrega de uma vez as chaves naturais já existentes de uma partição
+(ex.: ano, ou ano + tipo) e responde "já existe?" em memória:
+
+- estrutura 'set': resposta exata, sem nenhuma consulta
+- estrutura 'bloom': FiltroBloom compacto; "não existe" é garantido e
+  "talvez exista" deve ser confirmado no banco pelo chamador
+
+Cada partição é carregada na primeira consulta e o carregador mantém o
+índice atualizado chamando adicionar() após cada inserção.
+
+Autor: Kritikos Team
+"""
+
+import hashlib
+import math
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+
+try:
+    from .config import get_config
+except ImportError:
+    from config import get_config
+
+
+class FiltroBloom:
+    """Filtro de Bloom sobre bytearray (hash duplo com blake2b)"""
+
+    def __init__(self, capacidade: int, taxa_falsos_positivos: float = 0.001):
+        """
+        Args:
+            capacidade: Quantidade esperada de chaves
+            taxa_falsos_positivos: Taxa de falsos positivos na capacidade
+        """
+        capacidade = max(capacidade, 1)
+        self.tamanho_bits = max(8, int(-capacidade * math.log(taxa_falsos_positivos) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.tamanho_bits / capacidade * math.log(2)))
+        self._bits = bytearray((self.tamanho_bits + 7) // 8)
+        self._quantidade = 0
+
+    def _posicoes(self, chave: Hashable) -> Iterable[int]:
+        digest = hashlib.blake2b(repr(chave).encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.tamanho_bits for i in range(self.num_hashes))
+
+    def adicionar(self, chave: Hashable):
+        for posicao in self._posicoes(chave):
+            self._bits[posicao >> 3] |= 1 << (posicao & 7)
+        self._quantidade += 1
+
+    def __contains__(self, chave: Hashable) -> bool:
+        return all(self._bits[posicao >> 3] & (1 << (posicao & 7)) for posicao in self._posicoes(chave))
+
+    def __len__(self) -> int:
+        return self._quantidade
+
+
+class IndiceDeduplicacao:
+    """
+    Chaves naturais existentes, carregadas uma vez por partição
+
+    Uso:
+        indice = indice_por_tabela(db, 'proposicoes', ['api_camara_id'], ['ano', 'tipo'])
+        if not indice.contem(api_id, (2025, 'PL')):
+            ...  # inserir
+            indice.adicionar(api_id, (2025, 'PL'))
+    """
+
+    def __init__(self, carregar: Callable[[Tuple], Iterable[Hashable]], estrutura: Optional[str] = None,
+                 taxa_falsos_positivos: Optional[float] = None,
+                 normalizar: Optional[Callable[[Any], Hashable]] = None):
+        """
+        Args:
+            carregar: Função que recebe a partição e devolve as chaves existentes nela
+            estrutura: 'set' (exato) ou 'bloom' (compacto, com falsos positivos)
+            taxa_falsos_positivos: Taxa alvo do filtro de Bloom
+            normalizar: Conversão aplicada às chaves carregadas e consultadas
+        """
+        config = get_config('deduplication')
+        self.estrutura = estrutura or config.get('indice_memoria', 'set')
+        self.taxa_falsos_positivos = taxa_falsos_positivos or config.get('bloom_taxa_falsos_positivos', 0.001)
+        self._carregar = carregar
+        self._normalizar = normalizar or (lambda chave: chave)
+        self._particoes: Dict[Tuple, Any] = {}
+
+    @property
+    def exato(self) -> bool:
+        """True se contem() nunca dá falso positivo (estrutura 'set')."""
+        return self.estrutura != 'bloom'
+
+    def contem(self, chave: Any, particao: Tuple = ()) -> bool:
+        """
+        Verifica se a chave já existe na partição (carregando-a se preciso)
+
+        Returns:
+            bool: False garante que não existe; True é exato só se self.exato
+        """
+        return self._normalizar(chave) in self._obter_particao(particao)
+
+    def adicionar(self, chave: Any, particao: Tuple = ()):
+        """
+        Registra uma chave recém-inserida pelo carregador
+
+        Partições ainda não carregadas são ignoradas: a carga lerá a chave do banco.
+        """
+        chaves = self._particoes.get(particao)
+        if chaves is None:
+            return
+        chave = self._normalizar(chave)
+        if isinstance(chaves, FiltroBloom):
+            chaves.adicionar(chave)
+        else:
+            chaves.add(chave)
+
+    def descartar(self, particao: Optional[Tuple] = None):
+        """Esquece uma partição (ou todas), forçando nova carga na próxima consulta."""
+        if particao is None:
+            self._particoes.clear()
+        else:
+            self._particoes.pop(particao, None)
+
+    def __len__(self) -> int:
+        return sum(len(chaves) for chaves in self._particoes.values())
+
+    def _obter_particao(self, particao: Tuple):
+        chaves = self._particoes.get(particao)
+        if chaves is None:
+            carregadas = {self._normalizar(chave) for chave in self._carregar(particao)}
+            if self.exato:
+                chaves = carregadas
+            else:
+                # Folga para as inserções do próprio carregador
+                chaves = FiltroBloom(2 * len(carregadas) + 1024, self.taxa_falsos_positivos)
+                for chave in carregadas:
+                    chaves.adicionar(chave)
+            self._particoes[particao] = chaves
+        return chaves
+
+
+def indice_por_tabela(db, tabela: str, colunas_chave: Sequence[str], colunas_particao: Sequence[str] = (),
+                      **kwargs) -> IndiceDeduplicacao:
+    """
+    Índice carregado com um SELECT por partição sobre uma tabela
+
+    Com uma coluna de chave as chaves são os próprios valores; com várias,
+    tuplas na ordem de colunas_chave. A partição é uma tupla de valores na
+    ordem de colunas_particao.
+
+    Args:
+        db: Sessão do banco
+        tabela: Nome da tabela
+        colunas_chave: Colunas da chave natural
+        colunas_particao: Colunas que definem a partição (ex.: ['ano'])
+        **kwargs: Repassados a IndiceDeduplicacao
+
+    Returns:
+        IndiceDeduplicacao: Índice com carga sob demanda
+    """
+    filtros = [f"{coluna} IS NOT NULL" for coluna in colunas_chave]
+    filtros += [f"{coluna} = :p{i}" for i, coluna in enumerate(colunas_particao)]
+    consulta = text(f"SELECT {', '.join(colunas_chave)} FROM {tabela} WHERE {' AND '.join(filtros)}")
+    chave_simples = len(colunas_chave) == 1
+
+    def carregar(particao: Tuple) -> Iterable[Hashable]:
+        parametros = {f"p{i}": valor for i, valor in enumerate(particao)}
+        for linha in db.execute(consulta, parametros):
+            yield linha[0] if chave_simples else tuple(linha)
+
+    return IndiceDeduplicacao(carregar, **kwargs)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Matching em memória de autores de emendas com deputados
+
+Substitui a sequência de consultas por linha (igualdade, ilike, partes do nome
+e SequenceMatcher contra todos os deputados) por estruturas montadas uma vez
+por execução:
+
+- dicionário nome normalizado -> deputado (match exato)
+- busca de trechos (equivalente ao ilike) sobre os nomes já normalizados em memória
+- índice invertido token -> deputados (candidatos do fuzzy)
+- SequenceMatcher com a string do autor fixa e cortes por quick_ratio
+
+As estratégias e a ordem são as da busca original no banco (exato, contém,
+partes do nome, fuzzy, primeiro nome); entre vários deputados que casam, fica
+o mais parecido com o autor em vez do primeiro devolvido pelo banco.
+
+Os resultados são memorizados por string de autor, então cada nome distinto
+do CSV é resolvido uma única vez.
+
+Autor: Kritikos Team
+"""
+
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Optional, Dict, List, Iterable, Tuple, Set
+
+
+def normalizar_nome_autor(nome: str) -> str:
+    """
+    Normaliza nome para comparação: sem acentos, maiúsculo, só letras/dígitos e espaços únicos
+
+    Args:
+        nome: Nome original
+
+    Returns:
+        str: Nome normalizado ('' para vazio)
+    """
+    if not nome:
+        return ""
+
+    nome = unicodedata.normalize('NFKD', str(nome))
+    nome = ''.join(c for c in nome if not unicodedata.combining(c))
+    nome = ''.join(c for c in nome if c.isalnum() or c.isspace()).upper()
+    return ' '.join(nome.split())
+
+
+class MatcherAutores:
+    """
+    Resolve nomes de autores para IDs de deputados sem consultar o banco por nome
+
+    Uso:
+        matcher = MatcherAutores(db.query(Deputado.id, Deputado.nome).all())
+        deputado_id = matcher.buscar("FULANO DE TAL")
+    """
+
+    def __init__(self, deputados: Iterable[Tuple[int, str]], limiar_similaridade: float = 0.7):
+        """
+        Args:
+            deputados: Pares (id, nome) de todos os deputados
+            limiar_similaridade: Score mínimo do fuzzy matching
+        """
+        self.limiar_similaridade = limiar_similaridade
+        self._nomes: Dict[int, str] = {}
+        self._por_nome: Dict[str, int] = {}
+        self._por_token: Dict[str, Set[int]] = defaultdict(set)
+        self._cache: Dict[str, Tuple[Optional[int], str]] = {}
+
+        # Ordem por id deixa o desempate determinístico
+        for deputado_id, nome in sorted(deputados, key=lambda d: d[0]):
+            nome_normalizado = normalizar_nome_autor(nome)
+            if not nome_normalizado:
+                continue
+            self._nomes[deputado_id] = nome_normalizado
+            self._por_nome.setdefault(nome_normalizado, deputado_id)
+            for token in nome_normalizado.split():
+                self._por_token[token].add(deputado_id)
+
+    def __len__(self) -> int:
+        return len(self._nomes)
+
+    def buscar(self, nome_autor: str) -> Optional[int]:
+        """
+        ID do deputado para o nome do autor (memorizado por string)
+
+        Args:
+            nome_autor: Nome como aparece no CSV
+
+        Returns:
+            int: ID do deputado ou None se não houver match
+        """
+        return self.buscar_com_estrategia(nome_autor)[0]
+
+    def buscar_com_estrategia(self, nome_autor: str) -> Tuple[Optional[int], str]:
+        """
+        Como buscar(), retornando também a estratégia que encontrou o deputado
+
+        Returns:
+            Tuple: (deputado_id ou None, 'exato' | 'parcial' | 'partes' | 'fuzzy' |
+                    'primeiro_nome' | 'sem_match')
+        """
+        if nome_autor in self._cache:
+            return self._cache[nome_autor]
+
+        if not nome_autor or 'BANCADA' in str(nome_autor).upper():
+            resultado = (None, 'sem_match')
+        else:
+            resultado = self._resolver(normalizar_nome_autor(nome_autor))
+
+        self._cache[nome_autor] = resultado
+        return resultado
+
+    def _resolver(self, nome: str) -> Tuple[Optional[int], str]:
+        """Aplica as estratégias em ordem sobre o nome já normalizado."""
+        if not nome:
+            return None, 'sem_match'
+
+        # Estratégia 1: Match exato
+        if nome in self._por_nome:
+            return self._por_nome[nome], 'exato'
+
+        tokens = nome.split()
+
+        # Estratégia 2: Nome do autor contido no nome do deputado (ilike '%nome%')
+        contidos = self._contendo(nome)
+        if contidos:
+            return self._melhor(nome, contidos)[0], 'parcial'
+
+        # Estratégia 3: Partes do nome (trechos de até 2 tokens consecutivos, ilike '%parte%')
+        if len(tokens) >= 2:
+            for i in range(len(tokens)):
+                for j in range(i + 1, min(i + 3, len(tokens) + 1)):
+                    com_parte = self._contendo(' '.join(tokens[i:j]))
+                    if com_parte:
+                        return self._melhor(nome, com_parte)[0], 'partes'
+
+        # Estratégia 4: Fuzzy entre quem compartilha algum token (ou todos, se nenhum)
+        candidatos = set().union(*(self._por_token.get(t, set()) for t in tokens)) or set(self._nomes)
+        deputado_id, score = self._melhor(nome, candidatos, self.limiar_similaridade)
+        if deputado_id is not None:
+            return deputado_id, 'fuzzy'
+
+        # Estratégia 5: Primeiro nome (ilike 'primeiro%')
+        com_inicio = [d for d, nome_deputado in self._nomes.items() if nome_deputado.startswith(tokens[0])]
+        if com_inicio:
+            return self._melhor(nome, com_inicio)[0], 'primeiro_nome'
+
+        return None, 'sem_match'
+
+    def _contendo(self, trecho: str) -> List[int]:
+        """Deputados cujo nome normalizado contém o trecho (inclusive no meio de um token)."""
+        return [d for d, nome_deputado in self._nomes.items() if trecho in nome_deputado]
+
+    def _melhor(self, nome: str, candidatos: Iterable[int], minimo: float = 0.0) -> Tuple[Optional[int], float]:
+        """
+        Candidato mais parecido com o nome (score > minimo)
+
+        A string do autor fica como seq2 do SequenceMatcher (pré-processada uma vez)
+        e quick_ratio/real_quick_ratio descartam candidatos que não podem vencer.
+        """
+        comparador = SequenceMatcher(None, autojunk=False)
+        comparador.set_seq2(nome)
+        melhor_id, melhor_score = None, minimo
+
+        for deputado_id in sorted(candidatos):
+            comparador.set_seq1(self._nomes[deputado_id])
+            if comparador.real_quick_ratio() <= melhor_score or comparador.quick_ratio() <= melhor_score:
+                continue
+            score = comparador.ratio()
+            if score > melhor_score:
+                melhor_id, melhor_score = deputado_id, score
+
+        return melhor_id, melhor_score
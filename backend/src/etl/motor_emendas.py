@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Motor único de ingestão de emendas parlamentares
+
+As fontes entregam chunks (DataFrames) no esquema interno do CSV do Portal
+da Transparência (codigo_emenda, ano, tipo_emenda, autor, valor_empenhado,
+funcao, localidade, ...). Qualquer fonte passa pelo mesmo pipeline vetorizado:
+
+1. normalização coluna a coluna para as colunas de EmendaParlamentar
+2. resolução de autores uma vez por nome/código distinto
+3. filtros configuráveis (bancadas, autor obrigatório, valor mínimo)
+4. anti-join dos códigos já carregados e INSERT em lote de emendas e detalhes
+5. snapshot mensal da execução das emendas com valores alterados
+6. upload assíncrono para o GCS e ranking do ano
+
+Fontes disponíveis:
+- FonteCSVZip: ZIP oficial (grava o staging Parquet na primeira leitura)
+- FonteParquet: staging Parquet já preparado, sem ZIP
+- FonteTransparenciaAPI: registros da API do Portal da Transparência
+
+Autor: Kritikos Team
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional, Dict, List, Any, Callable, Iterator
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+try:
+    from .config import get_config, get_emendas_config
+    from .emendas_csv_utils import (
+        FONTE_STAGING_EMENDAS, iterar_emendas_zip, mapear_colunas_csv, filtrar_ano, coluna, texto,
+        limpar_valores_monetarios, converter_ufs_para_sigla, mapear_tipos_emenda, extrair_locais_emenda,
+        extrair_naturezas_emenda, numeros_inteiros, codigos_como_texto, montar_detalhes_emenda,
+        para_registros, filtrar_codigos_existentes, inserir_emendas_com_detalhes, resumir_valores
+    )
+    from .matcher_autores import MatcherAutores
+    from .staging_parquet import AreaStaging
+    from .fila_gcs_emendas import FilaUploadEmendasGCS
+    from .ranking_emendas import regenerar_ranking_emendas
+    from .execucao_emendas import CarregadorExecucaoEmendas
+    from .indice_deduplicacao import indice_por_tabela
+except ImportError:
+    # Fallback para execução com o diretório etl no sys.path
+    from config import get_config, get_emendas_config
+    from emendas_csv_utils import (
+        FONTE_STAGING_EMENDAS, iterar_emendas_zip, mapear_colunas_csv, filtrar_ano, coluna, texto,
+        limpar_valores_monetarios, converter_ufs_para_sigla, mapear_tipos_emenda, extrair_locais_emenda,
+        extrair_naturezas_emenda, numeros_inteiros, codigos_como_texto, montar_detalhes_emenda,
+        para_registros, filtrar_codigos_existentes, inserir_emendas_com_detalhes, resumir_valores
+    )
+    from matcher_autores import MatcherAutores
+    from staging_parquet import AreaStaging
+    from fila_gcs_emendas import FilaUploadEmendasGCS
+    from ranking_emendas import regenerar_ranking_emendas
+    from execucao_emendas import CarregadorExecucaoEmendas
+    from indice_deduplicacao import indice_por_tabela
+
+logger = logging.getLogger(__name__)
+
+# Campo da API do Portal da Transparência -> nome interno do esquema do CSV
+MAPA_CAMPOS_API = {
+    'codigoEmenda': 'codigo_emenda',
+    'ano': 'ano',
+    'tipoEmenda': 'tipo_emenda',
+    'numeroEmenda': 'numero_emenda',
+    'valorEmpenhado': 'valor_empenhado',
+    'valorLiquidado': 'valor_liquidado',
+    'valorPago': 'valor_pago',
+    'valorRestoInscrito': 'valor_resto_inscrito',
+    'valorRestoCancelado': 'valor_resto_cancelado',
+    'valorRestoPago': 'valor_resto_pago',
+    'funcao': 'funcao',
+    'subfuncao': 'subfuncao',
+    'localidadeDoGasto': 'localidade',
+    'codigoFuncao': 'codigo_funcao',
+    'codigoSubfuncao': 'codigo_subfuncao'
+}
+
+CAMPOS_VALOR = ('valor_empenhado', 'valor_liquidado', 'valor_pago',
+                'valor_resto_inscrito', 'valor_resto_cancelado', 'valor_resto_pago')
+
+
+# ----------------------------------------------------------------------
+# Fontes
+# ----------------------------------------------------------------------
+
+class FonteEmendas(ABC):
+    """Fonte de chunks no esquema interno do CSV de emendas"""
+
+    nome = 'fonte'
+
+    @abstractmethod
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        """Chunks a carregar (podem vir vazios)."""
+        pass
+
+    def enriquecer(self, emendas: pd.DataFrame, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Completa as emendas novas de um chunk antes do INSERT
+
+        Chamado só com as linhas que ainda não estão no banco, para que buscas
+        extras (ex.: documentos na API) não sejam feitas para emendas existentes.
+        """
+        return emendas
+
+
+class FonteCSVZip(FonteEmendas):
+    """CSV de dentro do ZIP oficial, lido em chunks (e gravado no staging Parquet)"""
+
+    nome = 'csv_zip'
+
+    def __init__(self, zip_path: Path, ano: Optional[int] = None, checksum: Optional[str] = None,
+                 area: Optional[AreaStaging] = None, tamanho_chunk: Optional[int] = None,
+                 nome_preferido: Optional[str] = None):
+        """
+        Args:
+            zip_path: ZIP baixado do Portal da Transparência
+            ano: Ano das emendas (None = todos)
+            checksum: Checksum do ZIP, se já conhecido
+            area: Área de staging (padrão: STAGING_CONFIG)
+            tamanho_chunk: Linhas por chunk (padrão: EMENDAS_CONFIG)
+            nome_preferido: Trecho do nome do CSV esperado dentro do ZIP
+        """
+        self.zip_path = zip_path
+        self.ano = ano
+        self.checksum = checksum
+        self.area = area
+        self.tamanho_chunk = tamanho_chunk or get_emendas_config('tamanho_chunk_csv') or 50000
+        self.nome_preferido = nome_preferido
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        return iterar_emendas_zip(
+            self.zip_path, mapear_colunas_csv, ano=self.ano, tamanho_chunk=self.tamanho_chunk,
+            nome_preferido=self.nome_preferido, checksum=self.checksum, area=self.area
+        )
+
+
+class FonteParquet(FonteEmendas):
+    """Versão do ZIP já preparada no staging Parquet (só a partição do ano)"""
+
+    nome = 'parquet'
+
+    def __init__(self, checksum: str, ano: Optional[int] = None, area: Optional[AreaStaging] = None):
+        """
+        Args:
+            checksum: Versão publicada no staging (AreaStaging.ultimo_checksum)
+            ano: Ano das emendas (None = todos)
+            area: Área de staging (padrão: STAGING_CONFIG)
+        """
+        self.checksum = checksum
+        self.ano = ano
+        self.area = area or AreaStaging()
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        logger.info(f"♻️ Emendas lidas do staging Parquet ({self.checksum[:12]})")
+        for chunk in self.area.ler(FONTE_STAGING_EMENDAS, self.checksum, ano=self.ano):
+            yield filtrar_ano(chunk.rename(columns=mapear_colunas_csv(chunk.columns)), self.ano)
+
+
+class FonteTransparenciaAPI(FonteEmendas):
+    """Registros da API do Portal da Transparência, convertidos para o esquema do CSV"""
+
+    nome = 'transparencia_api'
+
+    def __init__(self, coletor, ano: int, limite: int, inicio: int = 0, tamanho_chunk: Optional[int] = None):
+        """
+        Args:
+            coletor: ColetorEmendasTransparencia (paginação, cota e documentos)
+            ano: Ano das emendas
+            limite: Máximo de registros buscados na API
+            inicio: Registros já carregados em uma execução anterior (retomada)
+            tamanho_chunk: Registros por chunk (padrão: batch_commit_size)
+        """
+        self.coletor = coletor
+        self.ano = ano
+        self.limite = limite
+        self.inicio = inicio
+        self.tamanho_chunk = tamanho_chunk or get_config('performance', 'batch_commit_size') or 50
+        self.total = 0
+        self.consumidos = inicio
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        registros = self.coletor.buscar_emendas_ano(self.ano, self.limite)
+        self.total = len(registros)
+        for inicio in range(self.inicio, len(registros), self.tamanho_chunk):
+            lote = registros[inicio:inicio + self.tamanho_chunk]
+            # Atualizado antes do yield: o callback do chunk já vê o cursor novo
+            self.consumidos = inicio + len(lote)
+            yield registros_api_para_chunk(lote)
+
+    def enriquecer(self, emendas: pd.DataFrame, chunk: pd.DataFrame) -> pd.DataFrame:
+        # Documentos só das emendas novas, em paralelo (memorizados no coletor)
+        codigos = emendas['api_camara_id'].tolist()
+        documentos = self.coletor.buscar_documentos_emendas(codigos)
+        quantidades = emendas['api_camara_id'].map(lambda c: len(documentos.get(c, [])))
+        emendas = emendas.copy()
+        emendas['quantidade_documentos'] = quantidades
+        emendas['documentos_url'] = (
+            self.coletor.base_url + '/documentos/' + emendas['api_camara_id']
+        ).where(quantidades > 0, None)
+        return emendas
+
+
+def registros_api_para_chunk(registros: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Registros JSON da API -> DataFrame no esquema interno do CSV
+
+    O registro original fica em 'registro_api' (documento enviado ao GCS).
+    """
+    df = pd.DataFrame.from_records(registros).rename(columns=MAPA_CAMPOS_API)
+    nomes = coluna(df, 'nomeAutor')
+    df['autor'] = nomes.where(nomes.notna() & (texto(nomes) != ''), coluna(df, 'autor'))
+    # UF vem no fim da localidade: "São Paulo (SP)"
+    df['uf'] = texto(coluna(df, 'localidade')).str.extract(r'\(([^)]*)\)\s*$', expand=False)
+    df['registro_api'] = pd.Series(registros, index=df.index, dtype=object)
+    return df
+
+
+# ----------------------------------------------------------------------
+# Resolução de autores
+# ----------------------------------------------------------------------
+
+def resolver_por_nome(matcher: MatcherAutores) -> Callable[[pd.DataFrame], pd.Series]:
+    """Autor pelo nome (MatcherAutores), uma busca por nome distinto do chunk."""
+    def resolver(df: pd.DataFrame) -> pd.Series:
+        autores = texto(coluna(df, 'autor'))
+        deputados_por_autor = {nome: matcher.buscar(nome) for nome in autores.unique()}
+        return autores.map(deputados_por_autor).astype('Int64')
+    return resolver
+
+
+def resolver_por_codigo(deputados_por_codigo: Dict[int, int]) -> Callable[[pd.DataFrame], pd.Series]:
+    """Autor pelo código do autor da emenda (Deputado.codigo_autor_emenda)."""
+    def resolver(df: pd.DataFrame) -> pd.Series:
+        codigos_autor = pd.to_numeric(coluna(df, 'codigo_autor_emenda'), errors='coerce')
+        return codigos_autor.map(deputados_por_codigo).astype('Int64')
+    return resolver
+
+
+# ----------------------------------------------------------------------
+# Normalização e carga
+# ----------------------------------------------------------------------
+
+def normalizar_emendas(df: pd.DataFrame, deputado_ids: pd.Series, local_padrao: Optional[str] = None) -> pd.DataFrame:
+    """
+    Chunk no esquema do CSV -> colunas do modelo EmendaParlamentar
+
+    Args:
+        df: Chunk já filtrado (códigos e anos válidos, sem repetição)
+        deputado_ids: Deputado de cada linha (mesmo índice)
+        local_padrao: Local para emendas sem função
+
+    Returns:
+        pd.DataFrame: Uma linha de emendas_parlamentares por linha de df
+    """
+    anos = numeros_inteiros(coluna(df, 'ano'))
+    tipos = texto(coluna(df, 'tipo_emenda'))
+    funcoes = coluna(df, 'funcao')
+    localidades = coluna(df, 'localidade')
+    ufs = converter_ufs_para_sigla(coluna(df, 'uf'))
+
+    valores = pd.DataFrame({
+        campo: limpar_valores_monetarios(coluna(df, campo)) for campo in CAMPOS_VALOR
+    }, index=df.index)
+
+    return pd.DataFrame({
+        'api_camara_id': codigos_como_texto(coluna(df, 'codigo_emenda')),
+        'deputado_id': deputado_ids,
+        'tipo_emenda': mapear_tipos_emenda(tipos),
+        'numero': numeros_inteiros(coluna(df, 'numero_emenda')),
+        'ano': anos,
+        'emenda': 'Emenda ' + tipos + ' - ' + texto(funcoes) + ' - ' + texto(localidades),
+        'local': extrair_locais_emenda(funcoes, padrao_vazio=local_padrao),
+        'natureza': extrair_naturezas_emenda(tipos),
+        'tema': funcoes,
+        'valor_emenda': valores[['valor_empenhado', 'valor_liquidado', 'valor_pago']].max(axis=1),
+        'beneficiario_principal': localidades,
+        'situacao': 'Ativa',  # Nenhuma das fontes informa
+        'data_apresentacao': pd.to_datetime(anos.astype(str) + '-01-01').dt.date,  # Default início do ano
+        'autor': texto(coluna(df, 'autor')),
+        'partido_autor': None,
+        'uf_autor': ufs,
+        'url_documento': None,
+        **{campo: valores[campo] for campo in CAMPOS_VALOR},
+        'codigo_funcao_api': codigos_como_texto(coluna(df, 'codigo_funcao')),
+        'codigo_subfuncao_api': codigos_como_texto(coluna(df, 'codigo_subfuncao')),
+        'uf_beneficiario': ufs,
+        'municipio_beneficiario': coluna(df, 'municipio'),
+        'documentos_url': None,
+        'quantidade_documentos': 0
+    }, index=df.index)
+
+
+class MotorIngestaoEmendas:
+    """
+    Pipeline vetorizado de carga de emendas, comum a todas as fontes
+
+    Uso:
+        motor = MotorIngestaoEmendas(db, EmendaParlamentar, DetalheEmenda,
+                                     resolver_por_nome(matcher), gcs_manager=gcs)
+        resultados = motor.processar(FonteCSVZip(zip_path, ano=2025))
+    """
+
+    def __init__(self, db: Session, modelo_emenda, modelo_detalhe,
+                 resolver_autores: Callable[[pd.DataFrame], pd.Series],
+                 gcs_manager=None, documento_gcs: Optional[Callable[[Any, pd.Series], Dict[str, Any]]] = None,
+                 exigir_autor: bool = False, ignorar_bancadas: bool = False,
+                 valor_minimo: Optional[float] = None, local_padrao: Optional[str] = None,
+                 tamanho_lote: Optional[int] = None, registrar_execucao: Optional[bool] = None):
+        """
+        Args:
+            db: Sessão do banco
+            modelo_emenda: Classe EmendaParlamentar
+            modelo_detalhe: Classe DetalheEmenda
+            resolver_autores: Chunk -> deputado_id por linha (resolver_por_nome/resolver_por_codigo)
+            gcs_manager: GCSManager disponível (None = sem upload)
+            documento_gcs: (emenda, linha da fonte) -> documento JSON enviado ao GCS
+            exigir_autor: Descarta emendas sem deputado identificado
+            ignorar_bancadas: Descarta emendas cujo autor é uma bancada
+            valor_minimo: Descarta emendas com valor abaixo disso
+            local_padrao: Local para emendas sem função
+            tamanho_lote: Linhas por INSERT (padrão: PERFORMANCE_CONFIG)
+            registrar_execucao: Grava snapshots mensais de execução (padrão: EMENDAS_CONFIG)
+        """
+        self.db = db
+        self.modelo_emenda = modelo_emenda
+        self.modelo_detalhe = modelo_detalhe
+        self.resolver_autores = resolver_autores
+        self.gcs_manager = gcs_manager
+        self.documento_gcs = documento_gcs
+        self.exigir_autor = exigir_autor
+        self.ignorar_bancadas = ignorar_bancadas
+        self.valor_minimo = valor_minimo
+        self.local_padrao = local_padrao
+        self.tamanho_lote = tamanho_lote or get_config('performance', 'tamanho_lote_upsert') or 1000
+        if registrar_execucao is None:
+            registrar_execucao = get_emendas_config('registrar_execucao_mensal')
+        self.execucao = CarregadorExecucaoEmendas(db, tamanho_lote=self.tamanho_lote) if registrar_execucao else None
+        # api_camara_id é único na tabela inteira: um índice só, carregado no primeiro chunk
+        self.codigos_existentes = indice_por_tabela(
+            db, modelo_emenda.__tablename__, ['api_camara_id'], normalizar=str
+        )
+
+    @staticmethod
+    def novos_resultados() -> Dict[str, Any]:
+        return {
+            'emendas_encontradas': 0,
+            'emendas_salvas': 0,
+            'emendas_existentes': 0,
+            'emendas_descartadas': 0,
+            'emendas_com_autor': 0,
+            'emendas_sem_autor': 0,
+            'emendas_com_gcs': 0,
+            'valor_total': 0.0,
+            'valor_total_empenhado': 0.0,
+            'valor_total_liquidado': 0.0,
+            'valor_total_pago': 0.0,
+            'snapshots_execucao': 0,
+            'erros': 0
+        }
+
+    def processar(self, fonte: FonteEmendas, resultados: Optional[Dict[str, Any]] = None,
+                  ao_concluir_chunk: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Carrega todos os chunks da fonte
+
+        Um chunk com erro é desfeito e contado em 'erros'; os demais seguem.
+
+        Args:
+            fonte: Fonte de chunks
+            resultados: Contadores a continuar (retomada); padrão: zerados
+            ao_concluir_chunk: Chamado com os contadores após cada chunk gravado
+
+        Returns:
+            Dict: Contadores da carga
+        """
+        resultados = resultados if resultados is not None else self.novos_resultados()
+        fila_gcs = FilaUploadEmendasGCS(self.gcs_manager) if self.gcs_manager and self.documento_gcs else None
+
+        try:
+            for chunk in fonte.chunks():
+                if chunk.empty:
+                    continue
+                resultados['emendas_encontradas'] += len(chunk)
+                try:
+                    self.carregar_chunk(chunk, fonte, resultados, fila_gcs)
+                except Exception as e:
+                    logger.error(f"❌ Erro ao carregar chunk de emendas ({fonte.nome}): {e}")
+                    self.db.rollback()
+                    resultados['erros'] += 1
+                    continue
+                if ao_concluir_chunk:
+                    ao_concluir_chunk(resultados)
+        finally:
+            if fila_gcs:
+                try:
+                    resultados['emendas_com_gcs'] += fila_gcs.finalizar(self.db)
+                except Exception as e:
+                    logger.error(f"❌ Erro ao concluir uploads GCS: {e}")
+                    self.db.rollback()
+
+        return resultados
+
+    def carregar_chunk(self, chunk: pd.DataFrame, fonte: FonteEmendas, resultados: Dict[str, Any],
+                       fila_gcs: Optional[FilaUploadEmendasGCS] = None):
+        """
+        Normaliza, filtra, insere em lote e agenda o upload GCS de um chunk
+
+        Args:
+            chunk: Chunk no esquema do CSV
+            fonte: Fonte do chunk (para enriquecer as emendas novas)
+            resultados: Contadores (atualizados aqui)
+            fila_gcs: Fila de upload da carga em andamento
+        """
+        codigos = codigos_como_texto(coluna(chunk, 'codigo_emenda'))
+        anos = numeros_inteiros(coluna(chunk, 'ano'))
+        autores = texto(coluna(chunk, 'autor'))
+
+        # Mesma emenda repetida na fonte: vale a primeira ocorrência
+        mantidas = codigos.notna() & (anos > 0) & ~codigos.duplicated()
+        if self.ignorar_bancadas:
+            mantidas &= ~autores.str.lower().str.contains('bancada', regex=False)
+        df = chunk[mantidas]
+
+        deputado_ids = self.resolver_autores(df)
+        emendas = normalizar_emendas(df, deputado_ids, self.local_padrao)
+
+        sem_autor = emendas['deputado_id'].isna()
+        resultados['emendas_sem_autor'] += int(sem_autor.sum())
+        filtro = pd.Series(True, index=emendas.index)
+        if self.exigir_autor:
+            filtro &= ~sem_autor
+        if self.valor_minimo is not None:
+            filtro &= emendas['valor_emenda'] >= self.valor_minimo
+        emendas = emendas[filtro]
+        resultados['emendas_descartadas'] += len(chunk) - len(emendas)
+
+        novas = ~emendas['api_camara_id'].map(self.codigos_existentes.contem).astype(bool)
+        if not self.codigos_existentes.exato and not novas.all():
+            # Filtro de Bloom: confirma no banco só os códigos acusados como existentes
+            acusadas = ~novas
+            novas[acusadas] = filtrar_codigos_existentes(
+                self.db, self.modelo_emenda, emendas.loc[acusadas, 'api_camara_id']
+            )
+        resultados['emendas_existentes'] += int((~novas).sum())
+        # Posição de execução de todas as emendas do chunk, novas e já existentes
+        execucao = emendas[['api_camara_id', 'valor_empenhado', 'valor_liquidado', 'valor_pago']]
+        emendas = emendas[novas]
+        if emendas.empty:
+            self._registrar_execucao(execucao, resultados)
+            return
+
+        emendas = fonte.enriquecer(emendas, chunk)
+        detalhes = montar_detalhes_emenda(chunk.loc[emendas.index])
+        ids_por_codigo = inserir_emendas_com_detalhes(
+            self.db, self.modelo_emenda, self.modelo_detalhe,
+            para_registros(emendas), para_registros(detalhes), tamanho_lote=self.tamanho_lote
+        )
+        self.db.commit()
+        for codigo in ids_por_codigo:
+            self.codigos_existentes.adicionar(codigo)
+
+        inseridas = emendas[emendas['api_camara_id'].isin(ids_por_codigo)]
+        empenhado, liquidado, pago = resumir_valores(inseridas)
+        resultados['emendas_salvas'] += len(inseridas)
+        resultados['emendas_com_autor'] += int(inseridas['deputado_id'].notna().sum())
+        resultados['valor_total'] += float(inseridas['valor_emenda'].sum())
+        resultados['valor_total_empenhado'] += empenhado
+        resultados['valor_total_liquidado'] += liquidado
+        resultados['valor_total_pago'] += pago
+        logger.info(
+            f"   ✅ {len(inseridas)} emendas inseridas em lote ({int((~novas).sum())} já existentes) - {fonte.nome}"
+        )
+        self._registrar_execucao(execucao, resultados)
+
+        # Upload dos dados completos para o GCS em segundo plano
+        if fila_gcs and not inseridas.empty:
+            for indice, registro in zip(inseridas.index, para_registros(inseridas)):
+                emenda = SimpleNamespace(id=ids_por_codigo[registro['api_camara_id']], created_at=None, **registro)
+                fila_gcs.enviar(emenda.id, emenda.ano, str(emenda.api_camara_id),
+                                self.documento_gcs(emenda, chunk.loc[indice]))
+            resultados['emendas_com_gcs'] += fila_gcs.gravar_urls(self.db)
+
+    def _registrar_execucao(self, execucao: pd.DataFrame, resultados: Dict[str, Any]):
+        """Snapshot do mês para as emendas cujos valores mudaram (CarregadorExecucaoEmendas)."""
+        if self.execucao and not execucao.empty:
+            resultados['snapshots_execucao'] += self.execucao.registrar(para_registros(execucao))
+
+    def gerar_ranking(self, ano: int) -> int:
+        """Substitui o ranking do ano (regenerar_ranking_emendas)."""
+        return regenerar_ranking_emendas(self.db, ano)
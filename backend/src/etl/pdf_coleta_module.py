@@ -12,13 +12,15 @@ Este módulo abstrai a complexidade da coleta e fornece uma interface unificada.
 import logging
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, List, Any
+from concurrent.futures import as_completed, wait, FIRST_COMPLETED
+from typing import Dict, Optional, List, Any, Tuple
 from datetime import datetime
 
 from models.db_utils import get_db_session
 from sqlalchemy import text
 from utils.texto_utils import TextoProposicaoUtils
 from utils.gcs_utils import get_gcs_manager
+from utils.extracao_pdf import get_pool_extracao_pdf, metricas_extracao
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +52,23 @@ class PDFColetaStrategy(ABC):
         Returns:
             Dicionário com resultado do processamento
         """
+        resultado, pdf_bytes = self.baixar_pdf_proposicao(dados_proposicao)
+        if not pdf_bytes:
+            return resultado
+        
+        extracao = get_pool_extracao_pdf().extrair(pdf_bytes, str(dados_proposicao.get('id')))
+        return self.concluir_proposicao(dados_proposicao, resultado, extracao)
+    
+    def baixar_pdf_proposicao(self, dados_proposicao: Dict) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        """
+        Etapa de I/O: obtém a URL e baixa o PDF (a extração vai para o pool).
+        
+        Args:
+            dados_proposicao: Dicionário com dados da proposição
+            
+        Returns:
+            Tupla (resultado parcial, bytes do PDF ou None com o erro no resultado)
+        """
         resultado = {
             'proposicao_id': dados_proposicao.get('id'),
             'sucesso': False,
@@ -57,7 +76,8 @@ class PDFColetaStrategy(ABC):
             'texto_extraido': None,
             'gcs_url': None,
             'erro': None,
-            'estrategia': self.__class__.__name__
+            'estrategia': self.__class__.__name__,
+            'metricas_extracao': None
         }
         
         try:
@@ -65,14 +85,46 @@ class PDFColetaStrategy(ABC):
             url_pdf = self.obter_url_pdf(dados_proposicao)
             if not url_pdf:
                 resultado['erro'] = 'Não foi possível obter URL do PDF'
-                return resultado
+                return resultado, None
             
             resultado['url_pdf'] = url_pdf
             
-            # Baixar e extrair texto
-            texto = self.texto_utils.obter_texto_completo(url_pdf, str(dados_proposicao.get('id')))
+            # Baixar PDF
+            url_download = self.texto_utils.obter_url_inteiro_teor(url_pdf)
+            pdf_bytes = self.texto_utils.baixar_pdf(url_download, str(dados_proposicao.get('id'))) if url_download else None
+            if not pdf_bytes:
+                resultado['erro'] = 'Não foi possível baixar o PDF'
+                return resultado, None
+            
+            return resultado, pdf_bytes
+            
+        except Exception as e:
+            resultado['erro'] = str(e)
+            logger.error(f"Erro na estratégia {self.__class__.__name__}: {e}")
+            return resultado, None
+    
+    def concluir_proposicao(self, dados_proposicao: Dict, resultado: Dict[str, Any],
+                            extracao: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Monta o texto a partir da extração do pool e salva no GCS.
+        
+        Args:
+            dados_proposicao: Dicionário com dados da proposição
+            resultado: Resultado parcial de baixar_pdf_proposicao
+            extracao: Resultado do PoolExtracaoPDF
+            
+        Returns:
+            Dicionário com resultado do processamento
+        """
+        resultado['metricas_extracao'] = metricas_extracao(extracao)
+        
+        try:
+            texto = self.texto_utils.montar_texto_extraido(extracao)
             if not texto:
-                resultado['erro'] = 'Não foi possível extrair texto do PDF'
+                resultado['erro'] = (
+                    'Timeout na extração do PDF' if extracao['status'] == 'timeout'
+                    else 'Não foi possível extrair texto do PDF'
+                )
                 return resultado
             
             resultado['texto_extraido'] = texto
@@ -223,6 +275,26 @@ class PDFColetaManager:
         
         return None
     
+    def _selecionar_estrategia(self, dados_proposicao: Dict) -> Optional[PDFColetaStrategy]:
+        """Primeira estratégia, em ordem de prioridade, capaz de processar os dados."""
+        for estrategia in self.estrategias:
+            if estrategia.pode_processar(dados_proposicao):
+                logger.debug(f"Usando estratégia: {estrategia.__class__.__name__}")
+                return estrategia
+        return None
+    
+    def _resultado_sem_estrategia(self, dados_proposicao: Dict) -> Dict[str, Any]:
+        return {
+            'proposicao_id': dados_proposicao.get('id'),
+            'sucesso': False,
+            'url_pdf': None,
+            'texto_extraido': None,
+            'gcs_url': None,
+            'erro': 'Nenhuma estratégia disponível para este formato de JSON',
+            'estrategia': 'Nenhuma',
+            'metricas_extracao': None
+        }
+    
     def coletar_pdf_proposicao(self, dados_proposicao: Dict) -> Dict[str, Any]:
         """
         Coleta PDF de uma proposição usando a estratégia adequada.
@@ -233,28 +305,23 @@ class PDFColetaManager:
         Returns:
             Dicionário com resultado da coleta
         """
-        # Tentar cada estratégia em ordem de prioridade
-        for estrategia in self.estrategias:
-            if estrategia.pode_processar(dados_proposicao):
-                logger.debug(f"Usando estratégia: {estrategia.__class__.__name__}")
-                return estrategia.processar_proposicao(dados_proposicao)
+        estrategia = self._selecionar_estrategia(dados_proposicao)
+        if estrategia:
+            return estrategia.processar_proposicao(dados_proposicao)
         
         # Nenhuma estratégia funcionou
-        return {
-            'proposicao_id': dados_proposicao.get('id'),
-            'sucesso': False,
-            'url_pdf': None,
-            'texto_extraido': None,
-            'gcs_url': None,
-            'erro': 'Nenhuma estratégia disponível para este formato de JSON',
-            'estrategia': 'Nenhuma'
-        }
+        return self._resultado_sem_estrategia(dados_proposicao)
     
     def coletar_lote_proposicoes(self, lista_proposicoes: List[Dict], 
                                 delay_segundos: float = 2.0) -> Dict[str, Any]:
         """
         Coleta PDFs para uma lista de proposições.
         
+        Os downloads seguem em sequência (com o delay); a extração de cada PDF
+        é enviada ao pool de processos sem esperar, e o texto é salvo no GCS
+        conforme as extrações terminam. No máximo 2x max_workers PDFs ficam
+        em memória aguardando extração: acima disso o download espera.
+        
         Args:
             lista_proposicoes: Lista de dicionários com dados das proposições
             delay_segundos: Delay entre requisições para evitar rate limiting
@@ -270,31 +337,48 @@ class PDFColetaManager:
             'falha': 0,
             'estrategias_usadas': {},
             'erros': [],
-            'resultados': []
+            'resultados': [],
+            'extracao': {'documentos': 0, 'timeouts': 0, 'duracao_total_s': 0.0, 'cpu_total_s': 0.0}
         }
         
+        pool = get_pool_extracao_pdf()
+        max_pendentes = 2 * pool.max_workers
+        pendentes = {}
+        
+        def concluir(futuro):
+            # Salva o texto de uma extração terminada
+            estrategia, dados_prop, resultado = pendentes.pop(futuro)
+            try:
+                resultado = estrategia.concluir_proposicao(dados_prop, resultado, futuro.result())
+                self._contabilizar_resultado(estatisticas, resultado)
+            except Exception as e:
+                estatisticas['falha'] += 1
+                erro_msg = f"Erro crítico {dados_prop.get('id', 'desconhecido')}: {str(e)}"
+                estatisticas['erros'].append(erro_msg)
+                logger.error(f"❌ {erro_msg}", exc_info=True)
+        
         for i, dados_prop in enumerate(lista_proposicoes, 1):
             prop_id = dados_prop.get('id', 'desconhecido')
             logger.info(f"📄 Processando {i}/{estatisticas['total']}: ID {prop_id}")
             
             try:
-                resultado = self.coletar_pdf_proposicao(dados_prop)
-                estatisticas['resultados'].append(resultado)
+                estrategia = self._selecionar_estrategia(dados_prop)
+                if not estrategia:
+                    self._contabilizar_resultado(estatisticas, self._resultado_sem_estrategia(dados_prop))
+                    continue
                 
-                # Atualizar estatísticas
-                if resultado['sucesso']:
-                    estatisticas['sucesso'] += 1
-                    logger.info(f"✅ Sucesso: {prop_id} ({resultado['estrategia']})")
-                else:
-                    estatisticas['falha'] += 1
-                    erro_msg = f"Falha {prop_id}: {resultado['erro']}"
-                    estatisticas['erros'].append(erro_msg)
-                    logger.error(f"❌ {erro_msg}")
+                # Limita os PDFs em memória: espera alguma extração terminar
+                while len(pendentes) >= max_pendentes:
+                    concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+                    for futuro in concluidos:
+                        concluir(futuro)
                 
-                # Contar estratégias usadas
-                estrategia = resultado['estrategia']
-                estatisticas['estrategias_usadas'][estrategia] = \
-                    estatisticas['estrategias_usadas'].get(estrategia, 0) + 1
+                resultado, pdf_bytes = estrategia.baixar_pdf_proposicao(dados_prop)
+                if pdf_bytes:
+                    futuro = pool.submeter(pdf_bytes, str(prop_id))
+                    pendentes[futuro] = (estrategia, dados_prop, resultado)
+                else:
+                    self._contabilizar_resultado(estatisticas, resultado)
                 
                 # Rate limiting
                 if delay_segundos > 0:
@@ -306,17 +390,52 @@ class PDFColetaManager:
                 estatisticas['erros'].append(erro_msg)
                 logger.error(f"❌ {erro_msg}", exc_info=True)
         
+        # Salvar os textos das extrações restantes conforme terminam
+        for futuro in as_completed(list(pendentes)):
+            concluir(futuro)
+        
         # Calcular taxa de sucesso
         estatisticas['taxa_sucesso'] = (
             (estatisticas['sucesso'] / estatisticas['total'] * 100) 
             if estatisticas['total'] > 0 else 0
         )
         
+        extracao = estatisticas['extracao']
         logger.info(f"📊 Coleta concluída: {estatisticas['sucesso']}/{estatisticas['total']} "
-                   f"({estatisticas['taxa_sucesso']:.1f}%)")
+                   f"({estatisticas['taxa_sucesso']:.1f}%) - {extracao['documentos']} PDFs extraídos "
+                   f"em {extracao['cpu_total_s']:.1f}s de CPU, {extracao['timeouts']} timeouts")
         
         return estatisticas
     
+    def _contabilizar_resultado(self, estatisticas: Dict[str, Any], resultado: Dict[str, Any]):
+        """Acumula um resultado de proposição nas estatísticas do lote."""
+        prop_id = resultado.get('proposicao_id', 'desconhecido')
+        estatisticas['resultados'].append(resultado)
+        
+        # Atualizar estatísticas
+        if resultado['sucesso']:
+            estatisticas['sucesso'] += 1
+            logger.info(f"✅ Sucesso: {prop_id} ({resultado['estrategia']})")
+        else:
+            estatisticas['falha'] += 1
+            erro_msg = f"Falha {prop_id}: {resultado['erro']}"
+            estatisticas['erros'].append(erro_msg)
+            logger.error(f"❌ {erro_msg}")
+        
+        # Contar estratégias usadas
+        estrategia = resultado['estrategia']
+        estatisticas['estrategias_usadas'][estrategia] = \
+            estatisticas['estrategias_usadas'].get(estrategia, 0) + 1
+        
+        # Métricas da extração
+        metricas = resultado.get('metricas_extracao')
+        if metricas:
+            extracao = estatisticas['extracao']
+            extracao['documentos'] += 1
+            extracao['timeouts'] += metricas['status'] == 'timeout'
+            extracao['duracao_total_s'] += metricas['duracao_s']
+            extracao['cpu_total_s'] += metricas['cpu_s']
+    
     def buscar_proposicoes_sem_texto(self, limite: int = 50, ano_minimo: int = 2023) -> List[Dict]:
         """
         Busca proposições que não têm texto no GCS.
@@ -12,7 +12,8 @@ from typing import Dict, List, Optional, Any
 
 from etl.coleta_emendas_transparencia import ColetorEmendasTransparencia
 from etl.coleta_proposicoes import ColetorProposicoes
-from etl.config import get_coleta_config, get_data_inicio_coleta, coleta_habilitada, get_tipos_coleta_habilitados
+from etl.config import get_config, get_coleta_config, get_data_inicio_coleta, coleta_habilitada, get_tipos_coleta_habilitados
+from etl.pipeline_estado import EstadoPipeline
 from utils.common_utils import setup_logging, clear_screen, exibir_menu
 
 logger = logging.getLogger(__name__)
@@ -40,6 +41,27 @@ class ColetaPipeline:
         self.referencia_etl = ColetorDadosCamara()
         self.proposicoes_etl = ColetorProposicoes()
         # Frequência removida conforme solicitado
+        
+        # Checkpoints da execução atual (None = sem retomada)
+        self.estado: Optional[EstadoPipeline] = None
+
+    def _iniciar_estado(self, pipeline: str, chave: str):
+        """Registra (ou retoma) a execução em pipeline_runs quando a retomada está habilitada."""
+        self.estado = None
+        if not get_config('performance', 'retomar_pipeline'):
+            return
+        try:
+            estado = EstadoPipeline(pipeline, chave)
+            estado.iniciar()
+            self.estado = estado
+        except Exception as e:
+            logger.warning(f"⚠️ Checkpoints indisponíveis ({e}) - execução sem retomada")
+
+    def _finalizar_estado(self, resumo_execucao: Dict[str, Any]):
+        """Encerra a execução; só é marcada concluída se nenhuma etapa falhou."""
+        if self.estado:
+            sucesso = all(e.get("status") == "sucesso" for e in resumo_execucao["etapas"].values())
+            self.estado.finalizar(sucesso)
 
     def _executar_etapa(
         self,
@@ -47,21 +69,40 @@ class ColetaPipeline:
         funcao_etl,
         ano: Optional[int] = None,
         ids_deputados: Optional[List[str]] = None,
+        chave_etapa: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
         Executa uma etapa da ETL com tratamento de erro e logging.
 
+        Com checkpoints ativos e `chave_etapa` informada, etapas já concluídas na
+        execução retomada são puladas e a função recebe `checkpoint`
+        (CheckpointEtapa) para continuar do último cursor salvo.
+
         Args:
             nome_etapa: Nome descritivo da etapa.
             funcao_etl: Função ETL a ser executada.
             ano: Ano alvo para a coleta.
             ids_deputados: Lista de IDs dos deputados.
+            chave_etapa: Identificador da etapa em pipeline_stage_state.
             **kwargs: Argumentos adicionais para a função ETL.
 
         Returns:
             Dicionário com o resultado da etapa.
         """
+        usar_checkpoint = self.estado is not None and chave_etapa is not None
+        if usar_checkpoint:
+            contagens = self.estado.contagens_etapa_concluida(chave_etapa)
+            if contagens is not None:
+                logger.info(f"⏭️ Etapa '{nome_etapa}' já concluída nesta execução - pulando")
+                return {
+                    "status": "sucesso",
+                    "duracao": 0.0,
+                    "dados": contagens,
+                    "pulada": True,
+                }
+            kwargs["checkpoint"] = self.estado.iniciar_etapa(chave_etapa)
+
         logger.info(f"🚀 Iniciando etapa: {nome_etapa}")
         inicio = time.time()
 
@@ -79,6 +120,10 @@ class ColetaPipeline:
             duracao = fim - inicio
 
             logger.info(f"✅ Etapa '{nome_etapa}' concluída com sucesso em {duracao:.1f}s.")
+            if usar_checkpoint:
+                self.estado.concluir_etapa(
+                    chave_etapa, resultado if isinstance(resultado, dict) else {"total": resultado}
+                )
             return {
                 "status": "sucesso",
                 "duracao": duracao,
@@ -87,6 +132,8 @@ class ColetaPipeline:
 
         except Exception as e:
             logger.error(f"❌ Erro na etapa '{nome_etapa}': {str(e)}", exc_info=True)
+            if usar_checkpoint:
+                self.estado.falhar_etapa(chave_etapa, str(e))
             return {
                 "status": "erro",
                 "duracao": time.time() - inicio,
@@ -116,6 +163,7 @@ class ColetaPipeline:
             "etapas": {},
             "inicio": datetime.now().isoformat(),
         }
+        self._iniciar_estado("etl_anual", str(ano))
 
         # Etapa 1: Coleta de Dados de Referência
         print(f"\n{'='*60}")
@@ -128,7 +176,8 @@ class ColetaPipeline:
         try:
             resumo_execucao["etapas"]["referencia"] = self._executar_etapa(
                 "Coleta de Referência",
-                lambda: self.referencia_etl.executar_coleta_completa(db_session)
+                lambda checkpoint=None: self.referencia_etl.executar_coleta_completa(db_session, checkpoint=checkpoint),
+                chave_etapa="referencia"
             )
         finally:
             db_session.close()
@@ -145,7 +194,8 @@ class ColetaPipeline:
         try:
             resumo_execucao["etapas"]["emendas"] = self._executar_etapa(
                 "Coleta de Emendas",
-                lambda: self.emendas_etl.coletar_emendas_periodo(ano, db=db_session)
+                lambda checkpoint=None: self.emendas_etl.coletar_emendas_periodo(ano, db=db_session, checkpoint=checkpoint),
+                chave_etapa="emendas"
             )
         finally:
             db_session.close()
@@ -157,6 +207,7 @@ class ColetaPipeline:
         print("   ❌ Votações e Proposições foram removidos - evolução futura")
 
         resumo_execucao["fim"] = datetime.now().isoformat()
+        self._finalizar_estado(resumo_execucao)
         self._exibir_resumo_final(resumo_execucao)
 
         return resumo_execucao
@@ -186,6 +237,7 @@ class ColetaPipeline:
             "etapas": {},
             "inicio": datetime.now().isoformat(),
         }
+        self._iniciar_estado("configurado", str(data_inicio))
 
         # Executar apenas coletores habilitados (exceto proposições)
         if coleta_habilitada('referencia'):
@@ -199,7 +251,8 @@ class ColetaPipeline:
             try:
                 resumo_execucao["etapas"]["referencia"] = self._executar_etapa(
                     "Coleta de Referência",
-                    lambda: self.referencia_etl.executar_coleta_completa(db_session)
+                    lambda checkpoint=None: self.referencia_etl.executar_coleta_completa(db_session, checkpoint=checkpoint),
+                    chave_etapa="referencia"
                 )
             finally:
                 db_session.close()
@@ -218,7 +271,8 @@ class ColetaPipeline:
             resumo_execucao["etapas"]["emendas"] = self._executar_etapa(
                 "Coleta de Emendas",
                 self.emendas_etl.coletar_emendas_periodo,
-                ano=2024  # Usar 2024 pois API não tem dados de 2025
+                ano=2024,  # Usar 2024 pois API não tem dados de 2025
+                chave_etapa="emendas"
             )
 
         # Coleta de Proposições com GCS
@@ -231,10 +285,21 @@ class ColetaPipeline:
             config_props = get_coleta_config('proposicoes')
             ano_coleta = config_props.get('ano_coleta', 2025)
             limite_deputados = config_props.get('limite_deputados_api', 50)
+            modo_delta = config_props.get('modo_delta', False)
             
             resumo_execucao["etapas"]["proposicoes"] = self._executar_etapa(
                 "Coleta de Proposições",
-                lambda: self.proposicoes_etl.coletar_por_json(ano_coleta)
+                lambda checkpoint=None: self.proposicoes_etl.coletar_por_json(ano_coleta, delta=modo_delta),
+                chave_etapa="proposicoes"
+            )
+            
+            # Textos completos: worker concorrente da fila, separado da carga de metadados
+            print(f"\n📄 Processando fila de textos completos...")
+            from etl.fila_textos_module import ProcessadorFilaTextos
+            resumo_execucao["etapas"]["textos_proposicoes"] = self._executar_etapa(
+                "Textos de Proposições",
+                lambda checkpoint=None: ProcessadorFilaTextos().processar_fila(),
+                chave_etapa="textos_proposicoes"
             )
 
         # Votações e Frequência removidos - Evolução Futura
@@ -245,6 +310,7 @@ class ColetaPipeline:
             print("   ❌ Votações e Frequência foram removidos - evolução futura")
 
         resumo_execucao["fim"] = datetime.now().isoformat()
+        self._finalizar_estado(resumo_execucao)
         self._exibir_resumo_final_configurado(resumo_execucao)
 
         return resumo_execucao
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Checkpoints do pipeline de coleta
+
+Cada execução do pipeline é registrada em pipeline_runs e cada etapa em
+pipeline_stage_state (status, cursor e contagens). Ao reexecutar um pipeline
+que falhou, a execução anterior é retomada: etapas concluídas são puladas e
+etapas interrompidas recomeçam do último cursor salvo.
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+from models.db_utils import get_db_session
+from models.sistema_models import PipelineRun, PipelineStageState
+from etl.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+def _serializavel(valor: Any) -> Any:
+    """Converte contagens/cursor para tipos aceitos em JSONB."""
+    return json.loads(json.dumps(valor, default=str))
+
+
+class CheckpointEtapa:
+    """
+    Cursor de retomada entregue à função da etapa.
+
+    A etapa lê `cursor`/`contagens` ao iniciar e chama `salvar()` sempre que
+    confirma (commit) uma parte do trabalho.
+    """
+
+    def __init__(self, estado: "EstadoPipeline", etapa: str, cursor: Optional[Dict] = None,
+                 contagens: Optional[Dict] = None):
+        self.estado = estado
+        self.etapa = etapa
+        self.cursor: Dict[str, Any] = dict(cursor or {})
+        self.contagens: Dict[str, Any] = dict(contagens or {})
+
+    @property
+    def retomando(self) -> bool:
+        """True se a etapa já tinha progresso salvo."""
+        return bool(self.cursor)
+
+    def salvar(self, cursor: Optional[Dict] = None, **contagens):
+        """
+        Persiste o cursor e as contagens acumuladas da etapa.
+
+        Args:
+            cursor: Novo cursor (substitui o anterior)
+            **contagens: Contagens a atualizar
+        """
+        if cursor is not None:
+            self.cursor = dict(cursor)
+        self.contagens.update(contagens)
+        self.estado.salvar_checkpoint(self.etapa, self.cursor, self.contagens)
+
+
+class EstadoPipeline:
+    """Registro e retomada de execuções do pipeline em pipeline_runs/pipeline_stage_state"""
+
+    def __init__(self, pipeline: str, chave: str, janela_retomada_horas: Optional[int] = None):
+        """
+        Args:
+            pipeline: Nome do pipeline (ex.: etl_anual)
+            chave: Parâmetros que identificam a execução (ex.: ano alvo)
+            janela_retomada_horas: Execuções falhas mais antigas que isso não são retomadas
+        """
+        self.pipeline = pipeline
+        self.chave = str(chave)
+        self.janela_retomada_horas = janela_retomada_horas or get_config('performance', 'janela_retomada_horas') or 24
+        self.run_id: Optional[int] = None
+
+    def iniciar(self) -> int:
+        """
+        Retoma a última execução não concluída (dentro da janela) ou cria uma nova.
+
+        Returns:
+            ID da execução em pipeline_runs
+        """
+        session = get_db_session()
+        try:
+            limite = datetime.now() - timedelta(hours=self.janela_retomada_horas)
+            anterior = session.query(PipelineRun).filter(
+                PipelineRun.pipeline == self.pipeline,
+                PipelineRun.chave == self.chave,
+                PipelineRun.status != 'concluido',
+                PipelineRun.iniciado_em >= limite
+            ).order_by(PipelineRun.id.desc()).first()
+
+            if anterior:
+                anterior.status = 'em_andamento'
+                anterior.finalizado_em = None
+                session.commit()
+                self.run_id = anterior.id
+                concluidas = [e.etapa for e in anterior.etapas if e.status == 'concluido']
+                logger.info(
+                    f"♻️ Retomando execução {self.run_id} de '{self.pipeline}' ({self.chave}) - "
+                    f"etapas concluídas: {', '.join(concluidas) or 'nenhuma'}"
+                )
+            else:
+                run = PipelineRun(pipeline=self.pipeline, chave=self.chave, status='em_andamento')
+                session.add(run)
+                session.commit()
+                self.run_id = run.id
+                logger.info(f"🆕 Execução {self.run_id} de '{self.pipeline}' ({self.chave}) registrada")
+
+            return self.run_id
+        finally:
+            session.close()
+
+    def _obter_etapa(self, session, etapa: str) -> PipelineStageState:
+        """Busca (ou cria) o estado da etapa na execução atual."""
+        estado = session.query(PipelineStageState).filter_by(run_id=self.run_id, etapa=etapa).first()
+        if estado is None:
+            estado = PipelineStageState(run_id=self.run_id, etapa=etapa, status='pendente')
+            session.add(estado)
+        return estado
+
+    def contagens_etapa_concluida(self, etapa: str) -> Optional[Dict[str, Any]]:
+        """
+        Args:
+            etapa: Nome da etapa
+
+        Returns:
+            Contagens da etapa se já concluída nesta execução, senão None
+        """
+        session = get_db_session()
+        try:
+            estado = session.query(PipelineStageState).filter_by(
+                run_id=self.run_id, etapa=etapa, status='concluido'
+            ).first()
+            return (estado.contagens or {}) if estado else None
+        finally:
+            session.close()
+
+    def iniciar_etapa(self, etapa: str) -> CheckpointEtapa:
+        """
+        Marca a etapa como em andamento e devolve o checkpoint salvo.
+
+        Args:
+            etapa: Nome da etapa
+
+        Returns:
+            CheckpointEtapa com o cursor da tentativa anterior (se houver)
+        """
+        session = get_db_session()
+        try:
+            estado = self._obter_etapa(session, etapa)
+            estado.status = 'em_andamento'
+            estado.erro = None
+            estado.iniciado_em = estado.iniciado_em or datetime.now()
+            session.commit()
+            if estado.cursor:
+                logger.info(f"📍 Etapa '{etapa}' retomada do cursor {estado.cursor}")
+            return CheckpointEtapa(self, etapa, estado.cursor, estado.contagens)
+        finally:
+            session.close()
+
+    def salvar_checkpoint(self, etapa: str, cursor: Dict[str, Any], contagens: Dict[str, Any]):
+        """Grava cursor e contagens da etapa (sessão própria, independente da etapa)."""
+        session = get_db_session()
+        try:
+            estado = self._obter_etapa(session, etapa)
+            estado.cursor = _serializavel(cursor)
+            estado.contagens = _serializavel(contagens)
+            session.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao salvar checkpoint da etapa '{etapa}': {e}")
+            session.rollback()
+        finally:
+            session.close()
+
+    def concluir_etapa(self, etapa: str, contagens: Dict[str, Any]):
+        """Marca a etapa como concluída com suas contagens finais."""
+        self._finalizar_etapa(etapa, 'concluido', contagens=contagens)
+
+    def falhar_etapa(self, etapa: str, erro: str):
+        """Marca a etapa com erro, preservando o cursor para a próxima tentativa."""
+        self._finalizar_etapa(etapa, 'erro', erro=erro)
+
+    def _finalizar_etapa(self, etapa: str, status: str, contagens: Optional[Dict] = None, erro: Optional[str] = None):
+        session = get_db_session()
+        try:
+            estado = self._obter_etapa(session, etapa)
+            estado.status = status
+            estado.erro = erro
+            estado.finalizado_em = datetime.now()
+            if contagens is not None:
+                estado.contagens = _serializavel(contagens)
+            session.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao registrar status da etapa '{etapa}': {e}")
+            session.rollback()
+        finally:
+            session.close()
+
+    def finalizar(self, sucesso: bool):
+        """
+        Encerra a execução.
+
+        Args:
+            sucesso: True se todas as etapas concluíram (execução não será retomada)
+        """
+        session = get_db_session()
+        try:
+            run = session.query(PipelineRun).get(self.run_id)
+            if run:
+                run.status = 'concluido' if sucesso else 'erro'
+                run.finalizado_em = datetime.now()
+                session.commit()
+        finally:
+            session.close()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Regeneração do ranking de emendas por deputado
+
+Único caminho de escrita de ranking_emendas, usado pelos coletores de CSV,
+API genérica e Portal da Transparência. O ranking de um ano é substituído
+por inteiro em uma transação: DELETE das linhas do ano seguido de um único
+INSERT ... SELECT que agrega emendas_parlamentares e atribui as posições
+com funções de janela. Rodar de novo produz o mesmo resultado.
+
+Autor: Kritikos Team
+"""
+
+import logging
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Serializa regenerações concorrentes do mesmo ano (lock liberado no commit)
+SQL_LOCK_RANKING = text("SELECT pg_advisory_xact_lock(hashtext('ranking_emendas'), :ano)")
+
+SQL_LIMPAR_RANKING = text("DELETE FROM ranking_emendas WHERE ano_referencia = :ano")
+
+SQL_INSERIR_RANKING = text("""
+    WITH base AS (
+        SELECT deputado_id,
+               EXTRACT(MONTH FROM data_apresentacao)::int AS mes,
+               valor_emenda,
+               COALESCE(valor_pago, 0) AS valor_pago,
+               municipio_beneficiario,
+               uf_beneficiario
+        FROM emendas_parlamentares
+        WHERE ano = :ano
+          AND deputado_id IS NOT NULL
+          AND valor_emenda > 0
+    ),
+    agregado AS (
+        SELECT deputado_id,
+               mes,
+               COUNT(*) AS quantidade,
+               SUM(valor_emenda) AS valor_total,
+               AVG(valor_emenda) AS valor_medio,
+               SUM(valor_pago) AS valor_executado,
+               AVG(LEAST(valor_pago / valor_emenda * 100, 100)) AS percentual_execucao,
+               COUNT(DISTINCT municipio_beneficiario) AS municipios,
+               COUNT(DISTINCT uf_beneficiario) AS ufs
+        FROM base
+        GROUP BY GROUPING SETS ((deputado_id), (deputado_id, mes))
+        -- Descarta o grupo mensal de emendas sem data (colidiria com o anual)
+        HAVING GROUPING(mes) = 1 OR mes IS NOT NULL
+    )
+    INSERT INTO ranking_emendas (
+        deputado_id, ano_referencia, mes_referencia,
+        quantidade_emendas, valor_total_emendas, valor_medio_emenda,
+        valor_total_executado, percentual_execucao_medio,
+        ranking_quantidade, ranking_valor, ranking_execucao,
+        quantidade_municipios_beneficiados, quantidade_ufs_beneficiadas
+    )
+    SELECT deputado_id, :ano, mes,
+           quantidade, valor_total, valor_medio,
+           valor_executado, percentual_execucao,
+           RANK() OVER (PARTITION BY mes ORDER BY quantidade DESC),
+           RANK() OVER (PARTITION BY mes ORDER BY valor_total DESC),
+           RANK() OVER (PARTITION BY mes ORDER BY valor_executado DESC),
+           municipios, ufs
+    FROM agregado
+    ORDER BY mes NULLS FIRST, valor_total DESC, deputado_id
+""")
+
+
+def regenerar_ranking_emendas(db, ano: int) -> int:
+    """
+    Substitui atomicamente o ranking do ano (anual + mensal)
+
+    Em caso de erro a transação é desfeita e o ranking anterior permanece.
+
+    Args:
+        db: Sessão do banco
+        ano: Ano de referência
+
+    Returns:
+        int: Quantidade de linhas de ranking gravadas
+    """
+    try:
+        db.execute(SQL_LOCK_RANKING, {'ano': ano})
+        db.execute(SQL_LIMPAR_RANKING, {'ano': ano})
+        resultado = db.execute(SQL_INSERIR_RANKING, {'ano': ano})
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return resultado.rowcount
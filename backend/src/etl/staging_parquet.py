@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Área de staging colunar (Parquet) para as fontes brutas
+
+Cada arquivo baixado (ZIP de emendas, proposicoes-{ano}.json) é convertido uma
+única vez em arquivos Parquet particionados por ano/tipo, identificados pelo
+checksum SHA-256 do arquivo de origem:
+
+    {diretorio}/{fonte}/{checksum}/ano=2025/tipo=PL/parte-00000.parquet
+
+Reprocessamentos e backfills do mesmo arquivo leem só as partições
+necessárias, sem rede nem parse de texto. O pyarrow é opcional: sem ele o
+staging fica desabilitado e os coletores leem a fonte original como antes.
+
+Autor: Kritikos Team
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import unicodedata
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Dict, List, Any, Iterable, Iterator, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - engine do DataFrame.to_parquet/read_parquet
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from .config import get_config
+except ImportError:
+    # Fallback para execução direta
+    from etl.config import get_config
+
+logger = logging.getLogger(__name__)
+
+MARCADOR_CONCLUIDO = '_SUCESSO'
+ARQUIVO_MANIFESTO = 'manifesto.json'
+VALOR_PARTICAO_VAZIO = 'SEM_VALOR'
+
+
+def checksum_arquivo(caminho: Path, tamanho_bloco: int = 1024 * 1024) -> str:
+    """
+    SHA-256 do arquivo, lido em blocos
+
+    Args:
+        caminho: Arquivo de origem
+        tamanho_bloco: Bytes por leitura
+
+    Returns:
+        str: Hash hexadecimal
+    """
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def valor_particao(valor: Any) -> str:
+    """Valor seguro para nome de diretório (sem acentos, maiúsculo, '_' no lugar de separadores)."""
+    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
+        return VALOR_PARTICAO_VAZIO
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    texto = unicodedata.normalize('NFKD', str(valor))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    texto = re.sub(r'[^A-Za-z0-9]+', '_', texto).strip('_').upper()[:60]
+    return texto or VALOR_PARTICAO_VAZIO
+
+
+def _preparar_para_parquet(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte colunas object com tipos mistos para texto (o pyarrow exige tipo único por coluna)."""
+    df = df.copy()
+    for nome in df.columns:
+        if df[nome].dtype == object:
+            df[nome] = df[nome].where(df[nome].isna(), df[nome].astype(str))
+    return df
+
+
+class GravadorStaging:
+    """
+    Acumula DataFrames de uma fonte e grava os arquivos Parquet por partição
+
+    Os arquivos vão para um diretório temporário e só viram dataset válido em
+    concluir(); uma leitura interrompida nunca deixa staging parcial visível.
+    """
+
+    def __init__(self, area: "AreaStaging", fonte: str, checksum: str,
+                 colunas_particao: Tuple[str, str], linhas_por_arquivo: int):
+        self.area = area
+        self.fonte = fonte
+        self.checksum = checksum
+        self.colunas_particao = colunas_particao
+        self.linhas_por_arquivo = linhas_por_arquivo
+        self.diretorio_tmp = area.diretorio_dataset(fonte, checksum).with_name(f"{checksum}.tmp")
+        self.linhas = 0
+
+        self._buffers: Dict[Tuple[str, str], List[pd.DataFrame]] = {}
+        self._linhas_buffer: Dict[Tuple[str, str], int] = {}
+        self._partes: Dict[Tuple[str, str], int] = {}
+
+        shutil.rmtree(self.diretorio_tmp, ignore_errors=True)
+        self.diretorio_tmp.mkdir(parents=True)
+
+    def adicionar(self, df: pd.DataFrame):
+        """
+        Acrescenta um chunk ao staging
+
+        Args:
+            df: Chunk com as colunas de partição (ex.: 'ano', 'tipo_emenda')
+        """
+        if df.empty:
+            return
+
+        coluna_ano, coluna_tipo = self.colunas_particao
+        chaves = pd.DataFrame({
+            'ano': df[coluna_ano].map(valor_particao) if coluna_ano in df.columns else VALOR_PARTICAO_VAZIO,
+            'tipo': df[coluna_tipo].map(valor_particao) if coluna_tipo in df.columns else VALOR_PARTICAO_VAZIO
+        }, index=df.index)
+
+        for (ano, tipo), grupo in df.groupby([chaves['ano'], chaves['tipo']], sort=False):
+            particao = (ano, tipo)
+            self._buffers.setdefault(particao, []).append(grupo)
+            self._linhas_buffer[particao] = self._linhas_buffer.get(particao, 0) + len(grupo)
+            if self._linhas_buffer[particao] >= self.linhas_por_arquivo:
+                self._gravar_particao(particao)
+
+        self.linhas += len(df)
+
+        # Limita a memória quando há muitas partições pequenas
+        if sum(self._linhas_buffer.values()) >= self.linhas_por_arquivo * 4:
+            for particao in list(self._buffers):
+                self._gravar_particao(particao)
+
+    def adicionar_registros(self, registros: List[Dict[str, Any]]):
+        """
+        Acrescenta registros JSON (ex.: proposições)
+
+        Campos escalares viram colunas; o registro completo é guardado em
+        'registro_json' para ser devolvido intacto na leitura.
+        """
+        if not registros:
+            return
+        linhas = [
+            {
+                **{chave: valor for chave, valor in registro.items() if not isinstance(valor, (dict, list))},
+                'registro_json': json.dumps(registro, ensure_ascii=False)
+            }
+            for registro in registros
+        ]
+        self.adicionar(pd.DataFrame(linhas))
+
+    def _gravar_particao(self, particao: Tuple[str, str]):
+        """Grava o buffer de uma partição em um novo arquivo Parquet."""
+        partes = self._buffers.pop(particao, None)
+        self._linhas_buffer.pop(particao, None)
+        if not partes:
+            return
+
+        ano, tipo = particao
+        diretorio = self.diretorio_tmp / f"ano={ano}" / f"tipo={tipo}"
+        diretorio.mkdir(parents=True, exist_ok=True)
+        numero = self._partes.get(particao, 0)
+        self._partes[particao] = numero + 1
+
+        df = _preparar_para_parquet(pd.concat(partes, ignore_index=True))
+        df.to_parquet(diretorio / f"parte-{numero:05d}.parquet", index=False)
+
+    def concluir(self, arquivo_origem: Optional[str] = None):
+        """Grava os buffers restantes e publica o dataset (substitui versões anteriores da fonte)."""
+        for particao in list(self._buffers):
+            self._gravar_particao(particao)
+
+        (self.diretorio_tmp / MARCADOR_CONCLUIDO).touch()
+        destino = self.area.diretorio_dataset(self.fonte, self.checksum)
+        shutil.rmtree(destino, ignore_errors=True)
+        os.replace(self.diretorio_tmp, destino)
+
+        self.area._registrar_manifesto(self.fonte, {
+            'checksum': self.checksum,
+            'arquivo_origem': arquivo_origem,
+            'linhas': self.linhas,
+            'particoes': len(self._partes),
+            'gerado_em': datetime.now().isoformat()
+        })
+        self.area._remover_versoes_antigas(self.fonte, self.checksum)
+        logger.info(f"🗂️ Staging {self.fonte} pronto: {self.linhas} linhas em {len(self._partes)} partições")
+
+    def descartar(self):
+        """Remove os arquivos parciais (leitura interrompida ou com erro)."""
+        self._buffers.clear()
+        self._linhas_buffer.clear()
+        shutil.rmtree(self.diretorio_tmp, ignore_errors=True)
+
+
+class AreaStaging:
+    """
+    Diretório de staging Parquet compartilhado pelos coletores
+
+    Uso:
+        area = AreaStaging()
+        checksum = checksum_arquivo(zip_path)
+        if area.disponivel('emendas_csv', checksum):
+            for df in area.ler('emendas_csv', checksum, ano=2025): ...
+        else:
+            gravador = area.gravador('emendas_csv', checksum, ('ano', 'tipo_emenda'))
+            ...
+            gravador.concluir()
+    """
+
+    def __init__(self, diretorio: Optional[str] = None):
+        config = get_config('staging')
+        self.habilitado = bool(config.get('habilitado', True)) and PYARROW_AVAILABLE
+        self.diretorio = Path(diretorio or config['diretorio']).resolve()
+        self.linhas_por_arquivo = config.get('linhas_por_arquivo', 50000)
+
+        if config.get('habilitado', True) and not PYARROW_AVAILABLE:
+            logger.warning("⚠️ pyarrow não instalado - staging Parquet desabilitado")
+
+    def diretorio_dataset(self, fonte: str, checksum: str) -> Path:
+        """Diretório do dataset de uma versão (checksum) da fonte."""
+        return self.diretorio / fonte / checksum
+
+    def disponivel(self, fonte: str, checksum: str) -> bool:
+        """True se a versão da fonte já foi convertida por completo."""
+        return self.habilitado and (self.diretorio_dataset(fonte, checksum) / MARCADOR_CONCLUIDO).exists()
+
+    def ultimo_checksum(self, fonte: str, validade_horas: Optional[float] = None) -> Optional[str]:
+        """
+        Checksum da última versão publicada da fonte
+
+        Args:
+            fonte: Nome da fonte no staging
+            validade_horas: Ignora versões geradas há mais tempo que isso
+
+        Returns:
+            str: Checksum ou None se não houver versão válida
+        """
+        manifesto = self._ler_manifesto(fonte)
+        checksum = manifesto.get('checksum')
+        if not checksum or not self.disponivel(fonte, checksum):
+            return None
+        if validade_horas is not None:
+            gerado_em = datetime.fromisoformat(manifesto['gerado_em'])
+            if datetime.now() - gerado_em > timedelta(hours=validade_horas):
+                return None
+        return checksum
+
+    def gravador(self, fonte: str, checksum: str, colunas_particao: Tuple[str, str]) -> Optional[GravadorStaging]:
+        """
+        Novo gravador para uma versão da fonte (None se o staging estiver desabilitado)
+
+        Args:
+            fonte: Nome da fonte no staging
+            checksum: Checksum do arquivo de origem
+            colunas_particao: Colunas (ano, tipo) usadas nas partições
+        """
+        if not self.habilitado:
+            return None
+        return GravadorStaging(self, fonte, checksum, colunas_particao, self.linhas_por_arquivo)
+
+    def ler(self, fonte: str, checksum: str, ano: Optional[int] = None,
+            tipos: Optional[Iterable[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Lê o dataset arquivo por arquivo, só nas partições pedidas
+
+        Args:
+            fonte: Nome da fonte no staging
+            checksum: Versão a ler
+            ano: Partição de ano (None = todas)
+            tipos: Partições de tipo (None = todas)
+
+        Yields:
+            pd.DataFrame: Conteúdo de cada arquivo Parquet
+        """
+        base = self.diretorio_dataset(fonte, checksum)
+        padrao_ano = f"ano={valor_particao(ano)}" if ano is not None else "ano=*"
+        tipos_aceitos = {valor_particao(t) for t in tipos} if tipos else None
+
+        for diretorio_tipo in sorted(base.glob(f"{padrao_ano}/tipo=*")):
+            if tipos_aceitos and diretorio_tipo.name.split('=', 1)[1] not in tipos_aceitos:
+                continue
+            for arquivo in sorted(diretorio_tipo.glob('*.parquet')):
+                yield pd.read_parquet(arquivo)
+
+    def ler_registros(self, fonte: str, checksum: str, ano: Optional[int] = None,
+                      tipos: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Registros JSON originais gravados com adicionar_registros()."""
+        for df in self.ler(fonte, checksum, ano, tipos):
+            for registro_json in df['registro_json']:
+                yield json.loads(registro_json)
+
+    def _ler_manifesto(self, fonte: str) -> Dict[str, Any]:
+        try:
+            with open(self.diretorio / fonte / ARQUIVO_MANIFESTO, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _registrar_manifesto(self, fonte: str, dados: Dict[str, Any]):
+        caminho = self.diretorio / fonte / ARQUIVO_MANIFESTO
+        caminho_tmp = caminho.with_suffix('.tmp')
+        with open(caminho_tmp, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, indent=2)
+        os.replace(caminho_tmp, caminho)
+
+    def _remover_versoes_antigas(self, fonte: str, checksum_atual: str):
+        for diretorio in (self.diretorio / fonte).iterdir():
+            if diretorio.is_dir() and diretorio.name != checksum_atual:
+                shutil.rmtree(diretorio, ignore_errors=True)
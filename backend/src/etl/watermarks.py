@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Marcas d'água das coletas incrementais
+
+Cada fonte de coleta (ex.: 'proposicoes_json:2025', 'proposicoes_api') guarda
+em coleta_watermarks até onde já foi carregada: maior data de apresentação
+vista, ETag/Last-Modified do arquivo de origem e a data usada como dataInicio
+nas consultas à API. Com isso as execuções diárias processam só o delta.
+"""
+
+import json
+import logging
+from typing import Dict, Any, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_WATERMARK = ('ultima_data_apresentacao', 'etag', 'last_modified', 'ultima_data_inicio', 'dados')
+
+
+def obter_watermark(session, fonte: str) -> Dict[str, Any]:
+    """
+    Lê a marca d'água de uma fonte.
+
+    Args:
+        session: Sessão do banco
+        fonte: Identificador da fonte de coleta
+
+    Returns:
+        Dicionário com os campos da marca d'água (vazio se a fonte nunca rodou)
+    """
+    try:
+        linha = session.execute(
+            text(f"SELECT {', '.join(CAMPOS_WATERMARK)} FROM coleta_watermarks WHERE fonte = :fonte"),
+            {'fonte': fonte}
+        ).mappings().first()
+        return dict(linha) if linha else {}
+    except Exception as e:
+        logger.warning(f"⚠️ Marca d'água de {fonte} indisponível ({e}) - coleta completa")
+        session.rollback()
+        return {}
+
+
+def salvar_watermark(session, fonte: str, **campos) -> bool:
+    """
+    Grava (upsert) a marca d'água de uma fonte e faz commit.
+
+    Só os campos informados são atualizados; os demais são preservados.
+
+    Args:
+        session: Sessão do banco
+        fonte: Identificador da fonte de coleta
+        **campos: ultima_data_apresentacao, etag, last_modified,
+                  ultima_data_inicio e/ou dados
+
+    Returns:
+        True se gravou com sucesso
+    """
+    invalidos = set(campos) - set(CAMPOS_WATERMARK)
+    if invalidos:
+        raise ValueError(f"Campos de marca d'água inválidos: {sorted(invalidos)}")
+    if 'dados' in campos and campos['dados'] is not None:
+        campos['dados'] = json.dumps(campos['dados'], default=str)
+
+    colunas = ', '.join(campos)
+    valores = ', '.join(f":{c}" for c in campos)
+    atualizacoes = ', '.join(f"{c} = EXCLUDED.{c}" for c in campos)
+
+    try:
+        session.execute(
+            text(f"""
+                INSERT INTO coleta_watermarks (fonte, {colunas}, updated_at)
+                VALUES (:fonte, {valores}, now())
+                ON CONFLICT (fonte) DO UPDATE SET {atualizacoes}, updated_at = now()
+            """),
+            {'fonte': fonte, **campos}
+        )
+        session.commit()
+        return True
+    except Exception as e:
+        logger.error(f"❌ Erro ao salvar marca d'água de {fonte}: {e}")
+        session.rollback()
+        return False
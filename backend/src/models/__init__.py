@@ -1,8 +1,8 @@
 from .base_models import Partido, Estado, Legislatura, ODS
 from .politico_models import Deputado, Mandato
-from .proposicao_models import Proposicao, Autoria, Votacao, VotoDeputado, ParecerCCJ
+from .proposicao_models import Proposicao, Autoria, Votacao, VotoDeputado, ParecerCCJ, FilaTextoProposicao
 from .financeiro_models import GastoParlamentar
 from .ranking_models import CalculoIDP, AvaliacaoPAR, SituacaoLegal
-from .sistema_models import Usuario, LogSistema
+from .sistema_models import Usuario, LogSistema, ColetaWatermark, PipelineRun, PipelineStageState
 from .frequencia_models import FrequenciaDeputado, DetalheFrequencia, RankingFrequencia, ResumoFrequenciaMensal
 from .analise_models import AnaliseProposicao, ScoreDeputado, LogProcessamento
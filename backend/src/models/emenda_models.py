@@ -3,7 +3,7 @@ Modelos de dados para emendas parlamentares
 Focus em APIs gratuitas da Câmara dos Deputados
 """
 
-from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey, Text, Boolean, TIMESTAMP, func
+from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey, Text, Boolean, TIMESTAMP, func, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -82,15 +82,18 @@ class EmendaParlamentar(Base):
 class ExecucaoEmenda(Base):
     """
     Acompanhamento da execução financeira das emendas
+    Um snapshot mensal por emenda, gravado só quando os valores mudam
+    (tabela particionada por ano_execucao)
     """
     __tablename__ = 'execucao_emendas'
     
-    id = Column(Integer, primary_key=True, index=True)
+    # PK composta com ano_execucao: sem autoincrement explícito o SQLAlchemy não usaria o SERIAL
+    id = Column(Integer, primary_key=True, autoincrement=True)
     emenda_id = Column(Integer, ForeignKey('emendas_parlamentares.id', ondelete="CASCADE"), nullable=False)
     
-    # Período de execução
-    ano_execucao = Column(Integer, nullable=False, index=True)
-    mes_execucao = Column(Integer, index=True)
+    # Período de execução (ano_execucao é a chave de partição)
+    ano_execucao = Column(Integer, primary_key=True)
+    mes_execucao = Column(Integer, nullable=False)
     data_referencia = Column(Date)
     
     # Valores financeiros
@@ -111,6 +114,12 @@ class ExecucaoEmenda(Base):
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     
     emenda = relationship("EmendaParlamentar", backref="execucoes")
+    
+    __table_args__ = (
+        UniqueConstraint('emenda_id', 'ano_execucao', 'mes_execucao', name='_execucao_emenda_mes_uc'),
+        Index('ix_execucao_emendas_periodo', 'ano_execucao', 'mes_execucao'),
+        {'postgresql_partition_by': 'RANGE (ano_execucao)'},
+    )
 
 class DetalheEmenda(Base):
     """
@@ -218,3 +227,9 @@ class RankingEmendas(Base):
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     
     deputado = relationship("Deputado", backref="rankings_emendas")
+    
+    __table_args__ = (
+        Index('ix_ranking_emendas_periodo_valor', 'ano_referencia', 'mes_referencia', 'ranking_valor'),
+        Index('ix_ranking_emendas_periodo_quantidade', 'ano_referencia', 'mes_referencia', 'ranking_quantidade'),
+        Index('ix_ranking_emendas_periodo_execucao', 'ano_referencia', 'mes_referencia', 'ranking_execucao'),
+    )
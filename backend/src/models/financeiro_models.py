@@ -21,5 +21,6 @@ class GastoParlamentar(Base):
     numero_documento = Column(String(255))
     numero_ressarcimento = Column(String(255))
     parcela = Column(Integer)
+    chave_documento = Column(String(64), unique=True, index=True)  # ideDocumento/codDocumento da CEAP (deduplicação)
 
     deputado = relationship("Deputado", back_populates="gastos")
@@ -143,3 +143,16 @@ class ParecerCCJ(Base):
 
     proposicao = relationship("Proposicao", back_populates="pareceres_ccj")
     relator = relationship("Deputado", back_populates="pareceres_relatados")
+
+class FilaTextoProposicao(Base):
+    """Fila persistente de jobs de download do inteiro teor (preenche proposicoes.gcs_url)"""
+    __tablename__ = 'fila_textos_proposicoes'
+    id = Column(Integer, primary_key=True, index=True)
+    proposicao_id = Column(Integer, ForeignKey('proposicoes.id', ondelete="CASCADE"), nullable=False, unique=True)
+    status = Column(String(20), nullable=False, default='pendente', index=True)  # pendente, processando, concluido, erro
+    tentativas = Column(Integer, nullable=False, default=0)
+    ultimo_erro = Column(Text)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    proposicao = relationship("Proposicao")
@@ -1,6 +1,6 @@
 # backend/src/models/sistema_models.py
 
-from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Text, Boolean, Date, TIMESTAMP, ForeignKey, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -31,3 +31,44 @@ class LogSistema(Base):
     created_at = Column(TIMESTAMP, server_default=func.now())
 
     usuario = relationship("Usuario", back_populates="logs")
+
+class ColetaWatermark(Base):
+    """Marca d'água por fonte de coleta, usada pelas coletas incrementais (modo delta)"""
+    __tablename__ = 'coleta_watermarks'
+    id = Column(Integer, primary_key=True, index=True)
+    fonte = Column(String(100), unique=True, nullable=False, index=True)  # ex.: proposicoes_json:2025, proposicoes_api
+    ultima_data_apresentacao = Column(Date)
+    etag = Column(String(255))
+    last_modified = Column(String(100))
+    ultima_data_inicio = Column(Date)
+    dados = Column(JSONB)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+class PipelineRun(Base):
+    """Execução de um pipeline de coleta (permite retomar execuções interrompidas)"""
+    __tablename__ = 'pipeline_runs'
+    id = Column(Integer, primary_key=True, index=True)
+    pipeline = Column(String(100), nullable=False, index=True)  # ex.: etl_anual, configurado
+    chave = Column(String(100), nullable=False)  # Parâmetros da execução (ex.: ano alvo)
+    status = Column(String(20), nullable=False, default='em_andamento')  # em_andamento, concluido, erro
+    iniciado_em = Column(TIMESTAMP, server_default=func.now())
+    finalizado_em = Column(TIMESTAMP)
+
+    etapas = relationship("PipelineStageState", back_populates="run", cascade="all, delete-orphan")
+
+class PipelineStageState(Base):
+    """Estado de uma etapa do pipeline: status, cursor de retomada e contagens"""
+    __tablename__ = 'pipeline_stage_state'
+    __table_args__ = (UniqueConstraint('run_id', 'etapa', name='_pipeline_stage_uc'),)
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey('pipeline_runs.id', ondelete='CASCADE'), nullable=False, index=True)
+    etapa = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False, default='pendente')  # pendente, em_andamento, concluido, erro
+    cursor = Column(JSONB)
+    contagens = Column(JSONB)
+    erro = Column(Text)
+    iniciado_em = Column(TIMESTAMP)
+    finalizado_em = Column(TIMESTAMP)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    run = relationship("PipelineRun", back_populates="etapas")
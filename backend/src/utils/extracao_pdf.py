@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Pool de processos para extração de texto de PDFs
+Isola pdfplumber/PyPDF2 em processos com timeout rígido por documento
+
+A extração é CPU-bound e, na thread de quem chama, serializa o lote e pode
+travá-lo inteiro com um único PDF patológico. Aqui cada documento vai para
+um processo do pool:
+
+- um processo por thread despachante (até max_workers em paralelo),
+  escalando com o número de núcleos
+- estouro do timeout mata o processo (kill) e um novo é criado na próxima
+  tarefa; o restante do lote segue normalmente
+- processos são reciclados após N documentos (vazamentos das bibliotecas)
+- cada resultado traz as páginas extraídas e métricas da extração
+"""
+
+import atexit
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# Tentar importar bibliotecas de PDF (também nos processos do pool)
+try:
+    import PyPDF2
+    PYPDF2_AVAILABLE = True
+except ImportError:
+    PYPDF2_AVAILABLE = False
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT_PADRAO_SEGUNDOS = 60
+DOCUMENTOS_POR_PROCESSO = 200
+
+
+# ----------------------------------------------------------------------
+# Lado do processo de extração
+# ----------------------------------------------------------------------
+
+def _paginas_pdfplumber(pdf_bytes: bytes, max_paginas: Optional[int], metricas: Dict[str, Any]) -> List:
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        metricas['paginas_total'] = len(pdf.pages)
+        return _extrair_paginas(pdf.pages[:max_paginas], metricas)
+
+
+def _paginas_pypdf2(pdf_bytes: bytes, max_paginas: Optional[int], metricas: Dict[str, Any]) -> List:
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    metricas['paginas_total'] = len(reader.pages)
+    return _extrair_paginas(list(reader.pages)[:max_paginas], metricas)
+
+
+def _extrair_paginas(paginas, metricas: Dict[str, Any]) -> List:
+    """Pares (número da página, texto) das páginas com texto."""
+    extraidas = []
+    for numero, pagina in enumerate(paginas, 1):
+        try:
+            texto = pagina.extract_text()
+        except Exception:
+            metricas['paginas_com_erro'] += 1
+            continue
+        if texto and texto.strip():
+            extraidas.append((numero, texto))
+    return extraidas
+
+
+def extrair_paginas_pdf(pdf_bytes: bytes, max_paginas: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Extrai o texto página a página (pdfplumber, com fallback para PyPDF2)
+
+    Executado dentro do processo do pool; pode ser chamado diretamente.
+
+    Args:
+        pdf_bytes: Bytes do PDF
+        max_paginas: Limite de páginas lidas (None = todas)
+
+    Returns:
+        Dict: paginas [(número, texto)], biblioteca, paginas_total,
+              paginas_com_erro, cpu_s e erro
+    """
+    inicio_cpu = time.process_time()
+    metricas = {'paginas': [], 'biblioteca': None, 'paginas_total': 0, 'paginas_com_erro': 0, 'erro': None}
+
+    extratores = []
+    if PDFPLUMBER_AVAILABLE:
+        extratores.append(('pdfplumber', _paginas_pdfplumber))
+    if PYPDF2_AVAILABLE:
+        extratores.append(('pypdf2', _paginas_pypdf2))
+    if not extratores:
+        metricas['erro'] = 'Nenhuma biblioteca de PDF disponível'
+
+    for biblioteca, extrator in extratores:
+        try:
+            paginas = extrator(pdf_bytes, max_paginas, metricas)
+        except Exception as e:
+            metricas['erro'] = f"{biblioteca}: {e}"
+            continue
+        if paginas:
+            metricas.update(paginas=paginas, biblioteca=biblioteca, erro=None)
+            break
+
+    metricas['cpu_s'] = time.process_time() - inicio_cpu
+    return metricas
+
+
+def _loop_processo(conexao):
+    """Atende tarefas (pdf_bytes, max_paginas) até receber None ou o pipe fechar."""
+    while True:
+        try:
+            tarefa = conexao.recv()
+        except (EOFError, OSError):
+            break
+        if tarefa is None:
+            break
+        pdf_bytes, max_paginas = tarefa
+        try:
+            resposta = extrair_paginas_pdf(pdf_bytes, max_paginas)
+        except Exception as e:
+            resposta = {'paginas': [], 'biblioteca': None, 'paginas_total': 0,
+                        'paginas_com_erro': 0, 'cpu_s': 0.0, 'erro': str(e)}
+        conexao.send(resposta)
+
+
+# ----------------------------------------------------------------------
+# Lado do processo principal
+# ----------------------------------------------------------------------
+
+class _ProcessoExtracao:
+    """Processo do pool e a ponta local do seu pipe."""
+
+    def __init__(self, contexto):
+        self.conexao, conexao_processo = contexto.Pipe()
+        self.processo = contexto.Process(target=_loop_processo, args=(conexao_processo,), daemon=True)
+        self.processo.start()
+        conexao_processo.close()
+        self.documentos = 0
+
+    def encerrar(self, forcar: bool = False):
+        try:
+            if forcar:
+                self.processo.kill()
+            else:
+                self.conexao.send(None)
+        except (OSError, ValueError):
+            pass
+        self.processo.join(timeout=5)
+        if self.processo.is_alive():
+            self.processo.kill()
+            self.processo.join(timeout=5)
+        self.conexao.close()
+
+
+class PoolExtracaoPDF:
+    """
+    Extração de texto de PDFs em processos, com timeout rígido por documento
+
+    Uso:
+        pool = get_pool_extracao_pdf()
+        resultado = pool.extrair(pdf_bytes, '2482075')           # bloqueante
+        futuro = pool.submeter(pdf_bytes, '2482075', max_paginas=10)  # assíncrono
+        texto = '\\n'.join(t for _, t in futuro.result()['paginas'])
+
+    Cada resultado tem: identificador, status ('ok', 'sem_texto', 'timeout',
+    'erro'), paginas [(número, texto)], biblioteca, paginas_total,
+    paginas_extraidas, paginas_com_erro, bytes, duracao_s, cpu_s e erro.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout_segundos: Optional[float] = None,
+                 documentos_por_processo: Optional[int] = None):
+        """
+        Args:
+            max_workers: Processos em paralelo (padrão: núcleos da máquina)
+            timeout_segundos: Tempo máximo por documento antes de matar o processo
+            documentos_por_processo: Documentos atendidos antes de reciclar o processo
+        """
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self.timeout_segundos = timeout_segundos or TIMEOUT_PADRAO_SEGUNDOS
+        self.documentos_por_processo = documentos_por_processo or DOCUMENTOS_POR_PROCESSO
+
+        # forkserver evita herdar locks/conexões das threads do processo principal
+        metodos = multiprocessing.get_all_start_methods()
+        self._contexto = multiprocessing.get_context('forkserver' if 'forkserver' in metodos else 'spawn')
+        self._despachantes = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='extracao_pdf')
+        # Um processo de extração por thread despachante
+        self._local = threading.local()
+        self._processos: List[_ProcessoExtracao] = []
+        self._lock = threading.Lock()
+        self._metricas = {
+            'documentos': 0, 'ok': 0, 'sem_texto': 0, 'timeouts': 0, 'erros': 0,
+            'processos_reiniciados': 0, 'paginas_extraidas': 0, 'bytes': 0,
+            'duracao_total_s': 0.0, 'cpu_total_s': 0.0
+        }
+
+        logger.info(f"Pool de extração de PDF: {self.max_workers} processos, timeout {self.timeout_segundos}s")
+
+    def submeter(self, pdf_bytes: bytes, identificador: str = '', max_paginas: Optional[int] = None) -> Future:
+        """
+        Agenda a extração de um PDF
+
+        Args:
+            pdf_bytes: Bytes do PDF
+            identificador: ID do documento (logs e resultado)
+            max_paginas: Limite de páginas lidas (None = todas)
+
+        Returns:
+            Future: Resolve com o dict de resultado (nunca levanta por erro no PDF)
+        """
+        return self._despachantes.submit(self._executar, pdf_bytes, identificador, max_paginas)
+
+    def extrair(self, pdf_bytes: bytes, identificador: str = '', max_paginas: Optional[int] = None) -> Dict[str, Any]:
+        """Como submeter(), aguardando o resultado."""
+        return self.submeter(pdf_bytes, identificador, max_paginas).result()
+
+    def metricas(self) -> Dict[str, Any]:
+        """Contadores acumulados do pool (cópia)."""
+        with self._lock:
+            return dict(self._metricas)
+
+    def encerrar(self):
+        """Aguarda as tarefas em andamento e encerra os processos."""
+        self._despachantes.shutdown(wait=True)
+        with self._lock:
+            processos, self._processos = self._processos, []
+        for processo in processos:
+            processo.encerrar()
+
+    def _processo_da_thread(self) -> _ProcessoExtracao:
+        processo = getattr(self._local, 'processo', None)
+        if processo is not None and processo.documentos >= self.documentos_por_processo:
+            self._descartar(processo, forcar=False)
+            processo = None
+        if processo is None:
+            processo = _ProcessoExtracao(self._contexto)
+            self._local.processo = processo
+            with self._lock:
+                self._processos.append(processo)
+        return processo
+
+    def _descartar(self, processo: _ProcessoExtracao, forcar: bool):
+        self._local.processo = None
+        with self._lock:
+            if processo in self._processos:
+                self._processos.remove(processo)
+            if forcar:
+                self._metricas['processos_reiniciados'] += 1
+        processo.encerrar(forcar=forcar)
+
+    def _executar(self, pdf_bytes: bytes, identificador: str, max_paginas: Optional[int]) -> Dict[str, Any]:
+        inicio = time.monotonic()
+        resultado = {
+            'identificador': identificador, 'status': 'erro', 'paginas': [], 'biblioteca': None,
+            'paginas_total': 0, 'paginas_extraidas': 0, 'paginas_com_erro': 0,
+            'bytes': len(pdf_bytes or b''), 'duracao_s': 0.0, 'cpu_s': 0.0, 'erro': None
+        }
+
+        if not pdf_bytes:
+            resultado.update(status='sem_texto', erro='PDF vazio')
+        else:
+            processo = self._processo_da_thread()
+            try:
+                processo.conexao.send((pdf_bytes, max_paginas))
+                if processo.conexao.poll(self.timeout_segundos):
+                    resposta = processo.conexao.recv()
+                    processo.documentos += 1
+                    resultado.update(resposta)
+                    resultado['paginas_extraidas'] = len(resultado['paginas'])
+                    if resultado['paginas']:
+                        resultado['status'] = 'ok'
+                    elif not resultado['erro']:
+                        resultado['status'] = 'sem_texto'
+                else:
+                    # PDF patológico: o processo é morto e recriado na próxima tarefa
+                    self._descartar(processo, forcar=True)
+                    resultado.update(status='timeout', erro=f'Timeout de {self.timeout_segundos}s na extração')
+                    logger.warning(f"⏱️ Extração do PDF {identificador} excedeu {self.timeout_segundos}s")
+            except (EOFError, OSError) as e:
+                self._descartar(processo, forcar=True)
+                resultado['erro'] = f'Processo de extração encerrado: {e}'
+
+        resultado['duracao_s'] = time.monotonic() - inicio
+        self._registrar(resultado)
+        if resultado['status'] == 'erro':
+            logger.error(f"Erro ao extrair PDF {identificador}: {resultado['erro']}")
+        return resultado
+
+    def _registrar(self, resultado: Dict[str, Any]):
+        chave = {'ok': 'ok', 'sem_texto': 'sem_texto', 'timeout': 'timeouts'}.get(resultado['status'], 'erros')
+        with self._lock:
+            self._metricas['documentos'] += 1
+            self._metricas[chave] += 1
+            self._metricas['paginas_extraidas'] += resultado['paginas_extraidas']
+            self._metricas['bytes'] += resultado['bytes']
+            self._metricas['duracao_total_s'] += resultado['duracao_s']
+            self._metricas['cpu_total_s'] += resultado['cpu_s']
+
+
+def metricas_extracao(resultado: Dict[str, Any]) -> Dict[str, Any]:
+    """Métricas de um resultado do pool (tudo menos o texto das páginas)."""
+    return {chave: valor for chave, valor in resultado.items() if chave != 'paginas'}
+
+
+_pool_extracao: Optional[PoolExtracaoPDF] = None
+_pool_extracao_lock = threading.Lock()
+
+
+def get_pool_extracao_pdf() -> PoolExtracaoPDF:
+    """
+    Retorna o pool de extração compartilhado do processo
+
+    Configurado pelas variáveis de ambiente PDF_EXTRACAO_WORKERS (padrão:
+    núcleos da máquina) e PDF_EXTRACAO_TIMEOUT (segundos por documento).
+
+    Returns:
+        PoolExtracaoPDF: Instância única, encerrada na saída do interpretador
+    """
+    global _pool_extracao
+    if _pool_extracao is None:
+        with _pool_extracao_lock:
+            if _pool_extracao is None:
+                workers = os.getenv('PDF_EXTRACAO_WORKERS')
+                timeout = os.getenv('PDF_EXTRACAO_TIMEOUT')
+                _pool_extracao = PoolExtracaoPDF(
+                    max_workers=int(workers) if workers else None,
+                    timeout_segundos=float(timeout) if timeout else None
+                )
+                atexit.register(_pool_extracao.encerrar)
+    return _pool_extracao
@@ -8,7 +8,7 @@ import json
 import gzip
 import hashlib
 from pathlib import Path
-from typing import Optional, Dict, Any, Union, BinaryIO
+from typing import Optional, Dict, List, Any, Union, BinaryIO
 from datetime import datetime, timedelta
 import logging
 
@@ -421,6 +421,26 @@ class GCSManager:
         
         return None
     
+    def upload_emendas_ndjson(self, emendas: List[Dict], ano: int, nome_shard: str) -> Optional[str]:
+        """
+        Faz upload de várias emendas em um único arquivo NDJSON comprimido
+        
+        Args:
+            emendas: Dados completos das emendas (uma linha JSON cada)
+            ano: Ano das emendas
+            nome_shard: Nome do arquivo, sem extensão
+            
+        Returns:
+            str: URL do arquivo no GCS ou None se erro
+        """
+        conteudo = "\n".join(json.dumps(emenda, ensure_ascii=False, default=str) for emenda in emendas) + "\n"
+        blob_path = self._generate_blob_path("emendas", ano, "shards", f"{nome_shard}.ndjson.gz")
+        
+        if self.upload_text_with_content_type(conteudo, blob_path, 'application/x-ndjson', compress=True):
+            return f"https://storage.googleapis.com/{self.bucket_name}/{blob_path}"
+        
+        return None
+    
     def list_blobs(self, prefix: str = "", max_results: Optional[int] = None) -> list:
         """
         Lista blobs no bucket com prefixo específico
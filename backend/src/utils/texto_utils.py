@@ -12,6 +12,8 @@ from typing import Optional, Dict, Any
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
+from .extracao_pdf import get_pool_extracao_pdf, metricas_extracao
+
 # Tentar importar bibliotecas de PDF
 try:
     import PyPDF2
@@ -164,91 +166,44 @@ class TextoProposicaoUtils:
         Returns:
             Texto extraído ou None
         """
-        if not pdf_bytes:
-            return None
-        
-        texto = None
-        
-        # Tentar com pdfplumber (melhor qualidade)
-        if PDFPLUMBER_AVAILABLE:
-            texto = self._extrair_com_pdfplumber(pdf_bytes, proposicao_id)
-        
-        # Fallback para PyPDF2
-        if not texto and PYPDF2_AVAILABLE:
-            texto = self._extrair_com_pypdf2(pdf_bytes, proposicao_id)
-        
-        # Limpar texto
-        if texto:
-            texto = self._limpar_texto_extraido(texto)
-            logger.debug(f"Texto extraído: {len(texto)} caracteres")
-        
-        return texto
+        return self.extrair_texto_pdf_com_metricas(pdf_bytes, proposicao_id)['texto']
     
-    def _extrair_com_pdfplumber(self, pdf_bytes: bytes, proposicao_id: str) -> Optional[str]:
+    def extrair_texto_pdf_com_metricas(self, pdf_bytes: bytes, proposicao_id: str) -> Dict[str, Any]:
         """
-        Extrai texto usando pdfplumber.
+        Extrai texto de bytes de PDF no pool de processos (timeout por documento).
         
         Args:
             pdf_bytes: Bytes do PDF
-            proposicao_id: ID da proposição
+            proposicao_id: ID da proposição para logging
             
         Returns:
-            Texto extraído ou None
+            Dicionário com 'texto' (ou None) e 'metricas' da extração
         """
-        try:
-            import io
-            
-            with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                texto_completo = ""
-                
-                for page_num, page in enumerate(pdf.pages, 1):
-                    try:
-                        texto_pagina = page.extract_text()
-                        if texto_pagina:
-                            texto_completo += f"\n--- Página {page_num} ---\n{texto_pagina}\n"
-                    except Exception as e:
-                        logger.warning(f"Erro na página {page_num}: {e}")
-                        continue
-                
-                return texto_completo.strip()
-                
-        except Exception as e:
-            logger.error(f"Erro ao extrair com pdfplumber {proposicao_id}: {e}")
-            return None
+        if not pdf_bytes:
+            return {'texto': None, 'metricas': None}
+        
+        extracao = get_pool_extracao_pdf().extrair(pdf_bytes, str(proposicao_id))
+        return {'texto': self.montar_texto_extraido(extracao), 'metricas': metricas_extracao(extracao)}
     
-    def _extrair_com_pypdf2(self, pdf_bytes: bytes, proposicao_id: str) -> Optional[str]:
+    def montar_texto_extraido(self, extracao: Dict[str, Any]) -> Optional[str]:
         """
-        Extrai texto usando PyPDF2.
+        Monta o texto limpo a partir do resultado do pool de extração.
         
         Args:
-            pdf_bytes: Bytes do PDF
-            proposicao_id: ID da proposição
+            extracao: Resultado de PoolExtracaoPDF
             
         Returns:
             Texto extraído ou None
         """
-        try:
-            import io
-            
-            with io.BytesIO(pdf_bytes) as pdf_stream:
-                reader = PyPDF2.PdfReader(pdf_stream)
-                
-                texto_completo = ""
-                
-                for page_num, page in enumerate(reader.pages, 1):
-                    try:
-                        texto_pagina = page.extract_text()
-                        if texto_pagina:
-                            texto_completo += f"\n--- Página {page_num} ---\n{texto_pagina}\n"
-                    except Exception as e:
-                        logger.warning(f"Erro na página {page_num}: {e}")
-                        continue
-                
-                return texto_completo.strip()
-                
-        except Exception as e:
-            logger.error(f"Erro ao extrair com PyPDF2 {proposicao_id}: {e}")
+        if not extracao['paginas']:
             return None
+        
+        texto = "".join(
+            f"\n--- Página {numero} ---\n{texto_pagina}\n" for numero, texto_pagina in extracao['paginas']
+        ).strip()
+        texto = self._limpar_texto_extraido(texto)
+        logger.debug(f"Texto extraído: {len(texto)} caracteres ({extracao['biblioteca']}, {extracao['duracao_s']:.2f}s)")
+        return texto
     
     def _limpar_texto_extraido(self, texto: str) -> str:
         """